@@ -1,12 +1,87 @@
-from api.application.tasks_list_service import TasksListService
-from api.persistence.initialise_cosmos import tasks_lists_container
-from api.app import create_app
-from api.cache import cache, cache_config
+from pathlib import Path
+import yaml
 import azure.functions as func
 
+path = Path(__file__).parent / "config.yaml"
+config = yaml.safe_load(open(path))
 
-tasks_list_service = TasksListService(tasks_lists_container)
-app = create_app(tasks_list_service)
-cache.init_app(app, config=cache_config)
+if config.get("asgi", False):
+    from api.application.async_tasks_list_service import AsyncTasksListService
+    from api.application.tasks_list_cache import tasks_list_cache_for
+    from api.persistence.invalidation_transports import create_invalidation_bus
+    from api.persistence.repository_factory import create_async_tasks_lists_repository
+    from api.async_app import check_async_options, create_async_app
+    from api.cache import configure_async_cache
 
-main = func.WsgiMiddleware(app.wsgi_app).main
+    check_async_options(config)
+    configure_async_cache(config)
+
+    tasks_list_service = AsyncTasksListService(
+        create_async_tasks_lists_repository(config),
+        config.get("last_selected_time_flush_seconds", 0),
+        tasks_list_cache_for(config),
+        create_invalidation_bus(config),
+    )
+    app = create_async_app(tasks_list_service)
+    asgi_middleware = func.AsgiMiddleware(app)
+
+    async def main(req: func.HttpRequest, context: func.Context) -> func.HttpResponse:
+        return await asgi_middleware.handle_async(req, context)
+
+    async def keep_alive() -> str:
+        response = await app.test_client().get("/api/keep-alive")
+        return await response.get_data(as_text=True)
+
+else:
+    from api.application.tasks_list_cache import tasks_list_cache_for
+    from api.application.tasks_list_service import TasksListService
+    from api.persistence.invalidation_transports import create_invalidation_bus
+    from api.persistence.repository_factory import create_tasks_lists_repository
+    from api.app import create_app
+    from api.cache import cache, cache_config_for
+
+    tasks_list_service = TasksListService(
+        create_tasks_lists_repository(config),
+        config.get("last_selected_time_flush_seconds", 0),
+        tasks_list_cache_for(config),
+        create_invalidation_bus(config),
+    )
+    app = create_app(tasks_list_service)
+    cache.init_app(app, config=cache_config_for(config))
+
+    if config.get("warm_start_snapshot_path"):
+        from api.handlers.auth_zero_decorators import jwks_key_store
+        from api.warm_start import WarmStarter, WarmStartSnapshot
+
+        warm_starter = WarmStarter(
+            WarmStartSnapshot(config["warm_start_snapshot_path"]),
+            jwks_key_store,
+            tasks_list_service,
+            config.get("warm_start_interval_seconds", 60),
+        )
+        warm_starter.restore()
+        warm_starter.start()
+
+    if config.get("cosmos_metrics", False):
+        from api.handlers.metrics_handlers import register_metrics_handlers
+        from api.persistence.instrumented_container import cosmos_metrics
+
+        register_metrics_handlers(app, cosmos_metrics)
+
+    if config.get("cosmos_partition_ru_per_second", 0) > 0:
+        from api.handlers.metrics_handlers import register_throttle_metrics_handlers
+        from api.persistence.throttled_container import throttle_metrics
+
+        register_throttle_metrics_handlers(app, throttle_metrics)
+
+    main = func.WsgiMiddleware(app.wsgi_app).main
+
+    def keep_alive() -> str:
+        return app.test_client().get("/api/keep-alive").get_data(as_text=True)
+
+
+if config.get("change_feed", False):
+    from api.persistence.change_feed_processor import create_change_feed_processor
+
+    change_feed_processor = create_change_feed_processor(config)
+    change_feed_processor.start()
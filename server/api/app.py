@@ -2,11 +2,12 @@
 from flask import Flask
 from flask_cors import CORS
 from api.handlers.exception_handlers import handle_exception
+from api.handlers.requests import CONTINUATION_HEADER_KEY
 
 
 def create_app(tasks_list_service):
     app = Flask(__name__)
-    CORS(app)
+    CORS(app, expose_headers=[CONTINUATION_HEADER_KEY])
     register_task_handlers(app, tasks_list_service)
     app.errorhandler(Exception)(handle_exception)
     return app
@@ -0,0 +1,253 @@
+﻿import asyncio
+import datetime
+
+from api.application.invalidation_bus import InvalidationBus
+from api.application.last_selected_times import LastSelectedTimes
+from api.application.operation_context import traced_operations
+from api.application.read_counts import ReadCounts
+from api.application.tasks_list_cache import (
+    MEMBER_ACCESS,
+    OWNER_ACCESS,
+    TasksListCache,
+)
+from api.application.tasks_list_writes import (
+    TasksListWrites,
+    check_task_list_found,
+    none_applied,
+    to_page_size,
+    to_task_operations,
+)
+from api.domain.tasks_list import TasksList
+from api.domain.tasks_list_summary import TasksListSummary
+from api.persistence.tasks_lists_repository import (
+    DuplicateTasksListNameError,
+    InvalidContinuationError,
+    StaleTasksListError,
+    AsyncTasksListsRepository,
+)
+from api.application.validation_exception import ValidationException
+
+FLUSH_TIMEOUT_SECONDS = 10
+
+
+@traced_operations
+class AsyncTasksListService:
+
+    def __init__(
+        self,
+        repository: AsyncTasksListsRepository,
+        last_selected_time_flush_seconds: float = 0,
+        tasks_list_cache: TasksListCache | None = None,
+        invalidation_bus: InvalidationBus | None = None,
+    ):
+        self.repository = repository
+        self.writes = TasksListWrites(tasks_list_cache, invalidation_bus)
+        self.concurrency_metrics = self.writes.concurrency_metrics
+        self.tasks_list_cache = self.writes.tasks_list_cache
+        self.read_counts = ReadCounts()
+        self.last_selected_times = LastSelectedTimes(
+            self.__write_last_selected_time,
+            last_selected_time_flush_seconds,
+            self.writes.changed,
+        )
+        self.loop: asyncio.AbstractEventLoop | None = None
+
+    async def add(self, name: str, owner_email: str):
+        tasks_list = TasksList(name, owner_email)
+        try:
+            await self.repository.add(tasks_list)
+        except DuplicateTasksListNameError as error:
+            raise ValidationException(" ".join(error.args)) from error
+        self.writes.saved(tasks_list)
+        return tasks_list
+
+    async def update(self, id: str, owner_email: str, new_name: str):
+        try:
+            tasks_list, _ = await self.__modify(
+                lambda: self.get_by_id_for_owner(id, owner_email),
+                lambda the_tasks_list: setattr(the_tasks_list, "name", new_name),
+            )
+        except DuplicateTasksListNameError as error:
+            raise ValidationException(" ".join(error.args)) from error
+        return tasks_list
+
+    async def update_last_selected_time(self, id: str, email: str):
+        owner_email = self.last_selected_times.owner_of(id)
+        if owner_email != email:
+            tasks_list = await self.get_by_id(id, email)
+            check_task_list_found(tasks_list)
+            owner_email = tasks_list.owner_email
+        last_selected_time = datetime.datetime.now()
+        if self.last_selected_times.flush_seconds <= 0:
+            await self.repository.save_last_selected_time(
+                id, owner_email, last_selected_time
+            )
+            self.writes.changed(id)
+            return
+        self.loop = asyncio.get_running_loop()
+        self.last_selected_times.select(id, owner_email, last_selected_time)
+
+    async def delete(self, id: str, owner_email: str):
+        for attempt in self.writes.attempts():
+            tasks_list = await self.get_by_id_for_owner(id, owner_email)
+            check_task_list_found(tasks_list)
+            try:
+                await self.repository.delete(tasks_list)
+            except StaleTasksListError:
+                self.writes.conflicted(id, attempt)
+                continue
+            self.writes.changed(id)
+            self.writes.written()
+            return
+        self.writes.give_up(id)
+
+    async def get(self, name: str, owner_email: str) -> TasksList | None:
+        return self.last_selected_times.overlay(
+            await self.repository.load_by_name(name, owner_email)
+        )
+
+    async def get_by_id_for_owner(self, id: str, owner_email: str) -> TasksList | None:
+        return self.__read(
+            await self.tasks_list_cache.load_async(
+                id,
+                owner_email,
+                OWNER_ACCESS,
+                lambda: self.repository.load_for_owner(id, owner_email),
+            )
+        )
+
+    async def get_by_id(self, id: str, email: str) -> TasksList | None:
+        return self.__read(
+            await self.tasks_list_cache.load_async(
+                id, email, MEMBER_ACCESS, lambda: self.repository.load(id, email)
+            )
+        )
+
+    async def get_all(self, email: str) -> list[TasksList]:
+        return self.last_selected_times.overlay_all(
+            await self.repository.list_for_user(email)
+        )
+
+    async def get_all_summaries(self, email: str) -> list[TasksListSummary]:
+        return self.last_selected_times.overlay_all(
+            await self.repository.list_summaries_for_user(email)
+        )
+
+    async def get_page(
+        self,
+        email: str,
+        limit: str | None,
+        continuation: str | None,
+        summary: bool = False,
+    ) -> tuple[list[TasksList | TasksListSummary], str | None]:
+        try:
+            items, next_continuation = await self.repository.list_page_for_user(
+                email, to_page_size(limit), continuation, summary
+            )
+        except InvalidContinuationError as error:
+            raise ValidationException(" ".join(error.args)) from error
+        return self.last_selected_times.overlay_all(items), next_continuation
+
+    async def add_task(self, tasks_list_id: str, email: str, task: str):
+        _, the_task_id = await self.__modify(
+            lambda: self.get_by_id(tasks_list_id, email),
+            lambda tasks_list: tasks_list.add(task),
+        )
+        return the_task_id
+
+    async def tick_task(self, tasks_list_id: str, email: str, task_id: str):
+        await self.__modify(
+            lambda: self.get_by_id(tasks_list_id, email),
+            lambda tasks_list: tasks_list.tick(task_id),
+        )
+
+    async def remove_task(self, tasks_list_id: str, email: str, task_id: str):
+        await self.__modify(
+            lambda: self.get_by_id(tasks_list_id, email),
+            lambda tasks_list: tasks_list.remove(task_id),
+        )
+
+    async def carry_task(self, tasks_list_id: str, email: str, task_id: str):
+        await self.__modify(
+            lambda: self.get_by_id(tasks_list_id, email),
+            lambda tasks_list: tasks_list.carry(task_id),
+        )
+
+    async def apply_task_operations(
+        self, tasks_list_id: str, email: str, operations: list[dict]
+    ) -> list[dict]:
+        task_operations = to_task_operations(operations)
+        _, results = await self.__modify(
+            lambda: self.get_by_id(tasks_list_id, email),
+            lambda tasks_list: [
+                operation.apply_to(tasks_list) for operation in task_operations
+            ],
+            none_applied,
+        )
+        return results
+
+    async def share(self, tasks_list_id: str, owner_email: str, email_to_share: str):
+        await self.__modify(
+            lambda: self.get_by_id(tasks_list_id, owner_email),
+            lambda tasks_list: tasks_list.share(email_to_share),
+        )
+
+    async def unshare(
+        self, tasks_list_id: str, owner_email: str, email_to_unshare: str
+    ):
+        await self.__modify(
+            lambda: self.get_by_id(tasks_list_id, owner_email),
+            lambda tasks_list: tasks_list.unshare(email_to_unshare),
+        )
+
+    async def unshare_self(self, tasks_list_id: str, email_to_unshare: str):
+        await self.__modify(
+            lambda: self.get_by_id(tasks_list_id, email_to_unshare),
+            lambda tasks_list: tasks_list.unshare(email_to_unshare),
+        )
+
+    def __read(self, tasks_list: TasksList | None) -> TasksList | None:
+        self.read_counts.record(tasks_list)
+        return self.last_selected_times.overlay(tasks_list)
+
+    async def __modify(self, load, change, unchanged=lambda result: False):
+        for attempt in self.writes.attempts():
+            tasks_list = await load()
+            check_task_list_found(tasks_list)
+            original = tasks_list.to_dict()
+            result = change(tasks_list)
+            if unchanged(result):
+                return tasks_list, result
+            try:
+                await self.repository.save(tasks_list, original)
+            except StaleTasksListError:
+                self.writes.conflicted(tasks_list.id, attempt)
+                continue
+            self.writes.saved(tasks_list)
+            self.writes.written()
+            return tasks_list, result
+        self.writes.give_up(tasks_list.id)
+
+    # buffered times are flushed from a timer thread, or at exit, so are written on
+    # the loop the repository's client belongs to
+    def __write_last_selected_time(
+        self, id: str, owner_email: str, last_selected_time: datetime.datetime
+    ):
+        write = self.repository.save_last_selected_time(
+            id, owner_email, last_selected_time
+        )
+        if not self.loop.is_running():
+            self.loop.run_until_complete(write)
+        elif self.__on_loop():
+            write.close()
+            raise RuntimeError("Cannot wait for a write from the event loop's thread")
+        else:
+            asyncio.run_coroutine_threadsafe(write, self.loop).result(
+                FLUSH_TIMEOUT_SECONDS
+            )
+
+    def __on_loop(self) -> bool:
+        try:
+            return asyncio.get_running_loop() is self.loop
+        except RuntimeError:
+            return False
@@ -0,0 +1,35 @@
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class ConcurrencyMetrics:
+
+    def __init__(self):
+        self.__lock = threading.Lock()
+        self.writes = 0
+        self.conflicts = 0
+        self.exhausted = 0
+
+    def record_write(self):
+        with self.__lock:
+            self.writes += 1
+
+    def record_conflict(self, id: str, attempt: int):
+        with self.__lock:
+            self.conflicts += 1
+        logger.info("ETag conflict writing tasks list %s on attempt %d", id, attempt)
+
+    def record_exhausted(self, id: str):
+        with self.__lock:
+            self.exhausted += 1
+        logger.warning("Gave up writing tasks list %s after repeated conflicts", id)
+
+    def to_dict(self):
+        with self.__lock:
+            return {
+                "writes": self.writes,
+                "conflicts": self.conflicts,
+                "exhausted": self.exhausted,
+            }
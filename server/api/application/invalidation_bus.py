@@ -0,0 +1,65 @@
+import logging
+import threading
+from typing import Callable, Protocol
+
+logger = logging.getLogger(__name__)
+
+Subscriber = Callable[[dict], None]
+
+
+class InvalidationTransport(Protocol):
+
+    def publish(self, message: dict):
+        pass
+
+    def subscribe(self, subscriber: Subscriber):
+        pass
+
+
+class LoopbackTransport:
+
+    def __init__(self):
+        self.__lock = threading.Lock()
+        self.__subscribers: list[Subscriber] = []
+
+    def publish(self, message: dict):
+        with self.__lock:
+            subscribers = list(self.__subscribers)
+        for subscriber in subscribers:
+            subscriber(message)
+
+    def subscribe(self, subscriber: Subscriber):
+        with self.__lock:
+            self.__subscribers.append(subscriber)
+
+
+class InvalidationBus:
+
+    def __init__(self, transport: InvalidationTransport):
+        self.transport = transport
+        self.__subscribers: list[Subscriber] = []
+        self.published = 0
+        self.received = 0
+        transport.subscribe(self.__deliver)
+
+    def publish(self, list_id: str, etag: str | None):
+        try:
+            self.transport.publish({"list_id": list_id, "etag": etag})
+            self.published += 1
+        except Exception:
+            logger.warning(
+                "Could not publish invalidation of tasks list %s",
+                list_id,
+                exc_info=True,
+            )
+
+    def subscribe(self, subscriber: Subscriber):
+        self.__subscribers.append(subscriber)
+
+    def __deliver(self, message: dict):
+        self.received += 1
+        for subscriber in self.__subscribers:
+            try:
+                subscriber(message)
+            except Exception:
+                logger.exception("Could not apply invalidation %s", message)
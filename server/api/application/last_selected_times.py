@@ -0,0 +1,121 @@
+import atexit
+import dataclasses
+import datetime
+import logging
+import os
+import signal
+import threading
+import weakref
+from typing import Callable
+
+Write = Callable[[str, str, datetime.datetime], None]
+
+logger = logging.getLogger(__name__)
+
+flushed_on_shutdown: "weakref.WeakSet[LastSelectedTimes]" = weakref.WeakSet()
+previous_sigterm_handler = None
+shutdown_hooked = False
+
+
+def flush_all():
+    for last_selected_times in list(flushed_on_shutdown):
+        last_selected_times.flush()
+
+
+def on_sigterm(signum, frame):
+    flush_all()
+    if callable(previous_sigterm_handler):
+        previous_sigterm_handler(signum, frame)
+    elif previous_sigterm_handler != signal.SIG_IGN:
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        os.kill(os.getpid(), signal.SIGTERM)
+
+
+# A worker stopped or recycled with SIGTERM would otherwise skip atexit
+def flush_on_shutdown(last_selected_times: "LastSelectedTimes"):
+    global previous_sigterm_handler, shutdown_hooked
+    flushed_on_shutdown.add(last_selected_times)
+    if shutdown_hooked:
+        return
+    shutdown_hooked = True
+    atexit.register(flush_all)
+    try:
+        previous_sigterm_handler = signal.getsignal(signal.SIGTERM)
+        signal.signal(signal.SIGTERM, on_sigterm)
+    except ValueError:
+        logger.warning(
+            "Not on the main thread, last selected times are only flushed at exit"
+        )
+
+
+# With flush_seconds > 0 selections are written at most flush_seconds late, and are
+# flushed on exit and on SIGTERM. A worker that is killed outright or crashes loses
+# up to flush_seconds of them, which is why batching is off by default
+class LastSelectedTimes:
+
+    def __init__(
+        self,
+        write: Write,
+        flush_seconds: float = 0,
+        on_written: Callable[[str], None] | None = None,
+    ):
+        self.write = write
+        self.flush_seconds = flush_seconds
+        self.on_written = on_written
+        self.__lock = threading.Lock()
+        self.__pending: dict[str, tuple[str, datetime.datetime]] = {}
+        self.__timer: threading.Timer | None = None
+        self.writes = 0
+        if flush_seconds > 0:
+            flush_on_shutdown(self)
+
+    def select(self, id: str, owner_email: str, last_selected_time: datetime.datetime):
+        if self.flush_seconds <= 0:
+            self.__write(id, owner_email, last_selected_time)
+            return
+        with self.__lock:
+            self.__pending[id] = (owner_email, last_selected_time)
+            if self.__timer is None:
+                self.__timer = threading.Timer(self.flush_seconds, self.flush)
+                self.__timer.daemon = True
+                self.__timer.start()
+
+    def owner_of(self, id: str) -> str | None:
+        with self.__lock:
+            pending = self.__pending.get(id)
+        return pending[0] if pending is not None else None
+
+    def overlay(self, tasks_list):
+        if tasks_list is None:
+            return None
+        with self.__lock:
+            pending = self.__pending.get(tasks_list.id)
+        if pending is None:
+            return tasks_list
+        if dataclasses.is_dataclass(tasks_list):
+            return dataclasses.replace(tasks_list, last_selected_time=pending[1])
+        tasks_list.last_selected_time = pending[1]
+        return tasks_list
+
+    def overlay_all(self, tasks_lists: list) -> list:
+        return [self.overlay(tasks_list) for tasks_list in tasks_lists]
+
+    def flush(self):
+        with self.__lock:
+            pending = self.__pending
+            self.__pending = {}
+            if self.__timer is not None:
+                self.__timer.cancel()
+                self.__timer = None
+        for id, (owner_email, last_selected_time) in pending.items():
+            try:
+                self.__write(id, owner_email, last_selected_time)
+            except Exception:
+                logger.exception("Could not write last selected time of %s", id)
+
+    def __write(self, id: str, owner_email: str, last_selected_time: datetime.datetime):
+        self.write(id, owner_email, last_selected_time)
+        if self.on_written is not None:
+            self.on_written(id)
+        with self.__lock:
+            self.writes += 1
@@ -0,0 +1,45 @@
+import inspect
+from contextvars import ContextVar
+from functools import wraps
+
+UNKNOWN_OPERATION = "unknown"
+
+current_operation: ContextVar[str] = ContextVar(
+    "current_operation", default=UNKNOWN_OPERATION
+)
+
+
+def __traced(func):
+    if inspect.iscoroutinefunction(func):
+
+        @wraps(func)
+        async def traced_coroutine(*args, **kwargs):
+            if current_operation.get() != UNKNOWN_OPERATION:
+                return await func(*args, **kwargs)
+            token = current_operation.set(func.__name__)
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                current_operation.reset(token)
+
+        return traced_coroutine
+
+    @wraps(func)
+    def traced(*args, **kwargs):
+        if current_operation.get() != UNKNOWN_OPERATION:
+            return func(*args, **kwargs)
+        token = current_operation.set(func.__name__)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            current_operation.reset(token)
+
+    return traced
+
+
+def traced_operations(cls):
+    # Storage calls are attributed to the outermost public service method
+    for name, member in list(vars(cls).items()):
+        if callable(member) and not name.startswith("_"):
+            setattr(cls, name, __traced(member))
+    return cls
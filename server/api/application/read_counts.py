@@ -0,0 +1,43 @@
+import threading
+
+from api.domain.tasks_list import TasksList
+
+
+class ReadCounts:
+
+    def __init__(self, max_size: int = 1000):
+        self.max_size = max_size
+        self.__lock = threading.Lock()
+        self.__counts: dict[str, tuple[int, str]] = {}
+
+    def record(self, tasks_list: TasksList | None):
+        if tasks_list is None or self.max_size <= 0:
+            return
+        with self.__lock:
+            count, _ = self.__counts.get(tasks_list.id, (0, None))
+            if count == 0 and len(self.__counts) >= self.max_size:
+                self.__age()
+            self.__counts[tasks_list.id] = (count + 1, tasks_list.owner_email)
+
+    def hottest(self, limit: int) -> list[dict]:
+        with self.__lock:
+            ranked = sorted(
+                self.__counts.items(), key=lambda item: item[1][0], reverse=True
+            )
+        return [
+            {"id": id, "owner_email": owner_email}
+            for id, (_, owner_email) in ranked[:limit]
+        ]
+
+    def __len__(self) -> int:
+        return len(self.__counts)
+
+    # keep the busier half with their counts halved, so lists read long ago fade out
+    def __age(self):
+        ranked = sorted(
+            self.__counts.items(), key=lambda item: item[1][0], reverse=True
+        )
+        self.__counts = {
+            id: (max(1, count // 2), owner_email)
+            for id, (count, owner_email) in ranked[: self.max_size // 2]
+        }
@@ -0,0 +1,148 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable
+
+from api.domain.tasks_list import TasksList
+
+OWNER_ACCESS = "owner"
+MEMBER_ACCESS = "member"
+
+
+class TasksListCache:
+
+    def __init__(
+        self,
+        max_size: int = 0,
+        ttl_seconds: float = 10,
+        not_found_ttl_seconds: float = 2,
+    ):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.not_found_ttl_seconds = not_found_ttl_seconds
+        self.__lock = threading.Lock()
+        self.__entries: OrderedDict[tuple, tuple[float, TasksList | None]] = (
+            OrderedDict()
+        )
+        self.__keys_by_id: dict[str, set[tuple]] = {}
+        self.__generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    def load(
+        self, id: str, email: str, access: str, load: Callable[[], TasksList | None]
+    ) -> TasksList | None:
+        if self.max_size <= 0:
+            return load()
+        key = (id, email, access)
+        cached, generation = self.__lookup(key)
+        if generation is None:
+            return cached
+        tasks_list = load()
+        self.__store(key, generation, tasks_list)
+        return tasks_list
+
+    async def load_async(
+        self,
+        id: str,
+        email: str,
+        access: str,
+        load: Callable[[], Awaitable[TasksList | None]],
+    ) -> TasksList | None:
+        if self.max_size <= 0:
+            return await load()
+        key = (id, email, access)
+        cached, generation = self.__lookup(key)
+        if generation is None:
+            return cached
+        tasks_list = await load()
+        self.__store(key, generation, tasks_list)
+        return tasks_list
+
+    def populate(self, tasks_list: TasksList):
+        if self.max_size <= 0:
+            return
+        cached = copy.deepcopy(tasks_list)
+        with self.__lock:
+            self.__generation += 1
+            self.__remove(tasks_list.id)
+            self.__put((tasks_list.id, tasks_list.owner_email, OWNER_ACCESS), cached)
+            for email in [tasks_list.owner_email, *tasks_list.shared_with]:
+                self.__put((tasks_list.id, email, MEMBER_ACCESS), cached)
+
+    def invalidate(self, id: str):
+        if self.max_size <= 0:
+            return
+        with self.__lock:
+            self.__generation += 1
+            self.__remove(id)
+
+    def evict(self, id: str, etag: str | None = None):
+        if self.max_size <= 0:
+            return
+        with self.__lock:
+            keys = self.__keys_by_id.get(id, set())
+            if (
+                etag is not None
+                and len(keys) > 0
+                and all(self.__is_current(key, etag) for key in keys)
+            ):
+                return
+            self.__generation += 1
+            self.__remove(id)
+
+    # a hit is returned without a generation, a miss with the generation it was seen at
+    def __lookup(self, key: tuple) -> tuple[TasksList | None, int | None]:
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self.__entries.move_to_end(key)
+                self.hits += 1
+                return copy.deepcopy(entry[1]), None
+            self.misses += 1
+            return None, self.__generation
+
+    def __store(self, key: tuple, generation: int, tasks_list: TasksList | None):
+        with self.__lock:
+            # a write that finished while loading may have made this result stale
+            if generation == self.__generation:
+                self.__put(key, copy.deepcopy(tasks_list))
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    def __put(self, key: tuple, tasks_list: TasksList | None):
+        ttl_seconds = (
+            self.ttl_seconds if tasks_list is not None else self.not_found_ttl_seconds
+        )
+        self.__entries[key] = (time.monotonic() + ttl_seconds, tasks_list)
+        self.__entries.move_to_end(key)
+        self.__keys_by_id.setdefault(key[0], set()).add(key)
+        while len(self.__entries) > self.max_size:
+            evicted, _ = self.__entries.popitem(last=False)
+            self.__discard_key(evicted)
+
+    def __is_current(self, key: tuple, etag: str) -> bool:
+        tasks_list = self.__entries[key][1]
+        return tasks_list is not None and tasks_list.etag == etag
+
+    def __remove(self, id: str):
+        for key in self.__keys_by_id.pop(id, set()):
+            del self.__entries[key]
+
+    def __discard_key(self, key: tuple):
+        keys = self.__keys_by_id.get(key[0])
+        if keys is None:
+            return
+        keys.discard(key)
+        if len(keys) == 0:
+            del self.__keys_by_id[key[0]]
+
+
+def tasks_list_cache_for(config: dict) -> TasksListCache:
+    return TasksListCache(
+        config.get("tasks_list_cache_size", 0),
+        config.get("tasks_list_cache_ttl_seconds", 10),
+        config.get("tasks_list_not_found_ttl_seconds", 2),
+    )
@@ -1,170 +1,215 @@
-﻿from azure.cosmos import ContainerProxy
-
-from api.application.not_found_exception import NotFoundException
-from api.application.string_encoding import decode_string, encode_string
+﻿import datetime
+
+from api.application.invalidation_bus import InvalidationBus
+from api.application.last_selected_times import LastSelectedTimes
+from api.application.operation_context import traced_operations
+from api.application.read_counts import ReadCounts
+from api.application.tasks_list_cache import (
+    MEMBER_ACCESS,
+    OWNER_ACCESS,
+    TasksListCache,
+)
+from api.application.tasks_list_writes import (
+    TasksListWrites,
+    check_task_list_found,
+    none_applied,
+    to_page_size,
+    to_task_operations,
+)
 from api.domain.tasks_list import TasksList
-from api.persistence.converters import convert_to_domain, convert_to_domain_list
+from api.domain.tasks_list_summary import TasksListSummary
+from api.persistence.tasks_lists_repository import (
+    DuplicateTasksListNameError,
+    InvalidContinuationError,
+    StaleTasksListError,
+    TasksListsRepository,
+)
 from api.application.validation_exception import ValidationException
 
 
+@traced_operations
 class TasksListService:
 
-    def __init__(self, db: ContainerProxy):
-        self.db = db
+    def __init__(
+        self,
+        repository: TasksListsRepository,
+        last_selected_time_flush_seconds: float = 0,
+        tasks_list_cache: TasksListCache | None = None,
+        invalidation_bus: InvalidationBus | None = None,
+    ):
+        self.repository = repository
+        self.writes = TasksListWrites(tasks_list_cache, invalidation_bus)
+        self.concurrency_metrics = self.writes.concurrency_metrics
+        self.tasks_list_cache = self.writes.tasks_list_cache
+        self.read_counts = ReadCounts()
+        self.last_selected_times = LastSelectedTimes(
+            repository.save_last_selected_time,
+            last_selected_time_flush_seconds,
+            self.writes.changed,
+        )
 
     def add(self, name: str, owner_email: str):
         tasks_list = TasksList(name, owner_email)
-        if self.get(name, owner_email) is not None:
-            raise ValidationException("Tasks list with name already exists")
-        self.__encoded_tasks_list(tasks_list)
-        self.db.upsert_item(tasks_list.to_dict())
+        try:
+            self.repository.add(tasks_list)
+        except DuplicateTasksListNameError as error:
+            raise ValidationException(" ".join(error.args)) from error
+        self.writes.saved(tasks_list)
         return tasks_list
 
     def update(self, id: str, owner_email: str, new_name: str):
-        tasks_list = self.get(new_name, owner_email)
-        if tasks_list is not None and tasks_list.id != id:
-            raise ValidationException("Tasks list with name already exists")
-        tasks_list = self.get_by_id_for_owner(id, owner_email)
-        self.__check_task_list_found(tasks_list)
-        tasks_list.name = new_name
-        self.__encoded_tasks_list(tasks_list)
-        self.db.upsert_item(tasks_list.to_dict())
+        try:
+            tasks_list, _ = self.__modify(
+                lambda: self.get_by_id_for_owner(id, owner_email),
+                lambda the_tasks_list: setattr(the_tasks_list, "name", new_name),
+            )
+        except DuplicateTasksListNameError as error:
+            raise ValidationException(" ".join(error.args)) from error
         return tasks_list
 
-    def update_last_selected_time(self, id: str, owner_email: str):
-        tasks_list = self.get_by_id(id, owner_email)
-        self.__check_task_list_found(tasks_list)
-        tasks_list.update_last_selected_time()
-        self.__encoded_tasks_list(tasks_list)
-        self.db.upsert_item(tasks_list.to_dict())
+    def update_last_selected_time(self, id: str, email: str):
+        owner_email = self.last_selected_times.owner_of(id)
+        if owner_email != email:
+            tasks_list = self.get_by_id(id, email)
+            check_task_list_found(tasks_list)
+            owner_email = tasks_list.owner_email
+        self.last_selected_times.select(id, owner_email, datetime.datetime.now())
 
     def delete(self, id: str, owner_email: str):
-        tasks_list = self.get_by_id_for_owner(id, owner_email)
-        self.__check_task_list_found(tasks_list)
-        self.db.delete_item(
-            tasks_list.id,
-            tasks_list.owner_email,
-        )
+        for attempt in self.writes.attempts():
+            tasks_list = self.get_by_id_for_owner(id, owner_email)
+            check_task_list_found(tasks_list)
+            try:
+                self.repository.delete(tasks_list)
+            except StaleTasksListError:
+                self.writes.conflicted(id, attempt)
+                continue
+            self.writes.changed(id)
+            self.writes.written()
+            return
+        self.writes.give_up(id)
 
     def get(self, name: str, owner_email: str) -> TasksList | None:
-        item = self.db.query_items(
-            query="SELECT * FROM c WHERE c.name = @name and c.owner_email = @owner_email",
-            parameters=[
-                dict(name="@name", value=name),
-                dict(name="@owner_email", value=owner_email),
-            ],
-            enable_cross_partition_query=True,
+        return self.last_selected_times.overlay(
+            self.repository.load_by_name(name, owner_email)
         )
-        return self.__decoded_tasks_list(convert_to_domain(TasksList, item))
 
     def get_by_id_for_owner(self, id: str, owner_email: str) -> TasksList | None:
-        item = self.db.query_items(
-            query="SELECT * FROM c WHERE c.id = @id and c.owner_email = @owner_email",
-            parameters=[
-                dict(name="@id", value=id),
-                dict(name="@owner_email", value=owner_email),
-            ],
-            enable_cross_partition_query=True,
+        return self.__read(
+            self.tasks_list_cache.load(
+                id,
+                owner_email,
+                OWNER_ACCESS,
+                lambda: self.repository.load_for_owner(id, owner_email),
+            )
         )
-        return self.__decoded_tasks_list(convert_to_domain(TasksList, item))
 
     def get_by_id(self, id: str, email: str) -> TasksList | None:
-        item = self.db.query_items(
-            query="SELECT * FROM c WHERE c.id = @id and (c.owner_email = @email or ARRAY_CONTAINS(c.shared_with, @email))",
-            parameters=[
-                dict(name="@id", value=id),
-                dict(name="@email", value=email),
-            ],
-            enable_cross_partition_query=True,
+        return self.__read(
+            self.tasks_list_cache.load(
+                id, email, MEMBER_ACCESS, lambda: self.repository.load(id, email)
+            )
         )
-        return self.__decoded_tasks_list(convert_to_domain(TasksList, item))
 
     def get_all(self, email: str) -> list[TasksList]:
-        items = self.db.query_items(
-            query="SELECT * FROM c WHERE c.owner_email = @email or ARRAY_CONTAINS(c.shared_with, @email)",
-            parameters=[dict(name="@email", value=email)],
-            enable_cross_partition_query=True,
+        return self.last_selected_times.overlay_all(
+            self.repository.list_for_user(email)
         )
-        encoded_lists = convert_to_domain_list(TasksList, items)
-        return list(
-            self.__decoded_tasks_list(encoded_list) for encoded_list in encoded_lists
+
+    def get_all_summaries(self, email: str) -> list[TasksListSummary]:
+        return self.last_selected_times.overlay_all(
+            self.repository.list_summaries_for_user(email)
         )
 
+    def get_page(
+        self,
+        email: str,
+        limit: str | None,
+        continuation: str | None,
+        summary: bool = False,
+    ) -> tuple[list[TasksList | TasksListSummary], str | None]:
+        try:
+            items, next_continuation = self.repository.list_page_for_user(
+                email, to_page_size(limit), continuation, summary
+            )
+        except InvalidContinuationError as error:
+            raise ValidationException(" ".join(error.args)) from error
+        return self.last_selected_times.overlay_all(items), next_continuation
+
     def add_task(self, tasks_list_id: str, email: str, task: str):
-        tasks_list = self.get_by_id(tasks_list_id, email)
-        self.__check_task_list_found(tasks_list)
-        the_task_id = tasks_list.add(task)
-        self.__encoded_tasks_list(tasks_list)
-        self.db.upsert_item(tasks_list.to_dict())
+        _, the_task_id = self.__modify(
+            lambda: self.get_by_id(tasks_list_id, email),
+            lambda tasks_list: tasks_list.add(task),
+        )
         return the_task_id
 
     def tick_task(self, tasks_list_id: str, email: str, task_id: str):
-        tasks_list = self.get_by_id(tasks_list_id, email)
-        self.__check_task_list_found(tasks_list)
-        tasks_list.tick(task_id)
-        self.__encoded_tasks_list(tasks_list)
-        self.db.upsert_item(tasks_list.to_dict())
+        self.__modify(
+            lambda: self.get_by_id(tasks_list_id, email),
+            lambda tasks_list: tasks_list.tick(task_id),
+        )
 
     def remove_task(self, tasks_list_id: str, email: str, task_id: str):
-        tasks_list = self.get_by_id(tasks_list_id, email)
-        self.__check_task_list_found(tasks_list)
-        tasks_list.remove(task_id)
-        self.__encoded_tasks_list(tasks_list)
-        self.db.upsert_item(tasks_list.to_dict())
+        self.__modify(
+            lambda: self.get_by_id(tasks_list_id, email),
+            lambda tasks_list: tasks_list.remove(task_id),
+        )
 
     def carry_task(self, tasks_list_id: str, email: str, task_id: str):
-        tasks_list = self.get_by_id(tasks_list_id, email)
-        self.__check_task_list_found(tasks_list)
-        tasks_list.carry(task_id)
-        self.__encoded_tasks_list(tasks_list)
-        self.db.upsert_item(tasks_list.to_dict())
+        self.__modify(
+            lambda: self.get_by_id(tasks_list_id, email),
+            lambda tasks_list: tasks_list.carry(task_id),
+        )
+
+    def apply_task_operations(
+        self, tasks_list_id: str, email: str, operations: list[dict]
+    ) -> list[dict]:
+        task_operations = to_task_operations(operations)
+        _, results = self.__modify(
+            lambda: self.get_by_id(tasks_list_id, email),
+            lambda tasks_list: [
+                operation.apply_to(tasks_list) for operation in task_operations
+            ],
+            none_applied,
+        )
+        return results
 
     def share(self, tasks_list_id: str, owner_email: str, email_to_share: str):
-        tasks_list = self.get_by_id(tasks_list_id, owner_email)
-        self.__check_task_list_found(tasks_list)
-        tasks_list.share(email_to_share)
-        self.__encoded_tasks_list(tasks_list)
-        self.db.upsert_item(tasks_list.to_dict())
+        self.__modify(
+            lambda: self.get_by_id(tasks_list_id, owner_email),
+            lambda tasks_list: tasks_list.share(email_to_share),
+        )
 
     def unshare(self, tasks_list_id: str, owner_email: str, email_to_unshare: str):
-        tasks_list = self.get_by_id(tasks_list_id, owner_email)
-        self.__check_task_list_found(tasks_list)
-        tasks_list.unshare(email_to_unshare)
-        self.__encoded_tasks_list(tasks_list)
-        self.db.upsert_item(tasks_list.to_dict())
+        self.__modify(
+            lambda: self.get_by_id(tasks_list_id, owner_email),
+            lambda tasks_list: tasks_list.unshare(email_to_unshare),
+        )
 
     def unshare_self(self, tasks_list_id: str, email_to_unshare: str):
-        tasks_list = self.get_by_id(tasks_list_id, email_to_unshare)
-        self.__check_task_list_found(tasks_list)
-        tasks_list.unshare(email_to_unshare)
-        self.__encoded_tasks_list(tasks_list)
-        self.db.upsert_item(tasks_list.to_dict())
-
-    @staticmethod
-    def __check_task_list_found(tasks_list):
-        if tasks_list is None:
-            raise NotFoundException("Tasks list not found")
-
-    @staticmethod
-    def __decoded_tasks_list(tasks_list: TasksList):
-        if tasks_list is not None:
-            tasks_list.__setattr__(
-                "tasks",
-                [
-                    task.set_content(decode_string(task.content))
-                    for task in tasks_list.tasks
-                ],
-            )
-        return tasks_list
+        self.__modify(
+            lambda: self.get_by_id(tasks_list_id, email_to_unshare),
+            lambda tasks_list: tasks_list.unshare(email_to_unshare),
+        )
 
-    @staticmethod
-    def __encoded_tasks_list(tasks_list: TasksList):
-        if tasks_list is not None:
-            tasks_list.__setattr__(
-                "tasks",
-                [
-                    task.set_content(encode_string(task.content))
-                    for task in tasks_list.tasks
-                ],
-            )
-        return tasks_list
+    def __read(self, tasks_list: TasksList | None) -> TasksList | None:
+        self.read_counts.record(tasks_list)
+        return self.last_selected_times.overlay(tasks_list)
+
+    def __modify(self, load, change, unchanged=lambda result: False):
+        for attempt in self.writes.attempts():
+            tasks_list = load()
+            check_task_list_found(tasks_list)
+            original = tasks_list.to_dict()
+            result = change(tasks_list)
+            if unchanged(result):
+                return tasks_list, result
+            try:
+                self.repository.save(tasks_list, original)
+            except StaleTasksListError:
+                self.writes.conflicted(tasks_list.id, attempt)
+                continue
+            self.writes.saved(tasks_list)
+            self.writes.written()
+            return tasks_list, result
+        self.writes.give_up(tasks_list.id)
@@ -0,0 +1,88 @@
+from api.application.concurrency_metrics import ConcurrencyMetrics
+from api.application.conflict_exception import ConflictException
+from api.application.invalidation_bus import InvalidationBus
+from api.application.not_found_exception import NotFoundException
+from api.application.tasks_list_cache import TasksListCache
+from api.application.validation_exception import ValidationException
+from api.domain.task_operation import TaskOperation
+from api.domain.tasks_list import TasksList
+
+MAX_WRITE_ATTEMPTS = 5
+MAX_TASK_OPERATIONS = 50
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+def to_page_size(limit: str | None) -> int:
+    if limit is None:
+        return DEFAULT_PAGE_SIZE
+    if not limit.isdigit() or not 1 <= int(limit) <= MAX_PAGE_SIZE:
+        raise ValidationException(f"Limit must be between 1 and {MAX_PAGE_SIZE}")
+    return int(limit)
+
+
+def to_task_operations(operations: list[dict]) -> list[TaskOperation]:
+    if not isinstance(operations, list) or len(operations) == 0:
+        raise ValidationException("Operations must be a non-empty list")
+    if len(operations) > MAX_TASK_OPERATIONS:
+        raise ValidationException(
+            f"No more than {MAX_TASK_OPERATIONS} operations can be applied at once"
+        )
+    try:
+        return [TaskOperation.from_dict(operation) for operation in operations]
+    except Exception as error:
+        raise ValidationException(" ".join(error.args)) from error
+
+
+def none_applied(results: list[dict]) -> bool:
+    return all("error" in result for result in results)
+
+
+def check_task_list_found(tasks_list):
+    if tasks_list is None:
+        raise NotFoundException("Tasks list not found")
+
+
+# What the sync and async services do around each write, so they cannot drift apart
+class TasksListWrites:
+
+    def __init__(
+        self,
+        tasks_list_cache: TasksListCache | None = None,
+        invalidation_bus: InvalidationBus | None = None,
+    ):
+        self.concurrency_metrics = ConcurrencyMetrics()
+        self.tasks_list_cache = (
+            tasks_list_cache if tasks_list_cache is not None else TasksListCache()
+        )
+        self.invalidation_bus = invalidation_bus
+        if invalidation_bus is not None:
+            invalidation_bus.subscribe(
+                lambda message: self.tasks_list_cache.evict(
+                    message["list_id"], message["etag"]
+                )
+            )
+
+    def attempts(self) -> range:
+        return range(1, MAX_WRITE_ATTEMPTS + 1)
+
+    def saved(self, tasks_list: TasksList):
+        self.tasks_list_cache.populate(tasks_list)
+        if self.invalidation_bus is not None:
+            self.invalidation_bus.publish(tasks_list.id, tasks_list.etag)
+
+    def changed(self, id: str):
+        self.tasks_list_cache.invalidate(id)
+        if self.invalidation_bus is not None:
+            self.invalidation_bus.publish(id, None)
+
+    def written(self):
+        self.concurrency_metrics.record_write()
+
+    def conflicted(self, id: str, attempt: int):
+        self.tasks_list_cache.invalidate(id)
+        self.concurrency_metrics.record_conflict(id, attempt)
+
+    def give_up(self, id: str):
+        self.concurrency_metrics.record_exhausted(id)
+        raise ConflictException("Tasks list was changed by someone else, try again")
@@ -0,0 +1,28 @@
+from api.handlers.async_tasks_list_handlers import register_async_task_handlers
+from quart import Quart
+from quart_cors import cors
+from api.handlers.exception_handlers import handle_exception
+from api.handlers.requests import CONTINUATION_HEADER_KEY
+
+# these wrap the synchronous Cosmos client or drive the synchronous service
+UNSUPPORTED_ASYNC_OPTIONS = [
+    "cosmos_metrics",
+    "cosmos_partition_ru_per_second",
+    "warm_start_snapshot_path",
+]
+
+
+def check_async_options(config: dict):
+    unsupported = [option for option in UNSUPPORTED_ASYNC_OPTIONS if config.get(option)]
+    if len(unsupported) > 0:
+        raise ValueError(
+            f"{', '.join(unsupported)} cannot be used with asgi: true, turn them off"
+            " or set asgi: false"
+        )
+
+
+def create_async_app(tasks_list_service):
+    app = cors(Quart(__name__), expose_headers=[CONTINUATION_HEADER_KEY])
+    register_async_task_handlers(app, tasks_list_service)
+    app.errorhandler(Exception)(handle_exception)
+    return app
@@ -1,4 +1,122 @@
-﻿from flask_caching import Cache
+﻿import logging
+
+from cachelib import BaseCache, FileSystemCache, RedisCache, SimpleCache
+from flask_caching import Cache
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIMEOUT = 300
+REDIS_KEY_PREFIX = "rule_of_three:"
 
 cache = Cache()
-cache_config = {"CACHE_TYPE": "SimpleCache", "CACHE_DEFAULT_TIMEOUT": 300}
+cache_config = {"CACHE_TYPE": "SimpleCache", "CACHE_DEFAULT_TIMEOUT": DEFAULT_TIMEOUT}
+
+
+def create_backend(settings: dict, default_timeout: int = DEFAULT_TIMEOUT) -> BaseCache:
+    cache_type = settings.get("cache_type", "simple")
+    try:
+        if cache_type == "filesystem":
+            return FileSystemCache(
+                settings.get("cache_dir", "rule_of_three_cache"),
+                default_timeout=default_timeout,
+            )
+        if cache_type == "redis":
+            import redis
+
+            return RedisCache(
+                redis.Redis.from_url(
+                    settings.get("cache_redis_url", "redis://localhost:6379/0")
+                ),
+                default_timeout=default_timeout,
+                key_prefix=REDIS_KEY_PREFIX,
+                check_connection=True,
+            )
+    except Exception:
+        logger.warning(
+            "Could not use the %s cache, caching in process instead",
+            cache_type,
+            exc_info=True,
+        )
+    return SimpleCache(default_timeout=default_timeout)
+
+
+class FallbackCache(BaseCache):
+
+    def __init__(self, cache: BaseCache, default_timeout: int = DEFAULT_TIMEOUT):
+        super().__init__(default_timeout)
+        self.cache = cache
+        self.fallback = SimpleCache(default_timeout=default_timeout)
+        self.degraded = False
+
+    def get(self, key: str):
+        return self.__call("get", key)
+
+    def get_many(self, *keys: str) -> list:
+        return self.__call("get_many", *keys)
+
+    def set(self, key: str, value, timeout: int | None = None) -> bool:
+        return self.__call("set", key, value, timeout)
+
+    def set_many(self, mapping: dict, timeout: int | None = None) -> list:
+        return self.__call("set_many", mapping, timeout)
+
+    def add(self, key: str, value, timeout: int | None = None) -> bool:
+        return self.__call("add", key, value, timeout)
+
+    def delete(self, key: str) -> bool:
+        return self.__call("delete", key)
+
+    def delete_many(self, *keys: str) -> list:
+        return self.__call("delete_many", *keys)
+
+    def has(self, key: str) -> bool:
+        return self.__call("has", key)
+
+    def clear(self) -> bool:
+        self.fallback.clear()
+        return self.__call("clear")
+
+    def inc(self, key: str, delta: int = 1) -> int | None:
+        return self.__call("inc", key, delta)
+
+    def dec(self, key: str, delta: int = 1) -> int | None:
+        return self.__call("dec", key, delta)
+
+    def __call(self, operation: str, *args):
+        try:
+            result = getattr(self.cache, operation)(*args)
+        except Exception:
+            if not self.degraded:
+                logger.warning(
+                    "Shared cache is unavailable, caching in process instead",
+                    exc_info=True,
+                )
+                self.degraded = True
+            return getattr(self.fallback, operation)(*args)
+        if self.degraded:
+            logger.info("Shared cache is available again")
+            self.degraded = False
+        return result
+
+
+def create_cache_backend(app, config: dict, args: list, options: dict) -> BaseCache:
+    return FallbackCache(
+        create_backend(options["settings"], options["default_timeout"]),
+        options["default_timeout"],
+    )
+
+
+def cache_config_for(settings: dict) -> dict:
+    return {
+        "CACHE_TYPE": "api.cache.create_cache_backend",
+        "CACHE_DEFAULT_TIMEOUT": DEFAULT_TIMEOUT,
+        "CACHE_OPTIONS": {"settings": settings},
+    }
+
+
+# flask_caching needs a Flask app context, so the ASGI app keeps its own cache
+async_cache = FallbackCache(SimpleCache(default_timeout=DEFAULT_TIMEOUT))
+
+
+def configure_async_cache(settings: dict):
+    async_cache.cache = create_backend(settings)
@@ -0,0 +1,51 @@
+from dataclasses import dataclass
+
+from api.domain.tasks_list import TasksList
+
+ADD = "add"
+TICK = "tick"
+CARRY = "carry"
+REMOVE = "remove"
+TASK_OPERATIONS = [ADD, TICK, CARRY, REMOVE]
+
+
+@dataclass(frozen=True)
+class TaskOperation:
+    op: str
+    content: str = None
+    task_id: str = None
+
+    def to_dict(self):
+        if self.op == ADD:
+            return {"op": self.op, "content": self.content}
+        return {"op": self.op, "task_id": self.task_id}
+
+    @staticmethod
+    def from_dict(dictionary):
+        op = dictionary.get("op")
+        if op not in TASK_OPERATIONS:
+            raise Exception("Operation must be one of " + ", ".join(TASK_OPERATIONS))
+        if op == ADD:
+            if not isinstance(dictionary.get("content"), str):
+                raise Exception("Add operation requires content")
+            return TaskOperation(op, content=dictionary["content"])
+        if not isinstance(dictionary.get("task_id"), str):
+            raise Exception(op.capitalize() + " operation requires a task_id")
+        return TaskOperation(op, task_id=dictionary["task_id"])
+
+    def apply_to(self, tasks_list: TasksList) -> dict:
+        result = {"op": self.op}
+        try:
+            if self.op == ADD:
+                result["id"] = tasks_list.add(self.content)
+                return result
+            result["task_id"] = self.task_id
+            if self.op == TICK:
+                tasks_list.tick(self.task_id)
+            elif self.op == CARRY:
+                tasks_list.carry(self.task_id)
+            else:
+                tasks_list.remove(self.task_id)
+        except Exception as error:
+            result["error"] = " ".join(error.args)
+        return result
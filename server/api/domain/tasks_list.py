@@ -14,6 +14,7 @@ class TasksList:
         id: str = None,
         last_selected_time: datetime.datetime | str = None,
         shared_with: list[str] = None,
+        etag: str = None,
     ):
         self.name = name
         self.owner_email = owner_email
@@ -33,6 +34,7 @@ class TasksList:
             self.shared_with = shared_with
         else:
             self.shared_with = []
+        self.etag = etag
 
     @staticmethod
     def from_dict(dictionary):
@@ -43,6 +45,7 @@ class TasksList:
             dictionary["id"],
             dictionary["last_selected_time"],
             [shared for shared in dictionary["shared_with"]],
+            dictionary.get("_etag"),
         )
 
     def to_dict(self):
@@ -52,7 +55,7 @@ class TasksList:
             "tasks": [task.to_dict() for task in self.tasks],
             "id": self.id,
             "last_selected_time": self.last_selected_time.isoformat(),
-            "shared_with": self.shared_with,
+            "shared_with": list(self.shared_with),
         }
 
     def add(self, task: str):
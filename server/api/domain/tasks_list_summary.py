@@ -0,0 +1,30 @@
+import datetime
+from dataclasses import dataclass, field
+
+
+@dataclass(frozen=True)
+class TasksListSummary:
+    id: str
+    name: str
+    owner_email: str
+    last_selected_time: datetime.datetime
+    shared_with: list[str] = field(default_factory=list)
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "name": self.name,
+            "owner_email": self.owner_email,
+            "last_selected_time": self.last_selected_time.isoformat(),
+            "shared_with": list(self.shared_with),
+        }
+
+    @staticmethod
+    def from_dict(dictionary):
+        return TasksListSummary(
+            dictionary["id"],
+            dictionary["name"],
+            dictionary["owner_email"],
+            datetime.datetime.fromisoformat(dictionary["last_selected_time"]),
+            [shared for shared in dictionary["shared_with"]],
+        )
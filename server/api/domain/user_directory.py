@@ -0,0 +1,70 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class UserDirectoryEntry:
+    id: str
+    name: str
+    owner_email: str
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "name": self.name,
+            "owner_email": self.owner_email,
+        }
+
+    @staticmethod
+    def from_dict(dictionary):
+        return UserDirectoryEntry(
+            dictionary["id"],
+            dictionary["name"],
+            dictionary["owner_email"],
+        )
+
+
+class UserDirectory:
+
+    def __init__(
+        self,
+        email: str,
+        tasks_lists: list[UserDirectoryEntry] = None,
+        etag: str = None,
+    ):
+        self.email = email
+        if tasks_lists is not None:
+            self.tasks_lists = tasks_lists
+        else:
+            self.tasks_lists = []
+        self.etag = etag
+
+    @staticmethod
+    def from_dict(dictionary):
+        return UserDirectory(
+            dictionary["id"],
+            [
+                UserDirectoryEntry.from_dict(entry)
+                for entry in dictionary["tasks_lists"]
+            ],
+            dictionary.get("_etag"),
+        )
+
+    def to_dict(self):
+        return {
+            "id": self.email,
+            "tasks_lists": [entry.to_dict() for entry in self.tasks_lists],
+        }
+
+    def add(self, id: str, name: str, owner_email: str):
+        entry = UserDirectoryEntry(id, name, owner_email)
+        for index, existing in enumerate(self.tasks_lists):
+            if existing.id == id:
+                self.tasks_lists[index] = entry
+                return
+        self.tasks_lists.append(entry)
+
+    def remove(self, id: str):
+        self.tasks_lists = [entry for entry in self.tasks_lists if entry.id != id]
+
+    def retain(self, ids: list[str]):
+        self.tasks_lists = [entry for entry in self.tasks_lists if entry.id in ids]
@@ -0,0 +1,53 @@
+import asyncio
+from functools import wraps
+from typing import Dict
+
+from quart import request
+
+from api.cache import async_cache
+from api.handlers import auth_zero_decorators
+from api.handlers.auth_zero_decorators import (
+    parse_token_auth_header,
+    verified_tokens,
+    verify_cached_token,
+)
+from api.handlers.jwks_key_store import JwksKeyStore
+from api.handlers.requests import AUTHORIZATION_HEADER_KEY
+
+
+def get_jwks_from_async_cache() -> Dict[str, str]:
+    jwks = async_cache.get("jwks")
+    if jwks is None:
+        jwks = refresh_jwks_in_async_cache()
+    return jwks
+
+
+def refresh_jwks_in_async_cache() -> Dict[str, str]:
+    jwks = auth_zero_decorators.get_jwks()
+    async_cache.set("jwks", jwks)
+    return jwks
+
+
+async_jwks_key_store = JwksKeyStore(
+    get_jwks_from_async_cache,
+    refresh_jwks_in_async_cache,
+    auth_zero_decorators.config.get("jwks_max_age_seconds", 300),
+)
+
+
+def requires_auth(func):
+    @wraps(func)
+    async def decorated(*args, **kwargs):
+        token = parse_token_auth_header(
+            request.headers.get(AUTHORIZATION_HEADER_KEY, None)
+        )
+        payload = verified_tokens.get(token)
+        if payload is None:
+            # fetching keys and checking the signature both block, so keep them off the loop
+            payload = await asyncio.to_thread(
+                verify_cached_token, token, async_jwks_key_store
+            )
+        request.current_user = payload
+        return await func(*args, **kwargs)
+
+    return decorated
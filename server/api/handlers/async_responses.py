@@ -0,0 +1,46 @@
+﻿from quart import Response
+from http import HTTPStatus
+import json
+from collections.abc import Iterable, Iterator
+from api.handlers.requests import CONTINUATION_HEADER_KEY
+from api.handlers.responses import json_array
+
+
+def success_response(item) -> Response:
+    if isinstance(item, (list, Iterator)):
+        return Response(response=json_array(item), status=HTTPStatus.OK)
+    if item is None:
+        return Response(status=HTTPStatus.OK)
+    if type(item) is dict:
+        return Response(response=json.dumps(item), status=HTTPStatus.OK)
+    return Response(response=json.dumps(item.to_dict()), status=HTTPStatus.OK)
+
+
+def paged_response(items: Iterable, continuation: str | None) -> Response:
+    response = success_response(items)
+    if continuation is not None:
+        response.headers[CONTINUATION_HEADER_KEY] = continuation
+    return response
+
+
+def created_response(item) -> Response:
+    if item is None:
+        return Response(status=HTTPStatus.CREATED)
+    if type(item) is dict:
+        return Response(response=json.dumps(item), status=HTTPStatus.CREATED)
+    return Response(response=json.dumps(item.to_dict()), status=HTTPStatus.CREATED)
+
+
+def unavailable_response(item: dict) -> Response:
+    return Response(response=json.dumps(item), status=HTTPStatus.SERVICE_UNAVAILABLE)
+
+
+def not_found_response(error: str) -> Response:
+    return Response(
+        response=json.dumps({"error": error}),
+        status=HTTPStatus.NOT_FOUND,
+    )
+
+
+def no_content_response() -> Response:
+    return Response(status=HTTPStatus.NO_CONTENT)
@@ -0,0 +1,380 @@
+﻿from quart.views import MethodView
+from quart import request
+from .async_auth_zero_decorators import async_jwks_key_store, requires_auth
+from .requests import (
+    SUMMARY_VIEW,
+    get_async_request_body_property,
+    get_query_parameter,
+    get_user_email,
+)
+from .async_responses import *
+from api.application.async_tasks_list_service import AsyncTasksListService
+from api._app import add_app_url
+from api.warmup import Warmup
+
+
+class AsyncTasksListHandlerForGroups(MethodView):
+    init_every_request = False
+    decorators = [requires_auth]
+
+    @staticmethod
+    def route():
+        return "/tasks-lists"
+
+    @staticmethod
+    def name():
+        return "tasks_list_handler_for_groups"
+
+    def __init__(self, tasks_list_service: AsyncTasksListService):
+        self.tasks_list_service = tasks_list_service
+
+    async def get(self):
+        summary = get_query_parameter(request, "view") == SUMMARY_VIEW
+        limit = get_query_parameter(request, "limit")
+        continuation = get_query_parameter(request, "continuation")
+        if limit is not None or continuation is not None:
+            tasks_lists, next_continuation = await self.tasks_list_service.get_page(
+                get_user_email(request), limit, continuation, summary
+            )
+            return paged_response(tasks_lists, next_continuation)
+        if summary:
+            return success_response(
+                await self.tasks_list_service.get_all_summaries(get_user_email(request))
+            )
+        return success_response(
+            await self.tasks_list_service.get_all(get_user_email(request))
+        )
+
+    async def post(self):
+        tasks_list = await self.tasks_list_service.add(
+            await get_async_request_body_property(request, "name"),
+            get_user_email(request),
+        )
+        return created_response(tasks_list)
+
+
+class AsyncTasksListHandlerForItems(MethodView):
+    init_every_request = False
+    decorators = [requires_auth]
+
+    @staticmethod
+    def route():
+        return "/tasks-lists/<id>"
+
+    @staticmethod
+    def name():
+        return "tasks_list_handler_for_items"
+
+    def __init__(self, tasks_list_service: AsyncTasksListService):
+        self.tasks_list_service = tasks_list_service
+
+    async def get(self, id):
+        tasks_list = await self.tasks_list_service.get_by_id(
+            id, get_user_email(request)
+        )
+        if tasks_list is None:
+            return not_found_response("Tasks list not found")
+        return success_response(tasks_list)
+
+    async def patch(self, id):
+        await self.tasks_list_service.update(
+            id,
+            get_user_email(request),
+            await get_async_request_body_property(request, "name"),
+        )
+        return no_content_response()
+
+    async def delete(self, id):
+        await self.tasks_list_service.delete(id, get_user_email(request))
+        return no_content_response()
+
+
+class AsyncUpdateLastSelectedTimeHandler(MethodView):
+    init_every_request = False
+    decorators = [requires_auth]
+
+    @staticmethod
+    def route():
+        return "/tasks-lists/<id>/last-selected-time"
+
+    @staticmethod
+    def name():
+        return "update_last_selected_time_handler"
+
+    def __init__(self, tasks_list_service: AsyncTasksListService):
+        self.tasks_list_service = tasks_list_service
+
+    async def patch(self, id):
+        await self.tasks_list_service.update_last_selected_time(
+            id, get_user_email(request)
+        )
+        return no_content_response()
+
+
+class AsyncShareTasksListHandler(MethodView):
+    init_every_request = False
+    decorators = [requires_auth]
+
+    @staticmethod
+    def route():
+        return "/tasks-lists/<id>/share"
+
+    @staticmethod
+    def name():
+        return "share_tasks_list_handler"
+
+    def __init__(self, tasks_list_service: AsyncTasksListService):
+        self.tasks_list_service = tasks_list_service
+
+    async def patch(self, id):
+        await self.tasks_list_service.share(
+            id,
+            get_user_email(request),
+            await get_async_request_body_property(request, "share_with"),
+        )
+        return no_content_response()
+
+
+class AsyncUnshareTasksListHandler(MethodView):
+    init_every_request = False
+    decorators = [requires_auth]
+
+    @staticmethod
+    def route():
+        return "/tasks-lists/<id>/unshare"
+
+    @staticmethod
+    def name():
+        return "unshare_tasks_list_handler"
+
+    def __init__(self, tasks_list_service: AsyncTasksListService):
+        self.tasks_list_service = tasks_list_service
+
+    async def patch(self, id):
+        await self.tasks_list_service.unshare(
+            id,
+            get_user_email(request),
+            await get_async_request_body_property(request, "unshare_with"),
+        )
+        return no_content_response()
+
+
+class AsyncUnshareSelfTasksListHandler(MethodView):
+    init_every_request = False
+    decorators = [requires_auth]
+
+    @staticmethod
+    def route():
+        return "/tasks-lists/<id>/unshare-self"
+
+    @staticmethod
+    def name():
+        return "unshare_self_tasks_list_handler"
+
+    def __init__(self, tasks_list_service: AsyncTasksListService):
+        self.tasks_list_service = tasks_list_service
+
+    async def patch(self, id):
+        await self.tasks_list_service.unshare_self(id, get_user_email(request))
+        return no_content_response()
+
+
+class AsyncAddTasksHandler(MethodView):
+    init_every_request = False
+    decorators = [requires_auth]
+
+    @staticmethod
+    def route():
+        return "/tasks-lists/<tasks_list_id>/task"
+
+    @staticmethod
+    def name():
+        return "add_task_handler"
+
+    def __init__(self, tasks_list_service: AsyncTasksListService):
+        self.tasks_list_service = tasks_list_service
+
+    async def post(self, tasks_list_id):
+        task_id = await self.tasks_list_service.add_task(
+            tasks_list_id,
+            get_user_email(request),
+            await get_async_request_body_property(request, "content"),
+        )
+        return created_response({"id": task_id})
+
+
+class AsyncTickTaskHandler(MethodView):
+    init_every_request = False
+    decorators = [requires_auth]
+
+    @staticmethod
+    def route():
+        return "/tasks-lists/<tasks_list_id>/task/<task_id>/tick"
+
+    @staticmethod
+    def name():
+        return "tick_task_handler"
+
+    def __init__(self, tasks_list_service: AsyncTasksListService):
+        self.tasks_list_service = tasks_list_service
+
+    async def patch(self, tasks_list_id, task_id):
+        await self.tasks_list_service.tick_task(
+            tasks_list_id,
+            get_user_email(request),
+            task_id,
+        )
+        return no_content_response()
+
+
+class AsyncRemoveTaskHandler(MethodView):
+    init_every_request = False
+    decorators = [requires_auth]
+
+    @staticmethod
+    def route():
+        return "/tasks-lists/<tasks_list_id>/task/<task_id>/remove"
+
+    @staticmethod
+    def name():
+        return "remove_task_handler"
+
+    def __init__(self, tasks_list_service: AsyncTasksListService):
+        self.tasks_list_service = tasks_list_service
+
+    async def patch(self, tasks_list_id, task_id):
+        await self.tasks_list_service.remove_task(
+            tasks_list_id, get_user_email(request), task_id
+        )
+        return no_content_response()
+
+
+class AsyncCarryTaskHandler(MethodView):
+    init_every_request = False
+    decorators = [requires_auth]
+
+    @staticmethod
+    def route():
+        return "/tasks-lists/<tasks_list_id>/task/<task_id>/carry"
+
+    @staticmethod
+    def name():
+        return "carry_task_handler"
+
+    def __init__(self, tasks_list_service: AsyncTasksListService):
+        self.tasks_list_service = tasks_list_service
+
+    async def patch(self, tasks_list_id, task_id):
+        await self.tasks_list_service.carry_task(
+            tasks_list_id, get_user_email(request), task_id
+        )
+        return no_content_response()
+
+
+class AsyncTaskOperationsHandler(MethodView):
+    init_every_request = False
+    decorators = [requires_auth]
+
+    @staticmethod
+    def route():
+        return "/tasks-lists/<tasks_list_id>/operations"
+
+    @staticmethod
+    def name():
+        return "task_operations_handler"
+
+    def __init__(self, tasks_list_service: AsyncTasksListService):
+        self.tasks_list_service = tasks_list_service
+
+    async def post(self, tasks_list_id):
+        results = await self.tasks_list_service.apply_task_operations(
+            tasks_list_id,
+            get_user_email(request),
+            await get_async_request_body_property(request, "operations"),
+        )
+        return success_response({"results": results})
+
+
+class AsyncKeepAliveHandler(MethodView):
+    init_every_request = False
+
+    @staticmethod
+    def route():
+        return "/keep-alive"
+
+    @staticmethod
+    def name():
+        return "keep_alive_handler"
+
+    def __init__(self, warmup: Warmup):
+        self.warmup = warmup
+
+    async def get(self):
+        report = await self.warmup.run_async()
+        if report["ok"]:
+            return success_response(report)
+        return unavailable_response(report)
+
+
+def register_async_task_handlers(app, tasks_list_service):
+    tasks_list_handler_for_groups = AsyncTasksListHandlerForGroups.as_view(
+        AsyncTasksListHandlerForGroups.name(), tasks_list_service
+    )
+    tasks_list_handler_for_items = AsyncTasksListHandlerForItems.as_view(
+        AsyncTasksListHandlerForItems.name(), tasks_list_service
+    )
+    update_last_selected_time_handler = AsyncUpdateLastSelectedTimeHandler.as_view(
+        AsyncUpdateLastSelectedTimeHandler.name(), tasks_list_service
+    )
+    share_tasks_list_handler = AsyncShareTasksListHandler.as_view(
+        AsyncShareTasksListHandler.name(), tasks_list_service
+    )
+    unshare_tasks_list_handler = AsyncUnshareTasksListHandler.as_view(
+        AsyncUnshareTasksListHandler.name(), tasks_list_service
+    )
+    unshare_self_tasks_list_handler = AsyncUnshareSelfTasksListHandler.as_view(
+        AsyncUnshareSelfTasksListHandler.name(), tasks_list_service
+    )
+    add_tasks_handler = AsyncAddTasksHandler.as_view(
+        AsyncAddTasksHandler.name(), tasks_list_service
+    )
+    tick_task_handler = AsyncTickTaskHandler.as_view(
+        AsyncTickTaskHandler.name(), tasks_list_service
+    )
+    remove_task_handler = AsyncRemoveTaskHandler.as_view(
+        AsyncRemoveTaskHandler.name(), tasks_list_service
+    )
+    carry_task_handler = AsyncCarryTaskHandler.as_view(
+        AsyncCarryTaskHandler.name(), tasks_list_service
+    )
+    task_operations_handler = AsyncTaskOperationsHandler.as_view(
+        AsyncTaskOperationsHandler.name(), tasks_list_service
+    )
+    keep_alive_handler = AsyncKeepAliveHandler.as_view(
+        AsyncKeepAliveHandler.name(),
+        Warmup(tasks_list_service, async_jwks_key_store),
+    )
+
+    add_app_url(
+        app, AsyncTasksListHandlerForGroups.route(), tasks_list_handler_for_groups
+    )
+    add_app_url(
+        app, AsyncTasksListHandlerForItems.route(), tasks_list_handler_for_items
+    )
+    add_app_url(
+        app,
+        AsyncUpdateLastSelectedTimeHandler.route(),
+        update_last_selected_time_handler,
+    )
+    add_app_url(app, AsyncShareTasksListHandler.route(), share_tasks_list_handler)
+    add_app_url(app, AsyncUnshareTasksListHandler.route(), unshare_tasks_list_handler)
+    add_app_url(
+        app, AsyncUnshareSelfTasksListHandler.route(), unshare_self_tasks_list_handler
+    )
+    add_app_url(app, AsyncAddTasksHandler.route(), add_tasks_handler)
+    add_app_url(app, AsyncTickTaskHandler.route(), tick_task_handler)
+    add_app_url(app, AsyncRemoveTaskHandler.route(), remove_task_handler)
+    add_app_url(app, AsyncCarryTaskHandler.route(), carry_task_handler)
+    add_app_url(app, AsyncTaskOperationsHandler.route(), task_operations_handler)
+    add_app_url(app, AsyncKeepAliveHandler.route(), keep_alive_handler)
+    return app
@@ -1,6 +1,10 @@
 ﻿# Taken from https://github.com/auth0-samples/auth0-python-api-samples/blob/master/00-Starter-Seed/server.py
+from collections import OrderedDict
 from functools import wraps
+import hashlib
 import json
+import threading
+import time
 from typing import Dict
 from urllib.request import urlopen
 
@@ -10,6 +14,7 @@ from jose import jwt
 from pathlib import Path
 import yaml
 
+from api.handlers.jwks_key_store import JwksKeyStore
 from api.handlers.requests import (
     AUTHORIZATION_HEADER_KEY,
 )
@@ -20,6 +25,8 @@ config = yaml.safe_load(open(path))
 AUTH0_DOMAIN = config["AUTH0_DOMAIN"]
 AUTH0_API_IDENTIFIER = config["AUTH0_API_IDENTIFIER"]
 ALGORITHMS = ["RS256"]
+CLOCK_SKEW_SECONDS = config.get("jwt_clock_skew_seconds", 30)
+MAX_VERIFIED_TOKENS = config.get("max_verified_tokens", 1000)
 
 
 class AuthError(Exception):
@@ -28,7 +35,10 @@ class AuthError(Exception):
 
 
 def get_token_auth_header() -> str:
-    auth = request.headers.get(AUTHORIZATION_HEADER_KEY, None)
+    return parse_token_auth_header(request.headers.get(AUTHORIZATION_HEADER_KEY, None))
+
+
+def parse_token_auth_header(auth: str | None) -> str:
     if not auth:
         raise AuthError(AUTHORIZATION_HEADER_KEY + " header is expected")
 
@@ -58,6 +68,76 @@ def get_jwks_from_cache() -> Dict[str, str]:
     return jwks
 
 
+def refresh_jwks_in_cache() -> Dict[str, str]:
+    jwks = get_jwks()
+    cache.set("jwks", jwks)
+    return jwks
+
+
+jwks_key_store = JwksKeyStore(
+    lambda: get_jwks_from_cache(),
+    lambda: refresh_jwks_in_cache(),
+    config.get("jwks_max_age_seconds", 300),
+)
+
+
+class VerifiedTokens:
+
+    def __init__(
+        self,
+        max_size: int = MAX_VERIFIED_TOKENS,
+        clock_skew_seconds: float = CLOCK_SKEW_SECONDS,
+    ):
+        self.max_size = max_size
+        self.clock_skew_seconds = clock_skew_seconds
+        self.__lock = threading.Lock()
+        self.__payloads: OrderedDict[bytes, dict] = OrderedDict()
+
+    def get(self, token: str) -> dict | None:
+        digest = hashlib.sha256(token.encode()).digest()
+        now = time.time()
+        with self.__lock:
+            payload = self.__payloads.get(digest)
+            if payload is None:
+                return None
+            if now >= payload["exp"] + self.clock_skew_seconds:
+                del self.__payloads[digest]
+                return None
+            if now + self.clock_skew_seconds < payload.get("nbf", now):
+                return None
+            self.__payloads.move_to_end(digest)
+            return payload
+
+    def add(self, token: str, payload: dict):
+        # tokens without an expiry are verified every time
+        if self.max_size <= 0 or "exp" not in payload:
+            return
+        digest = hashlib.sha256(token.encode()).digest()
+        with self.__lock:
+            self.__payloads[digest] = payload
+            self.__payloads.move_to_end(digest)
+            while len(self.__payloads) > self.max_size:
+                self.__payloads.popitem(last=False)
+
+    def clear(self):
+        with self.__lock:
+            self.__payloads.clear()
+
+    def __len__(self) -> int:
+        return len(self.__payloads)
+
+
+verified_tokens = VerifiedTokens()
+
+
+def verify_cached_token(token: str, key_store: JwksKeyStore = jwks_key_store) -> dict:
+    payload = verified_tokens.get(token)
+    if payload is None:
+        payload = verify_token(token, key_store)
+        verified_tokens.add(token, payload)
+    return payload
+
+
 def requires_scope(required_scope: str) -> bool:
     token = get_token_auth_header()
     unverified_claims = jwt.get_unverified_claims(token)
@@ -73,47 +153,40 @@ def requires_auth(func):
     @wraps(func)
     def decorated(*args, **kwargs):
         token = get_token_auth_header()
-        jwks = get_jwks_from_cache()
-        try:
-            unverified_header = jwt.get_unverified_header(token)
-        except jwt.JWTError as jwt_error:
-            raise AuthError(
-                "Invalid header. Use an RS256 signed JWT Access Token"
-            ) from jwt_error
-        if unverified_header["alg"] == "HS256":
-            raise AuthError(
-                "HS256 is invalid header algorithm. Use an RS256 signed JWT Access Token"
-            )
-        rsa_key = {}
-        for key in jwks["keys"]:
-            if key["kid"] == unverified_header["kid"]:
-                rsa_key = {
-                    "kty": key["kty"],
-                    "kid": key["kid"],
-                    "use": key["use"],
-                    "n": key["n"],
-                    "e": key["e"],
-                }
-        if rsa_key:
-            try:
-                payload = jwt.decode(
-                    token,
-                    rsa_key,
-                    algorithms=ALGORITHMS,
-                    audience=AUTH0_API_IDENTIFIER,
-                    issuer="https://" + AUTH0_DOMAIN + "/",
-                )
-            except jwt.ExpiredSignatureError as expired_sign_error:
-                raise AuthError("Token is expired") from expired_sign_error
-            except jwt.JWTClaimsError as jwt_claims_error:
-                raise AuthError(
-                    "Incorrect claims, please check the audience and issuer"
-                ) from jwt_claims_error
-            except Exception as exc:
-                raise AuthError("Unable to parse authentication token.") from exc
-
-            request.current_user = payload
-            return func(*args, **kwargs)
-        raise AuthError("Unable to find appropriate key")
+        request.current_user = verify_cached_token(token)
+        return func(*args, **kwargs)
 
     return decorated
+
+
+def verify_token(token: str, key_store: JwksKeyStore) -> dict:
+    try:
+        unverified_header = jwt.get_unverified_header(token)
+    except jwt.JWTError as jwt_error:
+        raise AuthError(
+            "Invalid header. Use an RS256 signed JWT Access Token"
+        ) from jwt_error
+    if unverified_header["alg"] == "HS256":
+        raise AuthError(
+            "HS256 is invalid header algorithm. Use an RS256 signed JWT Access Token"
+        )
+    rsa_key = key_store.key(unverified_header.get("kid"))
+    if rsa_key is not None:
+        try:
+            return jwt.decode(
+                token,
+                rsa_key,
+                algorithms=ALGORITHMS,
+                audience=AUTH0_API_IDENTIFIER,
+                issuer="https://" + AUTH0_DOMAIN + "/",
+                options={"leeway": CLOCK_SKEW_SECONDS},
+            )
+        except jwt.ExpiredSignatureError as expired_sign_error:
+            raise AuthError("Token is expired") from expired_sign_error
+        except jwt.JWTClaimsError as jwt_claims_error:
+            raise AuthError(
+                "Incorrect claims, please check the audience and issuer"
+            ) from jwt_claims_error
+        except Exception as exc:
+            raise AuthError("Unable to parse authentication token.") from exc
+    raise AuthError("Unable to find appropriate key")
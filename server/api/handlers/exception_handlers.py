@@ -1,4 +1,5 @@
-﻿from flask import jsonify
+﻿from api.application.conflict_exception import ConflictException
+from api.application.service_busy_exception import ServiceBusyException
 from api.application.validation_exception import ValidationException
 from api.handlers.auth_zero_decorators import AuthError
 from http import HTTPStatus
@@ -6,9 +7,13 @@ from http import HTTPStatus
 
 def handle_exception(err):
     if type(err) is ValidationException:
-        return jsonify({"error": " ".join(err.args)}), HTTPStatus.UNPROCESSABLE_ENTITY
+        return {"error": " ".join(err.args)}, HTTPStatus.UNPROCESSABLE_ENTITY
+    if type(err) is ConflictException:
+        return {"error": " ".join(err.args)}, HTTPStatus.CONFLICT
+    if type(err) is ServiceBusyException:
+        return {"error": " ".join(err.args)}, HTTPStatus.SERVICE_UNAVAILABLE
     if type(err) is AuthError:
-        return jsonify({"error": " ".join(err.args)}), HTTPStatus.UNAUTHORIZED
+        return {"error": " ".join(err.args)}, HTTPStatus.UNAUTHORIZED
     else:
         response = {"error": "Internal server error"}
-    return jsonify(response), HTTPStatus.INTERNAL_SERVER_ERROR
+    return response, HTTPStatus.INTERNAL_SERVER_ERROR
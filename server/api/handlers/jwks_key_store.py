@@ -0,0 +1,131 @@
+import logging
+import threading
+import time
+from typing import Callable, Dict
+
+from jose import jwk
+from jose.backends.base import Key
+
+logger = logging.getLogger(__name__)
+
+JwksFetch = Callable[[], Dict]
+
+
+class JwksKeyStore:
+
+    def __init__(
+        self,
+        fetch: JwksFetch,
+        refetch: JwksFetch | None = None,
+        max_age_seconds: float = 300,
+        refresh_ahead_seconds: float = 60,
+        min_refetch_seconds: float = 30,
+        algorithm: str = "RS256",
+    ):
+        self.fetch = fetch
+        self.refetch = refetch or fetch
+        self.max_age_seconds = max_age_seconds
+        self.refresh_ahead_seconds = refresh_ahead_seconds
+        self.min_refetch_seconds = min_refetch_seconds
+        self.algorithm = algorithm
+        self.__lock = threading.Lock()
+        self.__fetching = threading.Lock()
+        self.__keys: dict[str, Key] | None = None
+        self.jwks: Dict | None = None
+        self.__fetched_at = 0.0
+        self.__attempted_at = float("-inf")
+        self.__refreshing = False
+        self.fetches = 0
+
+    def key(self, kid: str) -> Key | None:
+        keys = self.__keys
+        if keys is None:
+            self.__fetch_once(self.fetch, lambda: self.__keys is None)
+            keys = self.__keys
+        elif kid not in keys:
+            try:
+                self.__fetch_once(
+                    self.refetch,
+                    lambda: kid not in self.__keys and self.__may_refetch(),
+                )
+            except Exception:
+                logger.warning("Could not refetch JWKS for key %s", kid, exc_info=True)
+            keys = self.__keys
+        else:
+            self.__refresh_if_due()
+        return keys.get(kid)
+
+    def load(self) -> int:
+        if self.__keys is None:
+            self.__fetch_once(self.fetch, lambda: self.__keys is None)
+        else:
+            self.__refresh_if_due()
+        return len(self.__keys)
+
+    def update(self, jwks: Dict):
+        keys = {}
+        for key in jwks["keys"]:
+            if key.get("kty") != "RSA" or "kid" not in key:
+                continue
+            keys[key["kid"]] = jwk.construct(
+                {name: key[name] for name in ["kty", "kid", "use", "n", "e"]},
+                self.algorithm,
+            )
+        with self.__lock:
+            self.__keys = keys
+            self.jwks = jwks
+            self.__fetched_at = time.monotonic()
+
+    def refresh_in_background(self):
+        with self.__lock:
+            if self.__refreshing:
+                return
+            self.__refreshing = True
+        self.__start_refresh(self.refetch)
+
+    def clear(self):
+        with self.__lock:
+            self.__keys = None
+            self.jwks = None
+            self.__fetched_at = 0.0
+            self.__attempted_at = float("-inf")
+
+    # concurrent callers wait for the one fetch in flight rather than starting their own
+    def __fetch_once(self, fetch: JwksFetch, still_needed: Callable[[], bool]):
+        with self.__fetching:
+            if not still_needed():
+                return
+            with self.__lock:
+                self.__attempted_at = time.monotonic()
+            self.fetches += 1
+            self.update(fetch())
+
+    def __may_refetch(self) -> bool:
+        return time.monotonic() - self.__attempted_at >= self.min_refetch_seconds
+
+    def __refresh_if_due(self):
+        with self.__lock:
+            due = (
+                time.monotonic() - self.__fetched_at
+                >= self.max_age_seconds - self.refresh_ahead_seconds
+            )
+            if not due or self.__refreshing or not self.__may_refetch():
+                return
+            self.__refreshing = True
+        self.__start_refresh(self.fetch)
+
+    def __start_refresh(self, fetch: JwksFetch):
+        threading.Thread(
+            target=self.__refresh, args=(fetch,), name="jwks-refresh", daemon=True
+        ).start()
+
+    def __refresh(self, fetch: JwksFetch):
+        try:
+            self.__fetch_once(fetch, lambda: True)
+        except Exception:
+            logger.warning(
+                "Could not refresh JWKS, using the keys already held", exc_info=True
+            )
+        finally:
+            with self.__lock:
+                self.__refreshing = False
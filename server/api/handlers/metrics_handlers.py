@@ -0,0 +1,58 @@
+from flask.views import MethodView
+from .auth_zero_decorators import requires_auth
+from .responses import success_response
+from api.persistence.instrumented_container import CosmosMetrics
+from api.persistence.throttled_container import ThrottleMetrics
+from api._app import add_app_url
+
+
+class CosmosMetricsHandler(MethodView):
+    init_every_request = False
+    decorators = [requires_auth]
+
+    @staticmethod
+    def route():
+        return "/metrics/cosmos"
+
+    @staticmethod
+    def name():
+        return "cosmos_metrics_handler"
+
+    def __init__(self, metrics: CosmosMetrics):
+        self.metrics = metrics
+
+    def get(self):
+        return success_response({"operations": self.metrics.to_dict()})
+
+
+class ThrottleMetricsHandler(MethodView):
+    init_every_request = False
+    decorators = [requires_auth]
+
+    @staticmethod
+    def route():
+        return "/metrics/throttling"
+
+    @staticmethod
+    def name():
+        return "throttle_metrics_handler"
+
+    def __init__(self, metrics: ThrottleMetrics):
+        self.metrics = metrics
+
+    def get(self):
+        return success_response(self.metrics.to_dict())
+
+
+def register_metrics_handlers(app, metrics: CosmosMetrics):
+    cosmos_metrics_handler = CosmosMetricsHandler.as_view(
+        CosmosMetricsHandler.name(), metrics
+    )
+    add_app_url(app, CosmosMetricsHandler.route(), cosmos_metrics_handler)
+
+
+def register_throttle_metrics_handlers(app, metrics: ThrottleMetrics):
+    throttle_metrics_handler = ThrottleMetricsHandler.as_view(
+        ThrottleMetricsHandler.name(), metrics
+    )
+    add_app_url(app, ThrottleMetricsHandler.route(), throttle_metrics_handler)
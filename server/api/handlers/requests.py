@@ -2,8 +2,18 @@
     return request.get_json(silent=True)[name]
 
 
+async def get_async_request_body_property(request, name):
+    return (await request.get_json(silent=True))[name]
+
+
+def get_query_parameter(request, name):
+    return request.args.get(name)
+
+
 def get_user_email(request):
     return request.current_user["email"]
 
 
 AUTHORIZATION_HEADER_KEY = "Authorization"
+CONTINUATION_HEADER_KEY = "X-Continuation-Token"
+SUMMARY_VIEW = "summary"
@@ -1,23 +1,40 @@
 ﻿from flask import Response
 from http import HTTPStatus
 import json
+from collections.abc import Iterable, Iterator
+from api.handlers.requests import CONTINUATION_HEADER_KEY
+
+
+# Serialises one item at a time so a large listing is never held as a single string
+def json_array(items: Iterable) -> Iterator[bytes]:
+    yield b"["
+    for index, item in enumerate(items):
+        if index > 0:
+            yield b","
+        yield json.dumps(item.to_dict()).encode()
+    yield b"]"
 
 
 def success_response(item) -> Response:
-    if isinstance(item, list):
-        return Response(
-            response=json.dumps([i.to_dict() for i in item]), status=HTTPStatus.OK
-        )
+    if isinstance(item, (list, Iterator)):
+        return Response(response=json_array(item), status=HTTPStatus.OK)
     if item is None:
         return Response(status=HTTPStatus.OK)
+    if type(item) is dict:
+        return Response(response=json.dumps(item), status=HTTPStatus.OK)
     return Response(response=json.dumps(item.to_dict()), status=HTTPStatus.OK)
 
 
+def paged_response(items: Iterable, continuation: str | None) -> Response:
+    response = success_response(items)
+    if continuation is not None:
+        response.headers[CONTINUATION_HEADER_KEY] = continuation
+    return response
+
+
 def created_response(item) -> Response:
-    if isinstance(item, list):
-        return Response(
-            response=json.dumps([i.to_dict() for i in item]), status=HTTPStatus.CREATED
-        )
+    if isinstance(item, (list, Iterator)):
+        return Response(response=json_array(item), status=HTTPStatus.CREATED)
     if item is None:
         return Response(status=HTTPStatus.CREATED)
     if type(item) is dict:
@@ -25,6 +42,10 @@ def created_response(item) -> Response:
     return Response(response=json.dumps(item.to_dict()), status=HTTPStatus.CREATED)
 
 
+def unavailable_response(item: dict) -> Response:
+    return Response(response=json.dumps(item), status=HTTPStatus.SERVICE_UNAVAILABLE)
+
+
 def not_found_response(error: str) -> Response:
     return Response(
         response=json.dumps({"error": error}),
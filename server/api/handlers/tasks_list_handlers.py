@@ -1,10 +1,16 @@
 ﻿from flask.views import MethodView
 from flask import request
-from .auth_zero_decorators import requires_auth
-from .requests import get_request_body_property, get_user_email
+from .auth_zero_decorators import jwks_key_store, requires_auth
+from .requests import (
+    SUMMARY_VIEW,
+    get_query_parameter,
+    get_request_body_property,
+    get_user_email,
+)
 from .responses import *
 from api.application.tasks_list_service import TasksListService
 from api._app import add_app_url
+from api.warmup import Warmup
 
 
 class TasksListHandlerForGroups(MethodView):
@@ -23,6 +29,18 @@ class TasksListHandlerForGroups(MethodView):
         self.tasks_list_service = tasks_list_service
 
     def get(self):
+        summary = get_query_parameter(request, "view") == SUMMARY_VIEW
+        limit = get_query_parameter(request, "limit")
+        continuation = get_query_parameter(request, "continuation")
+        if limit is not None or continuation is not None:
+            tasks_lists, next_continuation = self.tasks_list_service.get_page(
+                get_user_email(request), limit, continuation, summary
+            )
+            return paged_response(tasks_lists, next_continuation)
+        if summary:
+            return success_response(
+                self.tasks_list_service.get_all_summaries(get_user_email(request))
+            )
         return success_response(
             self.tasks_list_service.get_all(get_user_email(request))
         )
@@ -246,6 +264,51 @@ class CarryTaskHandler(MethodView):
         return no_content_response()
 
 
+class TaskOperationsHandler(MethodView):
+    init_every_request = False
+    decorators = [requires_auth]
+
+    @staticmethod
+    def route():
+        return "/tasks-lists/<tasks_list_id>/operations"
+
+    @staticmethod
+    def name():
+        return "task_operations_handler"
+
+    def __init__(self, tasks_list_service: TasksListService):
+        self.tasks_list_service = tasks_list_service
+
+    def post(self, tasks_list_id):
+        results = self.tasks_list_service.apply_task_operations(
+            tasks_list_id,
+            get_user_email(request),
+            get_request_body_property(request, "operations"),
+        )
+        return success_response({"results": results})
+
+
+class KeepAliveHandler(MethodView):
+    init_every_request = False
+
+    @staticmethod
+    def route():
+        return "/keep-alive"
+
+    @staticmethod
+    def name():
+        return "keep_alive_handler"
+
+    def __init__(self, warmup: Warmup):
+        self.warmup = warmup
+
+    def get(self):
+        report = self.warmup.run()
+        if report["ok"]:
+            return success_response(report)
+        return unavailable_response(report)
+
+
 def register_task_handlers(app, tasks_list_service):
     tasks_list_handler_for_groups = TasksListHandlerForGroups.as_view(
         TasksListHandlerForGroups.name(), tasks_list_service
@@ -277,6 +340,13 @@ def register_task_handlers(app, tasks_list_service):
     carry_task_handler = CarryTaskHandler.as_view(
         CarryTaskHandler.name(), tasks_list_service
     )
+    task_operations_handler = TaskOperationsHandler.as_view(
+        TaskOperationsHandler.name(), tasks_list_service
+    )
+    keep_alive_handler = KeepAliveHandler.as_view(
+        KeepAliveHandler.name(),
+        Warmup(tasks_list_service, jwks_key_store),
+    )
 
     add_app_url(app, TasksListHandlerForGroups.route(), tasks_list_handler_for_groups)
     add_app_url(app, TasksListHandlerForItems.route(), tasks_list_handler_for_items)
@@ -292,4 +362,6 @@ def register_task_handlers(app, tasks_list_service):
     add_app_url(app, TickTaskHandler.route(), tick_task_handler)
     add_app_url(app, RemoveTaskHandler.route(), remove_task_handler)
     add_app_url(app, CarryTaskHandler.route(), carry_task_handler)
+    add_app_url(app, TaskOperationsHandler.route(), task_operations_handler)
+    add_app_url(app, KeepAliveHandler.route(), keep_alive_handler)
     return app
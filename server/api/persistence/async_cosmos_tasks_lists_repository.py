@@ -0,0 +1,301 @@
+﻿import asyncio
+import datetime
+import logging
+
+from azure.core import MatchConditions
+from azure.cosmos.aio import ContainerProxy
+from azure.cosmos.exceptions import (
+    CosmosAccessConditionFailedError,
+    CosmosHttpResponseError,
+    CosmosResourceExistsError,
+    CosmosResourceNotFoundError,
+)
+
+from api.domain.tasks_list import TasksList
+from api.domain.tasks_list_summary import TasksListSummary
+from api.domain.user_directory import UserDirectory
+from api.persistence.converters import convert_to_domain_async
+from api.persistence.cosmos_tasks_lists_repository import (
+    MAX_DIRECTORY_WRITE_ATTEMPTS,
+    SUMMARY_QUERY,
+    decoded_tasks_list,
+    encoded_document,
+    has_unique_names,
+    ids_by_owner,
+    is_invalid_continuation,
+    page_query,
+    to_page_item,
+    visible_summaries,
+)
+from api.persistence.patch_operations import to_patch_operations
+from api.persistence.tasks_lists_repository import (
+    DuplicateTasksListNameError,
+    InvalidContinuationError,
+    StaleTasksListError,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncCosmosTasksListsRepository:
+
+    def __init__(self, db: ContainerProxy, directories_db: ContainerProxy):
+        self.db = db
+        self.directories_db = directories_db
+        self.unique_names: bool | None = None
+
+    async def load(self, id: str, email: str) -> TasksList | None:
+        tasks_list = await self.__read_item(id, email)
+        if tasks_list is not None:
+            return tasks_list
+        items = self.db.query_items(
+            query="SELECT * FROM c WHERE c.id = @id and ARRAY_CONTAINS(c.shared_with, @email)",
+            parameters=[
+                dict(name="@id", value=id),
+                dict(name="@email", value=email),
+            ],
+            max_item_count=1,
+        )
+        return decoded_tasks_list(await convert_to_domain_async(TasksList, items))
+
+    async def load_for_owner(self, id: str, owner_email: str) -> TasksList | None:
+        return await self.__read_item(id, owner_email)
+
+    async def load_by_name(self, name: str, owner_email: str) -> TasksList | None:
+        items = self.db.query_items(
+            query="SELECT * FROM c WHERE c.name = @name",
+            parameters=[dict(name="@name", value=name)],
+            partition_key=owner_email,
+            max_item_count=1,
+        )
+        return decoded_tasks_list(await convert_to_domain_async(TasksList, items))
+
+    async def list_for_user(self, email: str) -> list[TasksList]:
+        directory = await self.__get_directory(email)
+        read_tasks_lists = await asyncio.gather(
+            *[
+                self.__read_item(entry.id, entry.owner_email)
+                for entry in directory.tasks_lists
+            ]
+        )
+        tasks_lists = [
+            tasks_list
+            for tasks_list in read_tasks_lists
+            if tasks_list is not None
+            and (tasks_list.owner_email == email or email in tasks_list.shared_with)
+        ]
+        if directory.etag is None or len(tasks_lists) != len(directory.tasks_lists):
+            directory.retain([tasks_list.id for tasks_list in tasks_lists])
+            try:
+                await self.__save_directory(directory)
+            except (CosmosAccessConditionFailedError, CosmosResourceExistsError):
+                pass
+        return tasks_lists
+
+    async def list_summaries_for_user(self, email: str) -> list[TasksListSummary]:
+        directory = await self.__get_directory(email)
+        pages = await asyncio.gather(
+            *[
+                self.__query_summaries(owner_email, ids)
+                for owner_email, ids in ids_by_owner(directory).items()
+            ]
+        )
+        if directory.etag is None:
+            try:
+                await self.__save_directory(directory)
+            except (CosmosAccessConditionFailedError, CosmosResourceExistsError):
+                pass
+        return visible_summaries(directory, (item for page in pages for item in page))
+
+    async def list_page_for_user(
+        self, email: str, limit: int, continuation: str | None, summary: bool
+    ) -> tuple[list[TasksList | TasksListSummary], str | None]:
+        pages = self.db.query_items(
+            query=page_query(summary),
+            parameters=[dict(name="@email", value=email)],
+            max_item_count=limit,
+        ).by_page(continuation)
+        items = []
+        try:
+            async for page in pages:
+                items = [to_page_item(item, summary) async for item in page]
+                break
+        except (CosmosHttpResponseError, ValueError) as error:
+            if is_invalid_continuation(error, continuation):
+                raise InvalidContinuationError(
+                    "Continuation token is not valid"
+                ) from error
+            raise
+        return items, pages.continuation_token
+
+    async def __query_summaries(self, owner_email: str, ids: list[str]) -> list[dict]:
+        items = self.db.query_items(
+            query=SUMMARY_QUERY,
+            parameters=[dict(name="@ids", value=ids)],
+            partition_key=owner_email,
+        )
+        return [item async for item in items]
+
+    async def add(self, tasks_list: TasksList):
+        await self.__check_name_is_free(tasks_list)
+        try:
+            created = await self.db.create_item(encoded_document(tasks_list.to_dict()))
+        except CosmosResourceExistsError as error:
+            raise DuplicateTasksListNameError(
+                "Tasks list with name already exists"
+            ) from error
+        tasks_list.etag = created["_etag"]
+        await self.__add_to_directory(tasks_list.owner_email, tasks_list)
+
+    async def save(self, tasks_list: TasksList, original: dict):
+        before = encoded_document(original)
+        after = encoded_document(tasks_list.to_dict())
+        patch_operations = to_patch_operations(before, after)
+        if tasks_list.name != original["name"]:
+            await self.__check_name_is_free(tasks_list)
+        try:
+            if patch_operations is None:
+                saved = await self.db.replace_item(
+                    tasks_list.id,
+                    after,
+                    etag=tasks_list.etag,
+                    match_condition=MatchConditions.IfNotModified,
+                )
+                tasks_list.etag = saved["_etag"]
+            elif len(patch_operations) > 0:
+                saved = await self.db.patch_item(
+                    tasks_list.id,
+                    tasks_list.owner_email,
+                    patch_operations,
+                    etag=tasks_list.etag,
+                    match_condition=MatchConditions.IfNotModified,
+                )
+                tasks_list.etag = saved["_etag"]
+        except CosmosAccessConditionFailedError as error:
+            raise StaleTasksListError("Tasks list has changed since loaded") from error
+        except CosmosResourceExistsError as error:
+            raise DuplicateTasksListNameError(
+                "Tasks list with name already exists"
+            ) from error
+        await self.__update_directories(tasks_list, original)
+
+    async def __check_name_is_free(self, tasks_list: TasksList):
+        if self.unique_names is None:
+            try:
+                self.unique_names = has_unique_names(await self.db.read())
+            except CosmosHttpResponseError:
+                logger.warning("Could not read tasks_lists properties", exc_info=True)
+                return await self.__check_name_by_query(tasks_list)
+            if not self.unique_names:
+                logger.warning("tasks_lists has no unique key on /name")
+        if not self.unique_names:
+            await self.__check_name_by_query(tasks_list)
+
+    async def __check_name_by_query(self, tasks_list: TasksList):
+        existing = await self.load_by_name(tasks_list.name, tasks_list.owner_email)
+        if existing is not None and existing.id != tasks_list.id:
+            raise DuplicateTasksListNameError("Tasks list with name already exists")
+
+    async def save_last_selected_time(
+        self, id: str, owner_email: str, last_selected_time: datetime.datetime
+    ):
+        try:
+            await self.db.patch_item(
+                id,
+                owner_email,
+                [
+                    dict(
+                        op="set",
+                        path="/last_selected_time",
+                        value=last_selected_time.isoformat(),
+                    )
+                ],
+            )
+        except CosmosResourceNotFoundError:
+            pass
+
+    async def delete(self, tasks_list: TasksList):
+        try:
+            await self.db.delete_item(
+                tasks_list.id,
+                tasks_list.owner_email,
+                etag=tasks_list.etag,
+                match_condition=MatchConditions.IfNotModified,
+            )
+        except CosmosAccessConditionFailedError as error:
+            raise StaleTasksListError("Tasks list has changed since loaded") from error
+        for email in [tasks_list.owner_email, *tasks_list.shared_with]:
+            await self.__update_directory(
+                email, lambda directory: directory.remove(tasks_list.id)
+            )
+
+    async def __update_directories(self, tasks_list: TasksList, original: dict):
+        if tasks_list.name != original["name"]:
+            for email in [tasks_list.owner_email, *tasks_list.shared_with]:
+                await self.__add_to_directory(email, tasks_list)
+        for email in tasks_list.shared_with:
+            if email not in original["shared_with"]:
+                await self.__add_to_directory(email, tasks_list)
+        for email in original["shared_with"]:
+            if email not in tasks_list.shared_with:
+                await self.__update_directory(
+                    email, lambda directory: directory.remove(tasks_list.id)
+                )
+
+    async def __get_directory(self, email: str) -> UserDirectory:
+        try:
+            item = await self.directories_db.read_item(email, partition_key=email)
+        except CosmosResourceNotFoundError:
+            return await self.__build_directory(email)
+        return UserDirectory.from_dict(item)
+
+    async def __build_directory(self, email: str) -> UserDirectory:
+        items = self.db.query_items(
+            query="SELECT c.id, c.name, c.owner_email FROM c WHERE c.owner_email = @email or ARRAY_CONTAINS(c.shared_with, @email)",
+            parameters=[dict(name="@email", value=email)],
+        )
+        directory = UserDirectory(email)
+        async for item in items:
+            directory.add(item["id"], item["name"], item["owner_email"])
+        return directory
+
+    async def __save_directory(self, directory: UserDirectory):
+        if directory.etag is None:
+            await self.directories_db.create_item(directory.to_dict())
+        else:
+            await self.directories_db.replace_item(
+                directory.email,
+                directory.to_dict(),
+                etag=directory.etag,
+                match_condition=MatchConditions.IfNotModified,
+            )
+
+    async def __update_directory(self, email: str, change):
+        for _ in range(MAX_DIRECTORY_WRITE_ATTEMPTS):
+            directory = await self.__get_directory(email)
+            change(directory)
+            try:
+                await self.__save_directory(directory)
+                return
+            except (CosmosAccessConditionFailedError, CosmosResourceExistsError):
+                continue
+        logger.warning("Dropping directory for %s so it is rebuilt on next read", email)
+        try:
+            await self.directories_db.delete_item(email, email)
+        except CosmosResourceNotFoundError:
+            pass
+
+    async def __add_to_directory(self, email: str, tasks_list: TasksList):
+        await self.__update_directory(
+            email,
+            lambda directory: directory.add(
+                tasks_list.id, tasks_list.name, tasks_list.owner_email
+            ),
+        )
+
+    async def __read_item(self, id: str, owner_email: str) -> TasksList | None:
+        try:
+            item = await self.db.read_item(id, partition_key=owner_email)
+        except CosmosResourceNotFoundError:
+            return None
+        return decoded_tasks_list(TasksList.from_dict(item))
@@ -0,0 +1,162 @@
+import json
+import logging
+import os
+import threading
+from typing import Callable
+
+from azure.cosmos import ContainerProxy
+
+logger = logging.getLogger(__name__)
+
+ChangeHandler = Callable[[dict], None]
+
+
+class ResponseEtag:
+
+    def __init__(self):
+        self.etag: str | None = None
+
+    # Called with each page's own headers; client_connection's are shared across threads
+    def __call__(self, headers, result):
+        self.etag = (headers or {}).get("etag", self.etag)
+
+
+class ChangeFeedCheckpoint:
+
+    def __init__(self, path: str | None = None):
+        self.path = path
+        self.continuation = None
+        if path is not None and os.path.exists(path):
+            with open(path) as file:
+                self.continuation = json.load(file)["continuation"]
+
+    def save(self, continuation: str | None):
+        self.continuation = continuation
+        if self.path is None:
+            return
+        temporary_path = self.path + ".tmp"
+        with open(temporary_path, "w") as file:
+            json.dump({"continuation": continuation}, file)
+        os.replace(temporary_path, self.path)
+
+
+class ChangeFeedProcessor:
+
+    def __init__(
+        self,
+        container: ContainerProxy,
+        checkpoint: ChangeFeedCheckpoint,
+        poll_seconds: float = 5,
+        max_item_count: int = 100,
+        start_from_beginning: bool = True,
+        max_attempts: int = 3,
+    ):
+        self.container = container
+        self.checkpoint = checkpoint
+        self.poll_seconds = poll_seconds
+        self.max_item_count = max_item_count
+        self.start_from_beginning = start_from_beginning
+        self.max_attempts = max_attempts
+        self.handlers: list[ChangeHandler] = []
+        self.failed_attempts: dict[tuple, int] = {}
+        self.skipped = 0
+        self.stopping = threading.Event()
+        self.thread: threading.Thread | None = None
+
+    def register(self, handler: ChangeHandler):
+        self.handlers.append(handler)
+
+    # Documents are handed to every handler at least once, so handlers must be idempotent
+    def process_changes(self) -> int:
+        response_etag = ResponseEtag()
+        changes_feed = self.container.query_items_change_feed(
+            is_start_from_beginning=self.start_from_beginning
+            and self.checkpoint.continuation is None,
+            continuation=self.checkpoint.continuation,
+            max_item_count=self.max_item_count,
+            response_hook=response_etag,
+        )
+        # The SDK also calls the hook before fetching, with the shared headers
+        response_etag.etag = None
+        processed = 0
+        for page in changes_feed.by_page():
+            changes = list(page)
+            etag = response_etag.etag
+            for document in changes:
+                self.__handle(document)
+            self.checkpoint.save(etag or self.checkpoint.continuation)
+            processed += len(changes)
+            if self.stopping.is_set():
+                return processed
+        # An empty feed yields no page but still moves the etag on from "now"
+        if response_etag.etag is not None:
+            self.checkpoint.save(response_etag.etag)
+        return processed
+
+    # a change that keeps failing is logged and skipped so it cannot hold up the feed
+    def __handle(self, document: dict):
+        key = (document.get("id"), document.get("_etag"))
+        try:
+            for handler in self.handlers:
+                handler(document)
+        except Exception:
+            attempts = self.failed_attempts.get(key, 0) + 1
+            if attempts < self.max_attempts:
+                self.failed_attempts[key] = attempts
+                raise
+            self.failed_attempts.pop(key, None)
+            self.skipped += 1
+            logger.exception(
+                "Skipping change to %s after %d failed attempts", key[0], attempts
+            )
+            return
+        self.failed_attempts.pop(key, None)
+
+    def run(self):
+        while not self.stopping.is_set():
+            try:
+                self.process_changes()
+            except Exception:
+                logger.exception("Could not process tasks lists change feed")
+            self.stopping.wait(self.poll_seconds)
+
+    def start(self):
+        self.stopping.clear()
+        self.thread = threading.Thread(
+            target=self.run, name="tasks-lists-change-feed", daemon=True
+        )
+        self.thread.start()
+
+    def stop(self):
+        self.stopping.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+
+def create_change_feed_processor(config: dict) -> ChangeFeedProcessor:
+    from api.persistence.cosmos_tasks_lists_repository import (
+        CosmosTasksListsRepository,
+    )
+    from api.persistence.initialise_cosmos import (
+        tasks_lists_container,
+        user_directories_container,
+    )
+
+    processor = ChangeFeedProcessor(
+        tasks_lists_container,
+        ChangeFeedCheckpoint(config.get("change_feed_checkpoint_path")),
+        config.get("change_feed_poll_seconds", 5),
+    )
+    repository = CosmosTasksListsRepository(
+        tasks_lists_container, user_directories_container
+    )
+    processor.register(repository.project_to_directories)
+    return processor
+
+
+if __name__ == "__main__":
+    from api.persistence.initialise_cosmos import config
+
+    logging.basicConfig(level=logging.INFO)
+    create_change_feed_processor(config).run()
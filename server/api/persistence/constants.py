@@ -1,2 +1,5 @@
 ﻿TASKS_LISTS_CONTAINER_ID = "tasks_lists"
 TASKS_LISTS_PARTITION_KEY_PATH = "/owner_email"
+TASKS_LISTS_UNIQUE_KEY_POLICY = {"uniqueKeys": [{"paths": ["/name"]}]}
+USER_DIRECTORIES_CONTAINER_ID = "user_directories"
+USER_DIRECTORIES_PARTITION_KEY_PATH = "/id"
@@ -1,18 +1,24 @@
-﻿from typing import TypeVar
+﻿from typing import Iterator, TypeVar
+from azure.core.async_paging import AsyncItemPaged
 from azure.core.paging import ItemPaged
 
 T = TypeVar("T")
 
 
+# Query with max_item_count=1 so only the first page is fetched before returning
 def convert_to_domain(_type: T, paged_items: ItemPaged) -> T | None:
-    list_items = list(iter(paged_items))
-    if len(list_items) > 0:
-        return _type.from_dict(list_items[0])
+    item = next(iter(paged_items), None)
+    if item is not None:
+        return _type.from_dict(item)
     return None
 
 
-def convert_to_domain_list(_type: T, items: ItemPaged):
-    list_items = list(iter(items))
-    if len(list_items) > 0:
-        return [_type.from_dict(item) for item in list_items]
-    return []
+def convert_to_domain_list(_type: T, items: ItemPaged) -> Iterator[T]:
+    for item in items:
+        yield _type.from_dict(item)
+
+
+async def convert_to_domain_async(_type: T, paged_items: AsyncItemPaged) -> T | None:
+    async for item in paged_items:
+        return _type.from_dict(item)
+    return None
@@ -0,0 +1,388 @@
+﻿import contextvars
+import datetime
+import logging
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+
+from azure.core import MatchConditions
+from azure.cosmos import ContainerProxy
+from azure.cosmos.exceptions import (
+    CosmosAccessConditionFailedError,
+    CosmosHttpResponseError,
+    CosmosResourceExistsError,
+    CosmosResourceNotFoundError,
+)
+
+from api.application.string_encoding import decode_string, encode_string
+from api.domain.tasks_list import TasksList
+from api.domain.tasks_list_summary import TasksListSummary
+from api.domain.user_directory import UserDirectory, UserDirectoryEntry
+from api.persistence.constants import TASKS_LISTS_UNIQUE_KEY_POLICY
+from api.persistence.converters import convert_to_domain, convert_to_domain_list
+from api.persistence.patch_operations import to_patch_operations
+from api.persistence.tasks_lists_repository import (
+    DuplicateTasksListNameError,
+    InvalidContinuationError,
+    StaleTasksListError,
+)
+
+MAX_DIRECTORY_WRITE_ATTEMPTS = 5
+BAD_REQUEST = 400
+SUMMARY_PROJECTION = "c.id, c.name, c.owner_email, c.last_selected_time, c.shared_with"
+SUMMARY_QUERY = f"SELECT {SUMMARY_PROJECTION} FROM c WHERE ARRAY_CONTAINS(@ids, c.id)"
+
+logger = logging.getLogger(__name__)
+
+
+def decoded_tasks_list(tasks_list: TasksList | None) -> TasksList | None:
+    if tasks_list is not None:
+        tasks_list.__setattr__(
+            "tasks",
+            [
+                task.set_content(decode_string(task.content))
+                for task in tasks_list.tasks
+            ],
+        )
+    return tasks_list
+
+
+def ids_by_owner(directory: UserDirectory) -> dict[str, list[str]]:
+    owners = {}
+    for entry in directory.tasks_lists:
+        owners.setdefault(entry.owner_email, []).append(entry.id)
+    return owners
+
+
+def visible_summaries(
+    directory: UserDirectory, items: Iterable[dict]
+) -> list[TasksListSummary]:
+    summaries = {
+        summary.id: summary
+        for summary in convert_to_domain_list(TasksListSummary, items)
+    }
+    return [
+        summaries[entry.id]
+        for entry in directory.tasks_lists
+        if entry.id in summaries
+        and (
+            summaries[entry.id].owner_email == directory.email
+            or directory.email in summaries[entry.id].shared_with
+        )
+    ]
+
+
+def page_query(summary: bool) -> str:
+    projection = SUMMARY_PROJECTION if summary else "*"
+    return f"SELECT {projection} FROM c WHERE c.owner_email = @email or ARRAY_CONTAINS(c.shared_with, @email) ORDER BY c.last_selected_time DESC"
+
+
+# Unique keys can only be set when a container is created, so older containers lack one
+def has_unique_names(properties: dict) -> bool:
+    unique_keys = properties.get("uniqueKeyPolicy", {}).get("uniqueKeys", [])
+    return all(
+        unique_key in unique_keys
+        for unique_key in TASKS_LISTS_UNIQUE_KEY_POLICY["uniqueKeys"]
+    )
+
+
+def is_invalid_continuation(error: Exception, continuation: str | None) -> bool:
+    if continuation is None:
+        return False
+    if isinstance(error, CosmosHttpResponseError):
+        return error.status_code == BAD_REQUEST
+    return isinstance(error, ValueError)
+
+
+def to_page_item(item: dict, summary: bool) -> TasksList | TasksListSummary:
+    if summary:
+        return TasksListSummary.from_dict(item)
+    return decoded_tasks_list(TasksList.from_dict(item))
+
+
+def encoded_document(document: dict) -> dict:
+    return {
+        **document,
+        "tasks": [
+            {**task, "content": encode_string(task["content"])}
+            for task in document["tasks"]
+        ],
+    }
+
+
+class CosmosTasksListsRepository:
+
+    def __init__(self, db: ContainerProxy, directories_db: ContainerProxy):
+        self.db = db
+        self.directories_db = directories_db
+        self.executor = ThreadPoolExecutor(max_workers=8)
+        self.unique_names: bool | None = None
+
+    def load(self, id: str, email: str) -> TasksList | None:
+        tasks_list = self.__read_item(id, email)
+        if tasks_list is not None:
+            return tasks_list
+        item = self.db.query_items(
+            query="SELECT * FROM c WHERE c.id = @id and ARRAY_CONTAINS(c.shared_with, @email)",
+            parameters=[
+                dict(name="@id", value=id),
+                dict(name="@email", value=email),
+            ],
+            enable_cross_partition_query=True,
+            max_item_count=1,
+        )
+        return decoded_tasks_list(convert_to_domain(TasksList, item))
+
+    def load_for_owner(self, id: str, owner_email: str) -> TasksList | None:
+        return self.__read_item(id, owner_email)
+
+    def load_by_name(self, name: str, owner_email: str) -> TasksList | None:
+        item = self.db.query_items(
+            query="SELECT * FROM c WHERE c.name = @name",
+            parameters=[dict(name="@name", value=name)],
+            partition_key=owner_email,
+            max_item_count=1,
+        )
+        return decoded_tasks_list(convert_to_domain(TasksList, item))
+
+    def list_for_user(self, email: str) -> list[TasksList]:
+        directory = self.__get_directory(email)
+        tasks_lists = [
+            tasks_list
+            for tasks_list in self.__map(
+                lambda entry: self.__read_item(entry.id, entry.owner_email),
+                directory.tasks_lists,
+            )
+            if tasks_list is not None
+            and (tasks_list.owner_email == email or email in tasks_list.shared_with)
+        ]
+        if directory.etag is None or len(tasks_lists) != len(directory.tasks_lists):
+            directory.retain([tasks_list.id for tasks_list in tasks_lists])
+            try:
+                self.__save_directory(directory)
+            except (CosmosAccessConditionFailedError, CosmosResourceExistsError):
+                pass
+        return tasks_lists
+
+    def list_summaries_for_user(self, email: str) -> list[TasksListSummary]:
+        directory = self.__get_directory(email)
+        pages = self.__map(
+            lambda owner: list(
+                self.db.query_items(
+                    query=SUMMARY_QUERY,
+                    parameters=[dict(name="@ids", value=owner[1])],
+                    partition_key=owner[0],
+                )
+            ),
+            ids_by_owner(directory).items(),
+        )
+        if directory.etag is None:
+            try:
+                self.__save_directory(directory)
+            except (CosmosAccessConditionFailedError, CosmosResourceExistsError):
+                pass
+        return visible_summaries(directory, (item for page in pages for item in page))
+
+    def list_page_for_user(
+        self, email: str, limit: int, continuation: str | None, summary: bool
+    ) -> tuple[list[TasksList | TasksListSummary], str | None]:
+        pages = self.db.query_items(
+            query=page_query(summary),
+            parameters=[dict(name="@email", value=email)],
+            enable_cross_partition_query=True,
+            max_item_count=limit,
+        ).by_page(continuation)
+        try:
+            items = [to_page_item(item, summary) for item in next(pages, [])]
+        except (CosmosHttpResponseError, ValueError) as error:
+            if is_invalid_continuation(error, continuation):
+                raise InvalidContinuationError(
+                    "Continuation token is not valid"
+                ) from error
+            raise
+        return items, pages.continuation_token
+
+    def add(self, tasks_list: TasksList):
+        self.__check_name_is_free(tasks_list)
+        try:
+            created = self.db.create_item(encoded_document(tasks_list.to_dict()))
+        except CosmosResourceExistsError as error:
+            raise DuplicateTasksListNameError(
+                "Tasks list with name already exists"
+            ) from error
+        tasks_list.etag = created["_etag"]
+        self.__add_to_directory(tasks_list.owner_email, tasks_list)
+
+    def save(self, tasks_list: TasksList, original: dict):
+        before = encoded_document(original)
+        after = encoded_document(tasks_list.to_dict())
+        patch_operations = to_patch_operations(before, after)
+        if tasks_list.name != original["name"]:
+            self.__check_name_is_free(tasks_list)
+        try:
+            if patch_operations is None:
+                saved = self.db.replace_item(
+                    tasks_list.id,
+                    after,
+                    etag=tasks_list.etag,
+                    match_condition=MatchConditions.IfNotModified,
+                )
+                tasks_list.etag = saved["_etag"]
+            elif len(patch_operations) > 0:
+                saved = self.db.patch_item(
+                    tasks_list.id,
+                    tasks_list.owner_email,
+                    patch_operations,
+                    etag=tasks_list.etag,
+                    match_condition=MatchConditions.IfNotModified,
+                )
+                tasks_list.etag = saved["_etag"]
+        except CosmosAccessConditionFailedError as error:
+            raise StaleTasksListError("Tasks list has changed since loaded") from error
+        except CosmosResourceExistsError as error:
+            raise DuplicateTasksListNameError(
+                "Tasks list with name already exists"
+            ) from error
+        self.__update_directories(tasks_list, original)
+
+    def __check_name_is_free(self, tasks_list: TasksList):
+        if self.unique_names is None:
+            try:
+                self.unique_names = has_unique_names(self.db.read())
+            except CosmosHttpResponseError:
+                logger.warning("Could not read tasks_lists properties", exc_info=True)
+                return self.__check_name_by_query(tasks_list)
+            if not self.unique_names:
+                logger.warning("tasks_lists has no unique key on /name")
+        if not self.unique_names:
+            self.__check_name_by_query(tasks_list)
+
+    def __check_name_by_query(self, tasks_list: TasksList):
+        existing = self.load_by_name(tasks_list.name, tasks_list.owner_email)
+        if existing is not None and existing.id != tasks_list.id:
+            raise DuplicateTasksListNameError("Tasks list with name already exists")
+
+    def save_last_selected_time(
+        self, id: str, owner_email: str, last_selected_time: datetime.datetime
+    ):
+        try:
+            self.db.patch_item(
+                id,
+                owner_email,
+                [
+                    dict(
+                        op="set",
+                        path="/last_selected_time",
+                        value=last_selected_time.isoformat(),
+                    )
+                ],
+            )
+        except CosmosResourceNotFoundError:
+            pass
+
+    def delete(self, tasks_list: TasksList):
+        try:
+            self.db.delete_item(
+                tasks_list.id,
+                tasks_list.owner_email,
+                etag=tasks_list.etag,
+                match_condition=MatchConditions.IfNotModified,
+            )
+        except CosmosAccessConditionFailedError as error:
+            raise StaleTasksListError("Tasks list has changed since loaded") from error
+        for email in [tasks_list.owner_email, *tasks_list.shared_with]:
+            self.__update_directory(
+                email, lambda directory: directory.remove(tasks_list.id)
+            )
+
+    def project_to_directories(self, document: dict):
+        summary = TasksListSummary.from_dict(document)
+        for email in [summary.owner_email, *summary.shared_with]:
+            directory = self.__get_directory(email)
+            entry = UserDirectoryEntry(summary.id, summary.name, summary.owner_email)
+            if directory.etag is None or entry not in directory.tasks_lists:
+                self.__update_directory(
+                    email,
+                    lambda directory: directory.add(
+                        summary.id, summary.name, summary.owner_email
+                    ),
+                )
+
+    def __update_directories(self, tasks_list: TasksList, original: dict):
+        if tasks_list.name != original["name"]:
+            for email in [tasks_list.owner_email, *tasks_list.shared_with]:
+                self.__add_to_directory(email, tasks_list)
+        for email in tasks_list.shared_with:
+            if email not in original["shared_with"]:
+                self.__add_to_directory(email, tasks_list)
+        for email in original["shared_with"]:
+            if email not in tasks_list.shared_with:
+                self.__update_directory(
+                    email, lambda directory: directory.remove(tasks_list.id)
+                )
+
+    # workers run in a copy of the caller's context so reads keep its operation
+    def __map(self, action: Callable, items: Iterable) -> Iterable:
+        futures = [
+            self.executor.submit(contextvars.copy_context().run, action, item)
+            for item in items
+        ]
+        return (future.result() for future in futures)
+
+    def __get_directory(self, email: str) -> UserDirectory:
+        try:
+            item = self.directories_db.read_item(email, partition_key=email)
+        except CosmosResourceNotFoundError:
+            return self.__build_directory(email)
+        return UserDirectory.from_dict(item)
+
+    def __build_directory(self, email: str) -> UserDirectory:
+        items = self.db.query_items(
+            query="SELECT c.id, c.name, c.owner_email FROM c WHERE c.owner_email = @email or ARRAY_CONTAINS(c.shared_with, @email)",
+            parameters=[dict(name="@email", value=email)],
+            enable_cross_partition_query=True,
+        )
+        directory = UserDirectory(email)
+        for item in items:
+            directory.add(item["id"], item["name"], item["owner_email"])
+        return directory
+
+    def __save_directory(self, directory: UserDirectory):
+        if directory.etag is None:
+            self.directories_db.create_item(directory.to_dict())
+        else:
+            self.directories_db.replace_item(
+                directory.email,
+                directory.to_dict(),
+                etag=directory.etag,
+                match_condition=MatchConditions.IfNotModified,
+            )
+
+    def __update_directory(self, email: str, change):
+        for _ in range(MAX_DIRECTORY_WRITE_ATTEMPTS):
+            directory = self.__get_directory(email)
+            change(directory)
+            try:
+                self.__save_directory(directory)
+                return
+            except (CosmosAccessConditionFailedError, CosmosResourceExistsError):
+                continue
+        logger.warning("Dropping directory for %s so it is rebuilt on next read", email)
+        try:
+            self.directories_db.delete_item(email, email)
+        except CosmosResourceNotFoundError:
+            pass
+
+    def __add_to_directory(self, email: str, tasks_list: TasksList):
+        self.__update_directory(
+            email,
+            lambda directory: directory.add(
+                tasks_list.id, tasks_list.name, tasks_list.owner_email
+            ),
+        )
+
+    def __read_item(self, id: str, owner_email: str) -> TasksList | None:
+        try:
+            item = self.db.read_item(id, partition_key=owner_email)
+        except CosmosResourceNotFoundError:
+            return None
+        return decoded_tasks_list(TasksList.from_dict(item))
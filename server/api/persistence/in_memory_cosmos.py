@@ -0,0 +1,617 @@
+import copy
+import re
+import threading
+import uuid
+from typing import Callable
+
+from azure.core import MatchConditions
+from azure.core.async_paging import AsyncItemPaged, AsyncList
+from azure.core.paging import ItemPaged
+from azure.cosmos.exceptions import (
+    CosmosAccessConditionFailedError,
+    CosmosHttpResponseError,
+    CosmosResourceExistsError,
+    CosmosResourceNotFoundError,
+)
+
+# Stands in for Cosmos so the app can be tested and benchmarked without the emulator.
+# Only the SQL the repositories issue is understood: SELECT */COUNT(1)/c.a, c.b FROM c
+# [WHERE ...] [ORDER BY ...] [OFFSET @x LIMIT @y] with =, !=, <, >, AND, OR, NOT,
+# ARRAY_CONTAINS and IS_DEFINED.
+
+TOKEN = re.compile(
+    r"\s*(?:(?P<param>@\w+)|(?P<string>'[^']*')|(?P<number>-?\d+(?:\.\d+)?)"
+    r"|(?P<path>[A-Za-z_]\w*(?:\.[A-Za-z_]\w*)*)|(?P<op>!=|<=|>=|=|<|>|\(|\)|,|\*))"
+)
+FUNCTIONS = ("ARRAY_CONTAINS", "IS_DEFINED")
+DEFAULT_PAGE_SIZE = 100
+DEFAULT_REQUEST_CHARGES = {
+    "read_item": 1.0,
+    "read_all_items": 2.5,
+    "query_items": 2.5,
+    "create_item": 5.0,
+    "upsert_item": 5.0,
+    "replace_item": 5.0,
+    "patch_item": 5.0,
+    "delete_item": 5.0,
+    "query_items_change_feed": 1.0,
+}
+
+
+def tokenise(text: str) -> list[tuple[str, str]]:
+    position = 0
+    tokens = []
+    text = text.strip()
+    while position < len(text):
+        match = TOKEN.match(text, position)
+        if match is None:
+            raise ValueError(f"Cannot parse query at: {text[position:]}")
+        position = match.end()
+        tokens.append((match.lastgroup, match.group(match.lastgroup)))
+    return tokens
+
+
+def property_path(path: str) -> str:
+    return path.split(".", 1)[1] if "." in path else ""
+
+
+class Query:
+
+    def __init__(self, query: str, parameters: list[dict] | None = None):
+        self.parameters = {
+            parameter["name"]: parameter["value"] for parameter in parameters or []
+        }
+        self.tokens = tokenise(query)
+        self.position = 0
+        self.count = False
+        self.projection = None
+        self.where = None
+        self.order_by = []
+        self.offset = None
+        self.limit = None
+        self.__parse()
+
+    def matches(self, item: dict, node=None) -> bool:
+        node = self.where if node is None else node
+        if node is None:
+            return True
+        kind = node[0]
+        if kind == "or":
+            return self.matches(item, node[1]) or self.matches(item, node[2])
+        if kind == "and":
+            return self.matches(item, node[1]) and self.matches(item, node[2])
+        if kind == "not":
+            return not self.matches(item, node[1])
+        if kind == "array_contains":
+            array = self.__resolve(node[1], item) or []
+            return self.__resolve(node[2], item) in array
+        if kind == "is_defined":
+            return self.__resolve(node[1], item) is not None
+        _, operator, left, right = node
+        left, right = self.__resolve(left, item), self.__resolve(right, item)
+        if operator == "=":
+            return left == right
+        if operator == "!=":
+            return left != right
+        if left is None or right is None:
+            return False
+        return {
+            "<": lambda: left < right,
+            ">": lambda: left > right,
+            "<=": lambda: left <= right,
+            ">=": lambda: left >= right,
+        }[operator]()
+
+    def run(self, items: list[dict]) -> list:
+        results = [item for item in items if self.matches(item)]
+        for path, descending in reversed(self.order_by):
+            results.sort(
+                key=lambda item: self.__resolve(("path", path), item),
+                reverse=descending,
+            )
+        if self.offset is not None:
+            start = self.__resolve(self.offset, {})
+            end = start + self.__resolve(self.limit, {})
+            results = results[start:end]
+        if self.count:
+            return [len(results)]
+        if self.projection is not None:
+            results = [
+                {
+                    path.split(".")[-1]: self.__resolve(("path", path), item)
+                    for path in self.projection
+                }
+                for item in results
+            ]
+        return copy.deepcopy(results)
+
+    def __peek(self) -> tuple[str | None, str | None]:
+        if self.position < len(self.tokens):
+            return self.tokens[self.position]
+        return None, None
+
+    def __keyword(self, word: str) -> bool:
+        kind, value = self.__peek()
+        if kind == "path" and value.upper() == word:
+            self.position += 1
+            return True
+        return False
+
+    def __expect(self, expected: str):
+        _, value = self.__peek()
+        if value is None or value.upper() != expected:
+            raise ValueError(f"Expected {expected} but found {value}")
+        self.position += 1
+
+    def __parse(self):
+        self.__expect("SELECT")
+        self.__keyword("VALUE")
+        if self.__peek()[1] == "*":
+            self.position += 1
+        elif self.__keyword("COUNT"):
+            self.__expect("(")
+            self.position += 1
+            self.__expect(")")
+            self.count = True
+        else:
+            self.projection = self.__paths()
+        self.__expect("FROM")
+        self.position += 1
+        if self.__keyword("WHERE"):
+            self.where = self.__parse_or()
+        if self.__keyword("ORDER"):
+            self.__expect("BY")
+            while True:
+                path = property_path(self.__peek()[1])
+                self.position += 1
+                descending = self.__keyword("DESC")
+                if not descending:
+                    self.__keyword("ASC")
+                self.order_by.append((path, descending))
+                if self.__peek()[1] != ",":
+                    break
+                self.position += 1
+        if self.__keyword("OFFSET"):
+            self.offset = self.__operand()
+            self.__expect("LIMIT")
+            self.limit = self.__operand()
+
+    def __paths(self) -> list[str]:
+        paths = [property_path(self.__peek()[1])]
+        self.position += 1
+        while self.__peek()[1] == ",":
+            self.position += 1
+            paths.append(property_path(self.__peek()[1]))
+            self.position += 1
+        return paths
+
+    def __parse_or(self):
+        left = self.__parse_and()
+        while self.__keyword("OR"):
+            left = ("or", left, self.__parse_and())
+        return left
+
+    def __parse_and(self):
+        left = self.__parse_not()
+        while self.__keyword("AND"):
+            left = ("and", left, self.__parse_not())
+        return left
+
+    def __parse_not(self):
+        if self.__keyword("NOT"):
+            return "not", self.__parse_not()
+        return self.__parse_atom()
+
+    def __parse_atom(self):
+        kind, value = self.__peek()
+        if value == "(":
+            self.position += 1
+            inner = self.__parse_or()
+            self.__expect(")")
+            return inner
+        if kind == "path" and value.upper() in FUNCTIONS:
+            self.position += 1
+            self.__expect("(")
+            arguments = [self.__operand()]
+            while self.__peek()[1] == ",":
+                self.position += 1
+                arguments.append(self.__operand())
+            self.__expect(")")
+            return value.lower(), *arguments
+        left = self.__operand()
+        operator = self.__peek()[1]
+        self.position += 1
+        return "cmp", operator, left, self.__operand()
+
+    def __operand(self):
+        kind, value = self.__peek()
+        self.position += 1
+        if kind == "param":
+            return "param", value
+        if kind == "string":
+            return "literal", value[1:-1]
+        if kind == "number":
+            return "literal", float(value) if "." in value else int(value)
+        if kind == "path":
+            if value.lower() in ("true", "false"):
+                return "literal", value.lower() == "true"
+            if value.lower() == "null":
+                return "literal", None
+            return "path", property_path(value)
+        raise ValueError(f"Unexpected operand {value}")
+
+    def __resolve(self, operand, item: dict):
+        kind, value = operand
+        if kind == "param":
+            return self.parameters[value]
+        if kind == "literal":
+            return value
+        current = item
+        for part in value.split("."):
+            if not isinstance(current, dict) or part not in current:
+                return None
+            current = current[part]
+        return current
+
+
+def start_of(continuation_token: str | None) -> int:
+    if continuation_token is not None and not continuation_token.isdigit():
+        raise CosmosHttpResponseError(
+            status_code=400, message="Invalid continuation token"
+        )
+    return int(continuation_token or 0)
+
+
+def paged(
+    results: list,
+    max_item_count: int | None = None,
+    respond: Callable[[], None] | None = None,
+) -> ItemPaged:
+    page_size = max_item_count or DEFAULT_PAGE_SIZE
+
+    # like the SDK, each page reports its own response headers
+    def get_next(continuation_token: str | None) -> int:
+        start = start_of(continuation_token)
+        if respond is not None:
+            respond()
+        return start
+
+    def extract_data(start: int):
+        end = start + page_size
+        return (str(end) if end < len(results) else None), iter(results[start:end])
+
+    return ItemPaged(get_next, extract_data)
+
+
+def apply_patch_operation(document: dict, operation: dict):
+    parts = operation["path"].strip("/").split("/")
+    target = document
+    for part in parts[:-1]:
+        target = target[int(part)] if isinstance(target, list) else target[part]
+    key = parts[-1]
+    if isinstance(target, list):
+        key = len(target) if key == "-" else int(key)
+    if operation["op"] == "add" and isinstance(target, list):
+        target.insert(key, operation["value"])
+    elif operation["op"] in ("add", "set", "replace"):
+        target[key] = operation["value"]
+    elif operation["op"] == "remove":
+        del target[key]
+    elif operation["op"] == "incr":
+        target[key] += operation["value"]
+
+
+class InMemoryClientConnection:
+
+    def __init__(self):
+        self.last_response_headers = {}
+
+
+class InMemoryContainer:
+
+    def __init__(
+        self,
+        id: str,
+        partition_key_path: str,
+        unique_key_paths: list[str] | None = None,
+        request_charges: dict[str, float] | None = None,
+    ):
+        self.id = id
+        self.partition_key_path = partition_key_path
+        self.partition_key_property = partition_key_path.lstrip("/")
+        self.unique_key_paths = unique_key_paths or []
+        self.unique_key_properties = [
+            path.lstrip("/") for path in self.unique_key_paths
+        ]
+        self.request_charges = {**DEFAULT_REQUEST_CHARGES, **(request_charges or {})}
+        self.client_connection = InMemoryClientConnection()
+        self.documents: dict[tuple, dict] = {}
+        self.feed: list[dict] = []
+        self.lock = threading.RLock()
+
+    def read(self, **kwargs) -> dict:
+        return {
+            "id": self.id,
+            "partitionKey": {"paths": [self.partition_key_path], "kind": "Hash"},
+            "uniqueKeyPolicy": {
+                "uniqueKeys": [{"paths": [path]} for path in self.unique_key_paths]
+            },
+        }
+
+    def read_item(self, item: str, partition_key, **kwargs) -> dict:
+        with self.lock:
+            self.__respond("read_item", kwargs.get("response_hook"))
+            return copy.deepcopy(self.__existing(partition_key, item))
+
+    def read_all_items(self, max_item_count: int | None = None, **kwargs) -> ItemPaged:
+        with self.lock:
+            self.__respond("read_all_items", kwargs.get("response_hook"))
+            return paged(
+                copy.deepcopy(list(self.documents.values())),
+                max_item_count,
+                lambda: self.__respond("read_all_items", kwargs.get("response_hook")),
+            )
+
+    def query_items(
+        self,
+        query: str,
+        parameters: list[dict] | None = None,
+        partition_key=None,
+        max_item_count: int | None = None,
+        **kwargs,
+    ) -> ItemPaged:
+        with self.lock:
+            self.__respond("query_items", kwargs.get("response_hook"))
+            documents = [
+                document
+                for (key, _), document in self.documents.items()
+                if partition_key is None or key == partition_key
+            ]
+            return paged(
+                Query(query, parameters).run(documents),
+                max_item_count,
+                lambda: self.__respond("query_items", kwargs.get("response_hook")),
+            )
+
+    def create_item(self, body: dict, **kwargs) -> dict:
+        with self.lock:
+            self.__respond("create_item", kwargs.get("response_hook"))
+            if self.__key_of(body) in self.documents:
+                raise CosmosResourceExistsError(status_code=409, message="Conflict")
+            return self.__store(body)
+
+    def upsert_item(
+        self, body: dict, etag=None, match_condition=None, **kwargs
+    ) -> dict:
+        with self.lock:
+            self.__respond("upsert_item", kwargs.get("response_hook"))
+            existing = self.documents.get(self.__key_of(body))
+            self.__check_etag(existing, etag, match_condition)
+            return self.__store(body)
+
+    def replace_item(
+        self, item: str, body: dict, etag=None, match_condition=None, **kwargs
+    ) -> dict:
+        with self.lock:
+            self.__respond("replace_item", kwargs.get("response_hook"))
+            existing = self.__existing(body[self.partition_key_property], item)
+            self.__check_etag(existing, etag, match_condition)
+            return self.__store(body)
+
+    def patch_item(
+        self,
+        item: str,
+        partition_key,
+        patch_operations: list[dict],
+        filter_predicate: str | None = None,
+        etag=None,
+        match_condition=None,
+        **kwargs,
+    ) -> dict:
+        with self.lock:
+            self.__respond("patch_item", kwargs.get("response_hook"))
+            existing = self.__existing(partition_key, item)
+            self.__check_etag(existing, etag, match_condition)
+            if filter_predicate is not None and not Query(
+                f"SELECT * {filter_predicate}"
+            ).matches(existing):
+                raise CosmosAccessConditionFailedError(
+                    status_code=412, message="Precondition failed"
+                )
+            document = copy.deepcopy(existing)
+            for operation in patch_operations:
+                apply_patch_operation(document, operation)
+            return self.__store(document)
+
+    def delete_item(
+        self, item: str, partition_key, etag=None, match_condition=None, **kwargs
+    ):
+        with self.lock:
+            self.__respond("delete_item", kwargs.get("response_hook"))
+            existing = self.__existing(partition_key, item)
+            self.__check_etag(existing, etag, match_condition)
+            del self.documents[(partition_key, item)]
+
+    def query_items_change_feed(
+        self,
+        partition_key_range_id=None,
+        is_start_from_beginning: bool = False,
+        continuation: str | None = None,
+        max_item_count: int | None = None,
+        **kwargs,
+    ) -> ItemPaged:
+        with self.lock:
+            if continuation is None:
+                continuation = str(0 if is_start_from_beginning else len(self.feed))
+
+        # Like Cosmos, each page is read when fetched and its etag resumes after it
+        def get_next(continuation_token: str | None) -> tuple[int, list[dict]]:
+            with self.lock:
+                start = int(continuation_token or continuation)
+                end = len(self.feed)
+                latest = {}
+                for position in range(start, len(self.feed)):
+                    key = self.__key_of(self.feed[position])
+                    if key not in latest and len(latest) == max_item_count:
+                        end = position
+                        break
+                    latest[key] = position
+                self.__respond(
+                    "query_items_change_feed", kwargs.get("response_hook"), str(end)
+                )
+                return end, copy.deepcopy(
+                    [self.feed[position] for position in sorted(latest.values())]
+                )
+
+        def extract_data(response: tuple[int, list[dict]]):
+            end, documents = response
+            return (str(end) if len(documents) > 0 else None), iter(documents)
+
+        return ItemPaged(get_next, extract_data)
+
+    def __respond(
+        self, operation: str, response_hook=None, continuation: str | None = None
+    ):
+        headers = {
+            "x-ms-request-charge": str(self.request_charges[operation]),
+            "x-ms-request-duration-ms": "0",
+            "etag": continuation or str(len(self.feed)),
+        }
+        self.client_connection.last_response_headers = headers
+        if response_hook is not None:
+            response_hook(headers, None)
+
+    def __key_of(self, document: dict) -> tuple:
+        return document[self.partition_key_property], document["id"]
+
+    def __existing(self, partition_key, item: str) -> dict:
+        existing = self.documents.get((partition_key, item))
+        if existing is None:
+            raise CosmosResourceNotFoundError(status_code=404, message="Not found")
+        return existing
+
+    @staticmethod
+    def __check_etag(existing: dict | None, etag, match_condition):
+        if match_condition == MatchConditions.IfNotModified and (
+            existing is None or existing["_etag"] != etag
+        ):
+            raise CosmosAccessConditionFailedError(
+                status_code=412, message="Precondition failed"
+            )
+
+    def __store(self, body: dict) -> dict:
+        key = self.__key_of(body)
+        for property in self.unique_key_properties:
+            for other_key, other in self.documents.items():
+                if (
+                    other_key != key
+                    and other_key[0] == key[0]
+                    and other.get(property) == body.get(property)
+                ):
+                    raise CosmosResourceExistsError(
+                        status_code=409, message="Unique key conflict"
+                    )
+        document = {
+            **copy.deepcopy(body),
+            "_etag": f'"{uuid.uuid4()}"',
+            "_ts": len(self.feed),
+        }
+        self.documents[key] = document
+        self.feed.append(copy.deepcopy(document))
+        return copy.deepcopy(document)
+
+
+class InMemoryDatabase:
+
+    def __init__(self, id: str, request_charges: dict[str, float] | None = None):
+        self.id = id
+        self.request_charges = request_charges
+        self.containers: dict[str, InMemoryContainer] = {}
+
+    def create_container_if_not_exists(
+        self, id: str, partition_key, unique_key_policy: dict | None = None, **kwargs
+    ) -> InMemoryContainer:
+        if id not in self.containers:
+            unique_key_paths = [
+                path
+                for unique_key in (unique_key_policy or {}).get("uniqueKeys", [])
+                for path in unique_key["paths"]
+            ]
+            self.containers[id] = InMemoryContainer(
+                id, partition_key["paths"][0], unique_key_paths, self.request_charges
+            )
+        return self.containers[id]
+
+    def get_container_client(self, id: str) -> InMemoryContainer:
+        return self.containers[id]
+
+
+class InMemoryCosmosClient:
+
+    def __init__(self, request_charges: dict[str, float] | None = None):
+        self.request_charges = request_charges
+        self.databases: dict[str, InMemoryDatabase] = {}
+
+    def create_database_if_not_exists(self, id: str, **kwargs) -> InMemoryDatabase:
+        if id not in self.databases:
+            self.databases[id] = InMemoryDatabase(id, self.request_charges)
+        return self.databases[id]
+
+    def get_database_client(self, id: str) -> InMemoryDatabase:
+        return self.create_database_if_not_exists(id)
+
+    def delete_database(self, id: str):
+        self.databases.pop(id, None)
+
+
+def async_paged(results: list, max_item_count: int | None = None) -> AsyncItemPaged:
+    page_size = max_item_count or DEFAULT_PAGE_SIZE
+
+    async def get_next(continuation_token: str | None) -> int:
+        return start_of(continuation_token)
+
+    async def extract_data(start: int):
+        end = start + page_size
+        return (str(end) if end < len(results) else None), AsyncList(results[start:end])
+
+    return AsyncItemPaged(get_next, extract_data)
+
+
+class InMemoryAsyncContainer:
+
+    def __init__(self, container: InMemoryContainer):
+        self.container = container
+
+    def query_items(self, query: str, max_item_count: int | None = None, **kwargs):
+        return async_paged(
+            list(self.container.query_items(query, **kwargs)), max_item_count
+        )
+
+    def __getattr__(self, name):
+        method = getattr(self.container, name)
+
+        async def call(*args, **kwargs):
+            return method(*args, **kwargs)
+
+        return call
+
+
+class InMemoryAsyncDatabase:
+
+    def __init__(self, database: InMemoryDatabase):
+        self.database = database
+
+    def get_container_client(self, id: str) -> InMemoryAsyncContainer:
+        return InMemoryAsyncContainer(self.database.get_container_client(id))
+
+
+class InMemoryAsyncCosmosClient:
+
+    def __init__(self, client: InMemoryCosmosClient):
+        self.client = client
+
+    def get_database_client(self, id: str) -> InMemoryAsyncDatabase:
+        return InMemoryAsyncDatabase(self.client.get_database_client(id))
+
+    async def close(self):
+        pass
@@ -0,0 +1,23 @@
+from azure.cosmos.aio import CosmosClient, ContainerProxy
+from api.persistence.constants import (
+    TASKS_LISTS_CONTAINER_ID,
+    USER_DIRECTORIES_CONTAINER_ID,
+)
+from pathlib import Path
+import yaml
+
+path = Path(__file__).parent / "../config.yaml"
+config = yaml.safe_load(open(path))
+
+# Containers are provisioned by provision_cosmos; the async client only needs proxies
+client = CosmosClient.from_connection_string(config["connection_string"])
+
+database = client.get_database_client(config["database"])
+
+tasks_lists_container: ContainerProxy = database.get_container_client(
+    TASKS_LISTS_CONTAINER_ID
+)
+
+user_directories_container: ContainerProxy = database.get_container_client(
+    USER_DIRECTORIES_CONTAINER_ID
+)
@@ -1,32 +1,67 @@
-﻿from azure.cosmos import CosmosClient, PartitionKey, ContainerProxy
-from api.persistence.constants import TASKS_LISTS_CONTAINER_ID, TASKS_LISTS_PARTITION_KEY_PATH
+﻿import threading
+from azure.cosmos import CosmosClient, ContainerProxy, DatabaseProxy
+from azure.cosmos.documents import ConnectionPolicy, RetryOptions
+from api.persistence.constants import (
+    TASKS_LISTS_CONTAINER_ID,
+    USER_DIRECTORIES_CONTAINER_ID,
+)
 import urllib3
 from pathlib import Path
 import yaml
-import os
-from api.persistence.run_cosmos import start_and_wait_for_cosmos
 
 path = Path(__file__).parent / "../config.yaml"
 config = yaml.safe_load(open(path))
 
 urllib3.disable_warnings()
 
-client = None
+# Provisioning happens in provision_cosmos, so nothing here talks to Cosmos until first use
+client: CosmosClient | None = None
+client_lock = threading.Lock()
 
-# Only want to run if in local Windows environment
-if os.name == "nt" and os.getenv("AZURE_EXTENSION_DIR") is None:
-    start_and_wait_for_cosmos(config["connection_string"])
 
-client = CosmosClient.from_connection_string(config["connection_string"])
+# ThrottledContainer retries 429s itself within its own budget, so the SDK must not
+# also wait out up to 30 s of retries; retry_total=0 is ignored, hence the policy
+def client_options(config: dict) -> dict:
+    if config.get("cosmos_partition_ru_per_second", 0) <= 0:
+        return {}
+    connection_policy = ConnectionPolicy()
+    connection_policy.RetryOptions = RetryOptions(
+        max_retry_attempt_count=0, max_wait_time_in_seconds=0
+    )
+    return {"connection_policy": connection_policy}
 
-database = client.create_database_if_not_exists(
-    id=config["database"],
-    offer_throughput=400,
-)
 
-tasks_lists_container: ContainerProxy = database.create_container_if_not_exists(
-    id=TASKS_LISTS_CONTAINER_ID,
-    partition_key=PartitionKey(
-        path=TASKS_LISTS_PARTITION_KEY_PATH,
-    ),
-)
+def get_client() -> CosmosClient:
+    global client
+    if client is None:
+        with client_lock:
+            if client is None:
+                client = CosmosClient.from_connection_string(
+                    config["connection_string"], **client_options(config)
+                )
+    return client
+
+
+def get_database_client() -> DatabaseProxy:
+    return get_client().get_database_client(config["database"])
+
+
+def get_container_client(container_id: str) -> ContainerProxy:
+    return get_database_client().get_container_client(container_id)
+
+
+class LazyContainerProxy:
+
+    def __init__(self, container_id: str):
+        self.container_id = container_id
+        self.container: ContainerProxy | None = None
+
+    def __getattr__(self, name):
+        if self.container is None:
+            self.container = get_container_client(self.container_id)
+        return getattr(self.container, name)
+
+
+tasks_lists_container = LazyContainerProxy(TASKS_LISTS_CONTAINER_ID)
+
+user_directories_container = LazyContainerProxy(USER_DIRECTORIES_CONTAINER_ID)
@@ -0,0 +1,245 @@
+import logging
+import threading
+import time
+
+from azure.cosmos import ContainerProxy
+
+from api.application.operation_context import current_operation
+
+LOG_SUMMARY_EVERY = 100
+
+logger = logging.getLogger(__name__)
+
+
+class CosmosMetrics:
+
+    def __init__(self):
+        self.__lock = threading.Lock()
+        self.__calls = 0
+        self.__stats = {}
+
+    def record(
+        self,
+        operation: str,
+        call: str,
+        request_charge: float,
+        client_latency_ms: float,
+        server_latency_ms: float,
+        items: int,
+    ):
+        with self.__lock:
+            stats = self.__stats.setdefault(
+                (operation, call),
+                {
+                    "calls": 0,
+                    "request_charge": 0.0,
+                    "client_latency_ms": 0.0,
+                    "server_latency_ms": 0.0,
+                    "items": 0,
+                },
+            )
+            stats["calls"] += 1
+            stats["request_charge"] += request_charge
+            stats["client_latency_ms"] += client_latency_ms
+            stats["server_latency_ms"] += server_latency_ms
+            stats["items"] += items
+            self.__calls += 1
+            log_summary = self.__calls % LOG_SUMMARY_EVERY == 0
+        logger.debug(
+            "%s %s: %.2f RU, %.1f ms client, %.1f ms server, %d items",
+            operation,
+            call,
+            request_charge,
+            client_latency_ms,
+            server_latency_ms,
+            items,
+        )
+        if log_summary:
+            self.log_summary()
+
+    def to_dict(self) -> list[dict]:
+        with self.__lock:
+            stats = [
+                {"operation": operation, "call": call, **values}
+                for (operation, call), values in self.__stats.items()
+            ]
+        for entry in stats:
+            entry["mean_request_charge"] = entry["request_charge"] / entry["calls"]
+            entry["mean_client_latency_ms"] = (
+                entry["client_latency_ms"] / entry["calls"]
+            )
+            entry["mean_server_latency_ms"] = (
+                entry["server_latency_ms"] / entry["calls"]
+            )
+        return sorted(stats, key=lambda entry: entry["request_charge"], reverse=True)
+
+    def log_summary(self):
+        for entry in self.to_dict():
+            logger.info(
+                "%s %s: %d calls, %.2f RU total, %.2f RU mean, %.1f ms mean client latency",
+                entry["operation"],
+                entry["call"],
+                entry["calls"],
+                entry["request_charge"],
+                entry["mean_request_charge"],
+                entry["mean_client_latency_ms"],
+            )
+
+    def clear(self):
+        with self.__lock:
+            self.__calls = 0
+            self.__stats = {}
+
+
+cosmos_metrics = CosmosMetrics()
+
+
+class ResponseMetrics:
+
+    def __init__(self, forward=None):
+        self.forward = forward
+        self.request_charge = 0.0
+        self.server_latency_ms = 0.0
+
+    # The SDK passes each call's own response headers, unlike the shared
+    # client_connection, and may call back more than once for a cross-partition page
+    def __call__(self, headers, result):
+        headers = headers or {}
+        self.request_charge += float(headers.get("x-ms-request-charge", 0))
+        self.server_latency_ms += float(headers.get("x-ms-request-duration-ms", 0))
+        if self.forward is not None:
+            self.forward(headers, result)
+
+    def take(self) -> tuple[float, float]:
+        taken = self.request_charge, self.server_latency_ms
+        self.request_charge = 0.0
+        self.server_latency_ms = 0.0
+        return taken
+
+
+class InstrumentedPages:
+
+    def __init__(
+        self,
+        container: "InstrumentedContainer",
+        pages,
+        operation: str,
+        response: ResponseMetrics,
+    ):
+        self.container = container
+        self.pages = pages
+        self.operation = operation
+        self.response = response
+
+    @property
+    def continuation_token(self):
+        return self.pages.continuation_token
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        started = time.perf_counter()
+        page = list(next(self.pages))
+        self.container.record(
+            self.operation, "query_items", started, len(page), self.response
+        )
+        return iter(page)
+
+
+class InstrumentedQuery:
+
+    def __init__(
+        self,
+        container: "InstrumentedContainer",
+        paged,
+        operation: str,
+        response: ResponseMetrics,
+    ):
+        self.container = container
+        self.paged = paged
+        self.operation = operation
+        self.response = response
+
+    def by_page(self, continuation_token=None):
+        return InstrumentedPages(
+            self.container,
+            self.paged.by_page(continuation_token),
+            self.operation,
+            self.response,
+        )
+
+    def __iter__(self):
+        for page in self.by_page():
+            yield from page
+
+
+class InstrumentedContainer:
+
+    def __init__(self, container: ContainerProxy, metrics: CosmosMetrics):
+        self.container = container
+        self.metrics = metrics
+
+    def read_item(self, *args, **kwargs):
+        return self.__call("read_item", 1, *args, **kwargs)
+
+    def create_item(self, *args, **kwargs):
+        return self.__call("create_item", 1, *args, **kwargs)
+
+    def upsert_item(self, *args, **kwargs):
+        return self.__call("upsert_item", 1, *args, **kwargs)
+
+    def replace_item(self, *args, **kwargs):
+        return self.__call("replace_item", 1, *args, **kwargs)
+
+    def patch_item(self, *args, **kwargs):
+        return self.__call("patch_item", 1, *args, **kwargs)
+
+    def delete_item(self, *args, **kwargs):
+        return self.__call("delete_item", 0, *args, **kwargs)
+
+    def query_items(self, *args, **kwargs):
+        return self.__query("query_items", *args, **kwargs)
+
+    def read_all_items(self, *args, **kwargs):
+        return self.__query("read_all_items", *args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self.container, name)
+
+    def record(
+        self,
+        operation: str,
+        call: str,
+        started: float,
+        items: int,
+        response: ResponseMetrics,
+    ):
+        client_latency_ms = (time.perf_counter() - started) * 1000
+        request_charge, server_latency_ms = response.take()
+        self.metrics.record(
+            operation,
+            call,
+            request_charge,
+            client_latency_ms,
+            server_latency_ms,
+            items,
+        )
+
+    def __call(self, call: str, items: int, *args, **kwargs):
+        operation = current_operation.get()
+        response = ResponseMetrics(kwargs.pop("response_hook", None))
+        started = time.perf_counter()
+        try:
+            return getattr(self.container, call)(
+                *args, response_hook=response, **kwargs
+            )
+        finally:
+            self.record(operation, call, started, items, response)
+
+    def __query(self, call: str, *args, **kwargs):
+        response = ResponseMetrics(kwargs.pop("response_hook", None))
+        paged = getattr(self.container, call)(*args, response_hook=response, **kwargs)
+        # creating the query reports the shared headers of whatever call came last
+        response.take()
+        return InstrumentedQuery(self, paged, current_operation.get(), response)
@@ -0,0 +1,126 @@
+import json
+import logging
+import threading
+
+from api.application.invalidation_bus import (
+    InvalidationBus,
+    InvalidationTransport,
+    LoopbackTransport,
+    Subscriber,
+)
+from api.persistence.change_feed_processor import (
+    ChangeFeedCheckpoint,
+    ChangeFeedProcessor,
+)
+
+INVALIDATION_CHANNEL = "rule_of_three:tasks_lists:invalidations"
+
+logger = logging.getLogger(__name__)
+
+
+class RedisInvalidationTransport:
+
+    def __init__(self, client, channel: str = INVALIDATION_CHANNEL):
+        self.client = client
+        self.channel = channel
+        self.__lock = threading.Lock()
+        self.__subscribers: list[Subscriber] = []
+        self.__thread = None
+
+    def publish(self, message: dict):
+        self.client.publish(self.channel, json.dumps(message))
+
+    def subscribe(self, subscriber: Subscriber):
+        with self.__lock:
+            self.__subscribers.append(subscriber)
+            if self.__thread is not None:
+                return
+            pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(**{self.channel: self.__receive})
+            self.__thread = pubsub.run_in_thread(sleep_time=1, daemon=True)
+
+    def stop(self):
+        with self.__lock:
+            if self.__thread is not None:
+                self.__thread.stop()
+                self.__thread = None
+
+    def __receive(self, raw: dict):
+        message = json.loads(raw["data"])
+        for subscriber in list(self.__subscribers):
+            subscriber(message)
+
+
+class ChangeFeedInvalidationTransport:
+
+    def __init__(
+        self,
+        processor: ChangeFeedProcessor,
+        deletes: InvalidationTransport | None = None,
+    ):
+        self.processor = processor
+        self.deletes = deletes
+
+    # Cosmos publishes every write to the change feed, so only deletes, which the
+    # latest version change feed never reports, need sending another way
+    def publish(self, message: dict):
+        if message["etag"] is None and self.deletes is not None:
+            self.deletes.publish(message)
+
+    def subscribe(self, subscriber: Subscriber):
+        self.processor.register(
+            lambda document: subscriber(
+                {"list_id": document["id"], "etag": document.get("_etag")}
+            )
+        )
+        if self.deletes is not None:
+            self.deletes.subscribe(subscriber)
+
+
+def redis_transport(config: dict) -> RedisInvalidationTransport | None:
+    try:
+        import redis
+
+        client = redis.Redis.from_url(
+            config.get("cache_redis_url", "redis://localhost:6379/0")
+        )
+        client.ping()
+        return RedisInvalidationTransport(client)
+    except Exception:
+        logger.warning(
+            "Could not use the redis invalidation transport, running without one",
+            exc_info=True,
+        )
+        return None
+
+
+def create_invalidation_bus(config: dict) -> InvalidationBus | None:
+    transport = config.get("invalidation_transport", "none")
+    if transport == "loopback":
+        return InvalidationBus(LoopbackTransport())
+    if transport == "redis":
+        redis_invalidations = redis_transport(config)
+        if redis_invalidations is None:
+            return None
+        return InvalidationBus(redis_invalidations)
+    if transport == "change_feed":
+        from api.persistence.initialise_cosmos import tasks_lists_container
+
+        processor = ChangeFeedProcessor(
+            tasks_lists_container,
+            ChangeFeedCheckpoint(),
+            config.get("change_feed_poll_seconds", 5),
+            start_from_beginning=False,
+        )
+        deletes = None
+        if config.get("change_feed_deletes_transport", "none") == "redis":
+            deletes = redis_transport(config)
+        if deletes is None:
+            logger.warning(
+                "Deleted tasks lists stay cached on other instances until their"
+                " entries expire, set change_feed_deletes_transport to publish them"
+            )
+        bus = InvalidationBus(ChangeFeedInvalidationTransport(processor, deletes))
+        processor.start()
+        return bus
+    return None
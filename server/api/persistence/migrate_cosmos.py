@@ -1,12 +1,32 @@
-﻿from api.domain.tasks_list import TasksList
-from api.persistence.converters import convert_to_domain_list
-from api.persistence.initialise_cosmos import tasks_lists_container
+﻿import logging
 
+from azure.cosmos import ContainerProxy, CosmosClient
 
-def migrate(the_tasks_list):
-    print(f"Tasks list {the_tasks_list.id} migrated")
+from api.persistence.constants import TASKS_LISTS_CONTAINER_ID
+from api.persistence.initialise_cosmos import config
+from api.persistence.migration_runner import MigrationRunner
 
+MIGRATION_NAME = "noop"
 
-tasks_lists = convert_to_domain_list(TasksList, tasks_lists_container.read_all_items())
-for tasks_list in tasks_lists:
-    migrate(tasks_list)
+
+def migrate(container: ContainerProxy, document: dict) -> bool:
+    return False
+
+
+def create_container() -> ContainerProxy:
+    return (
+        CosmosClient.from_connection_string(config["connection_string"])
+        .get_database_client(config["database"])
+        .get_container_client(TASKS_LISTS_CONTAINER_ID)
+    )
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    MigrationRunner(
+        create_container,
+        migrate,
+        checkpoint_path=f"migration_{MIGRATION_NAME}.checkpoint.json",
+        ru_per_second=config.get("migration_ru_per_second", 100),
+        workers=config.get("migration_workers", 4),
+    ).run()
@@ -0,0 +1,196 @@
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+from azure.cosmos import ContainerProxy
+
+from api.persistence.request_unit_budget import RequestUnitBudget
+
+ID_CHARACTERS = "0123456789abcdef"
+
+logger = logging.getLogger(__name__)
+
+
+def id_ranges(count: int) -> list[tuple[str | None, str | None]]:
+    # Ids are uuid4 strings, so ranges over the first hex digit split documents
+    # evenly; the first and last ranges are open so legacy ids are not skipped
+    count = max(1, min(count, len(ID_CHARACTERS)))
+    boundaries = [ID_CHARACTERS[i * len(ID_CHARACTERS) // count] for i in range(count)]
+    return [
+        (
+            boundaries[i] if i > 0 else None,
+            boundaries[i + 1] if i + 1 < count else None,
+        )
+        for i in range(count)
+    ]
+
+
+def request_charge(container: ContainerProxy) -> float:
+    headers = container.client_connection.last_response_headers or {}
+    return float(headers.get("x-ms-request-charge", 0))
+
+
+class MigrationCheckpoint:
+
+    def __init__(self, path: str):
+        self.path = path
+        self.lock = threading.Lock()
+        self.ranges = {}
+        if os.path.exists(path):
+            with open(path) as file:
+                self.ranges = json.load(file)
+
+    def get(self, range_id: str) -> dict:
+        return self.ranges.get(
+            range_id, {"continuation": None, "done": False, "migrated": 0}
+        )
+
+    def save(self, range_id: str, continuation: str | None, migrated: int):
+        with self.lock:
+            self.ranges[range_id] = {
+                "continuation": continuation,
+                "done": continuation is None,
+                "migrated": migrated,
+            }
+            temporary_path = self.path + ".tmp"
+            with open(temporary_path, "w") as file:
+                json.dump(self.ranges, file)
+            os.replace(temporary_path, self.path)
+
+    def migrated(self) -> int:
+        return sum(the_range["migrated"] for the_range in self.ranges.values())
+
+
+class MigrationProgress:
+
+    def __init__(self, total: int, already_migrated: int, clock=time.monotonic):
+        self.total = total
+        self.migrated = already_migrated
+        self.migrated_this_run = 0
+        self.request_units = 0.0
+        self.clock = clock
+        self.started = clock()
+        self.lock = threading.Lock()
+
+    def record(self, documents: int, request_units: float):
+        with self.lock:
+            self.migrated += documents
+            self.migrated_this_run += documents
+            self.request_units += request_units
+
+    def to_dict(self) -> dict:
+        with self.lock:
+            elapsed = max(self.clock() - self.started, 1e-9)
+            documents_per_second = self.migrated_this_run / elapsed
+            remaining = max(self.total - self.migrated, 0)
+            return {
+                "migrated": self.migrated,
+                "total": self.total,
+                "documents_per_second": documents_per_second,
+                "request_units_per_second": self.request_units / elapsed,
+                "eta_seconds": (
+                    remaining / documents_per_second if documents_per_second else None
+                ),
+            }
+
+    def report(self):
+        progress = self.to_dict()
+        eta = progress["eta_seconds"]
+        logger.info(
+            "Migrated %d/%d documents (%.1f docs/s, %.1f RU/s), ETA %s",
+            progress["migrated"],
+            progress["total"],
+            progress["documents_per_second"],
+            progress["request_units_per_second"],
+            "unknown" if eta is None else f"{eta:.0f}s",
+        )
+
+
+class MigrationRunner:
+
+    def __init__(
+        self,
+        container_factory: Callable[[], ContainerProxy],
+        migrate: Callable[[ContainerProxy, dict], bool],
+        checkpoint_path: str,
+        ru_per_second: float,
+        workers: int = 4,
+        page_size: int = 100,
+    ):
+        self.container_factory = container_factory
+        self.migrate = migrate
+        self.checkpoint = MigrationCheckpoint(checkpoint_path)
+        self.budget = RequestUnitBudget(ru_per_second)
+        self.workers = workers
+        self.page_size = page_size
+        self.progress: MigrationProgress | None = None
+
+    def run(self) -> MigrationProgress:
+        container = self.container_factory()
+        total = next(
+            iter(
+                container.query_items(
+                    query="SELECT VALUE COUNT(1) FROM c",
+                    enable_cross_partition_query=True,
+                )
+            )
+        )
+        self.progress = MigrationProgress(total, self.checkpoint.migrated())
+        ranges = [
+            the_range
+            for the_range in id_ranges(self.workers)
+            if not self.checkpoint.get(self.__range_id(the_range))["done"]
+        ]
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            for _ in executor.map(self.__migrate_range, ranges):
+                pass
+        self.progress.report()
+        return self.progress
+
+    def __migrate_range(self, the_range: tuple[str | None, str | None]):
+        range_id = self.__range_id(the_range)
+        checkpoint = self.checkpoint.get(range_id)
+        migrated = checkpoint["migrated"]
+        container = self.container_factory()
+        minimum, maximum = the_range
+        conditions = []
+        parameters = []
+        if minimum is not None:
+            conditions.append("c.id >= @min")
+            parameters.append(dict(name="@min", value=minimum))
+        if maximum is not None:
+            conditions.append("c.id < @max")
+            parameters.append(dict(name="@max", value=maximum))
+        query = "SELECT * FROM c"
+        if len(conditions) > 0:
+            query += " WHERE " + " AND ".join(conditions)
+        pages = container.query_items(
+            query=query,
+            parameters=parameters,
+            enable_cross_partition_query=True,
+            max_item_count=self.page_size,
+        ).by_page(checkpoint["continuation"])
+        for page in pages:
+            documents = list(page)
+            charge = request_charge(container)
+            self.budget.spend(charge)
+            for document in documents:
+                # Pages are replayed after a crash, so migrations must be idempotent
+                if self.migrate(container, document):
+                    write_charge = request_charge(container)
+                    self.budget.spend(write_charge)
+                    charge += write_charge
+            migrated += len(documents)
+            self.checkpoint.save(range_id, pages.continuation_token, migrated)
+            self.progress.record(len(documents), charge)
+            self.progress.report()
+        self.checkpoint.save(range_id, None, migrated)
+
+    @staticmethod
+    def __range_id(the_range: tuple[str | None, str | None]) -> str:
+        minimum, maximum = the_range
+        return f"{minimum or ''}-{maximum or ''}"
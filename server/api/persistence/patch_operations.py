@@ -0,0 +1,27 @@
+﻿MAX_PATCH_OPERATIONS = 10
+
+
+def to_patch_operations(before: dict, after: dict) -> list[dict] | None:
+    before_ids = [task["id"] for task in before["tasks"]]
+    after_ids = [task["id"] for task in after["tasks"]]
+    first_added = len(before_ids)
+    if after_ids[:first_added] != before_ids:
+        return None
+    operations = [
+        dict(op="set", path=f"/{key}", value=value)
+        for key, value in after.items()
+        if key != "tasks" and before.get(key) != value
+    ]
+    for index, (old_task, new_task) in enumerate(zip(before["tasks"], after["tasks"])):
+        operations.extend(
+            dict(op="set", path=f"/tasks/{index}/{key}", value=value)
+            for key, value in new_task.items()
+            if old_task.get(key) != value
+        )
+    operations.extend(
+        dict(op="add", path="/tasks/-", value=task)
+        for task in after["tasks"][first_added:]
+    )
+    if len(operations) > MAX_PATCH_OPERATIONS:
+        return None
+    return operations
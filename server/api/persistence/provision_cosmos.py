@@ -0,0 +1,57 @@
+from azure.cosmos import CosmosClient, PartitionKey
+from api.persistence.constants import (
+    TASKS_LISTS_CONTAINER_ID,
+    TASKS_LISTS_PARTITION_KEY_PATH,
+    TASKS_LISTS_UNIQUE_KEY_POLICY,
+    USER_DIRECTORIES_CONTAINER_ID,
+    USER_DIRECTORIES_PARTITION_KEY_PATH,
+)
+import logging
+import urllib3
+from pathlib import Path
+import yaml
+import os
+from api.persistence.cosmos_tasks_lists_repository import has_unique_names
+from api.persistence.run_cosmos import start_and_wait_for_cosmos
+
+path = Path(__file__).parent / "../config.yaml"
+config = yaml.safe_load(open(path))
+
+logger = logging.getLogger(__name__)
+
+
+def provision(client: CosmosClient, database_id: str):
+    database = client.create_database_if_not_exists(
+        id=database_id,
+        offer_throughput=400,
+    )
+    tasks_lists = database.create_container_if_not_exists(
+        id=TASKS_LISTS_CONTAINER_ID,
+        partition_key=PartitionKey(
+            path=TASKS_LISTS_PARTITION_KEY_PATH,
+        ),
+        unique_key_policy=TASKS_LISTS_UNIQUE_KEY_POLICY,
+    )
+    # An existing container keeps its original policy; names are then checked by query
+    if not has_unique_names(tasks_lists.read()):
+        logger.warning(
+            "%s was created without a unique key on /name", TASKS_LISTS_CONTAINER_ID
+        )
+    database.create_container_if_not_exists(
+        id=USER_DIRECTORIES_CONTAINER_ID,
+        partition_key=PartitionKey(
+            path=USER_DIRECTORIES_PARTITION_KEY_PATH,
+        ),
+    )
+
+
+if __name__ == "__main__":
+    urllib3.disable_warnings()
+    # Only want to run if in local Windows environment
+    if os.name == "nt" and os.getenv("AZURE_EXTENSION_DIR") is None:
+        start_and_wait_for_cosmos(config["connection_string"])
+    provision(
+        CosmosClient.from_connection_string(config["connection_string"]),
+        config["database"],
+    )
+    print(f"Provisioned database {config['database']}")
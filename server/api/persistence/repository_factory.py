@@ -0,0 +1,106 @@
+from api.persistence.constants import (
+    TASKS_LISTS_PARTITION_KEY_PATH,
+    USER_DIRECTORIES_PARTITION_KEY_PATH,
+)
+from api.persistence.sqlite_connection_pool import SqliteConnectionPool
+from api.persistence.sqlite_tasks_lists_repository import SqliteTasksListsRepository
+from api.persistence.tasks_lists_repository import (
+    AsyncTasksListsRepository,
+    TasksListsRepository,
+)
+from api.persistence.threaded_tasks_lists_repository import (
+    ThreadedTasksListsRepository,
+)
+
+
+def wrapped_container(config: dict, container, partition_key_path: str):
+    if config.get("cosmos_metrics", False):
+        from api.persistence.instrumented_container import (
+            InstrumentedContainer,
+            cosmos_metrics,
+        )
+
+        container = InstrumentedContainer(container, cosmos_metrics)
+    if config.get("cosmos_partition_ru_per_second", 0) > 0:
+        from api.persistence.throttled_container import (
+            PartitionRateLimiter,
+            ThrottledContainer,
+            throttle_metrics,
+        )
+
+        container = ThrottledContainer(
+            container,
+            partition_key_path,
+            PartitionRateLimiter(config["cosmos_partition_ru_per_second"]),
+            throttle_metrics,
+            config.get("cosmos_throttle_budget_seconds", 10),
+        )
+    return container
+
+
+def in_memory_containers(config: dict) -> tuple:
+    from api.persistence.constants import (
+        TASKS_LISTS_CONTAINER_ID,
+        USER_DIRECTORIES_CONTAINER_ID,
+    )
+    from api.persistence.in_memory_cosmos import InMemoryCosmosClient
+    from api.persistence.provision_cosmos import provision
+
+    client = InMemoryCosmosClient(config.get("in_memory_request_charges"))
+    provision(client, config["database"])
+    database = client.get_database_client(config["database"])
+    return (
+        database.get_container_client(TASKS_LISTS_CONTAINER_ID),
+        database.get_container_client(USER_DIRECTORIES_CONTAINER_ID),
+    )
+
+
+def create_tasks_lists_repository(config: dict) -> TasksListsRepository:
+    if config.get("storage") == "sqlite":
+        return SqliteTasksListsRepository(SqliteConnectionPool(config["sqlite_path"]))
+    from api.persistence.cosmos_tasks_lists_repository import (
+        CosmosTasksListsRepository,
+    )
+
+    if config.get("storage") == "memory":
+        tasks_lists_container, user_directories_container = in_memory_containers(config)
+    else:
+        from api.persistence.initialise_cosmos import (
+            tasks_lists_container,
+            user_directories_container,
+        )
+
+    return CosmosTasksListsRepository(
+        wrapped_container(
+            config, tasks_lists_container, TASKS_LISTS_PARTITION_KEY_PATH
+        ),
+        wrapped_container(
+            config, user_directories_container, USER_DIRECTORIES_PARTITION_KEY_PATH
+        ),
+    )
+
+
+def create_async_tasks_lists_repository(config: dict) -> AsyncTasksListsRepository:
+    if config.get("storage") == "sqlite":
+        return ThreadedTasksListsRepository(create_tasks_lists_repository(config))
+    from api.persistence.async_cosmos_tasks_lists_repository import (
+        AsyncCosmosTasksListsRepository,
+    )
+
+    if config.get("storage") == "memory":
+        from api.persistence.in_memory_cosmos import InMemoryAsyncContainer
+
+        return AsyncCosmosTasksListsRepository(
+            *[
+                InMemoryAsyncContainer(container)
+                for container in in_memory_containers(config)
+            ]
+        )
+    from api.persistence.initialise_async_cosmos import (
+        tasks_lists_container,
+        user_directories_container,
+    )
+
+    return AsyncCosmosTasksListsRepository(
+        tasks_lists_container, user_directories_container
+    )
@@ -0,0 +1,32 @@
+import threading
+import time
+from typing import Callable
+
+
+class RequestUnitBudget:
+
+    def __init__(
+        self,
+        ru_per_second: float,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.ru_per_second = ru_per_second
+        self.clock = clock
+        self.sleep = sleep
+        self.available = ru_per_second
+        self.last_refill = clock()
+        self.lock = threading.Lock()
+
+    def spend(self, charge: float):
+        with self.lock:
+            now = self.clock()
+            self.available = min(
+                self.ru_per_second,
+                self.available + (now - self.last_refill) * self.ru_per_second,
+            )
+            self.last_refill = now
+            self.available -= charge
+            wait = -self.available / self.ru_per_second if self.available < 0 else 0
+        if wait > 0:
+            self.sleep(wait)
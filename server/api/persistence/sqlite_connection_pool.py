@@ -0,0 +1,34 @@
+import queue
+import sqlite3
+from contextlib import contextmanager
+
+
+class SqliteConnectionPool:
+
+    def __init__(self, path: str, size: int = 8):
+        self.path = path
+        self.__connections = queue.Queue(maxsize=size)
+        for _ in range(size):
+            self.__connections.put(self.__connect())
+
+    @contextmanager
+    def connection(self):
+        connection = self.__connections.get()
+        try:
+            with connection:
+                yield connection
+        finally:
+            self.__connections.put(connection)
+
+    def close(self):
+        while not self.__connections.empty():
+            self.__connections.get_nowait().close()
+
+    def __connect(self):
+        connection = sqlite3.connect(self.path, check_same_thread=False)
+        connection.row_factory = sqlite3.Row
+        connection.execute("PRAGMA journal_mode = WAL")
+        connection.execute("PRAGMA synchronous = NORMAL")
+        connection.execute("PRAGMA foreign_keys = ON")
+        connection.execute("PRAGMA busy_timeout = 5000")
+        return connection
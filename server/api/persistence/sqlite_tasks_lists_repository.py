@@ -0,0 +1,211 @@
+import datetime
+import json
+import sqlite3
+
+from api.domain.tasks_list import TasksList
+from api.domain.tasks_list_summary import TasksListSummary
+from api.persistence.sqlite_connection_pool import SqliteConnectionPool
+from api.persistence.tasks_lists_repository import (
+    DuplicateTasksListNameError,
+    InvalidContinuationError,
+    StaleTasksListError,
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks_lists (
+    id TEXT PRIMARY KEY,
+    owner_email TEXT NOT NULL,
+    name TEXT NOT NULL,
+    document TEXT NOT NULL,
+    version INTEGER NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS tasks_lists_unique_owner_email_name
+    ON tasks_lists (owner_email, name);
+CREATE INDEX IF NOT EXISTS tasks_lists_owner_email_last_selected_time
+    ON tasks_lists (owner_email, json_extract(document, '$.last_selected_time') DESC);
+CREATE TABLE IF NOT EXISTS tasks_list_shares (
+    tasks_list_id TEXT NOT NULL REFERENCES tasks_lists (id) ON DELETE CASCADE,
+    email TEXT NOT NULL,
+    PRIMARY KEY (tasks_list_id, email)
+);
+CREATE INDEX IF NOT EXISTS tasks_list_shares_email
+    ON tasks_list_shares (email);
+"""
+
+
+class SqliteTasksListsRepository:
+
+    def __init__(self, pool: SqliteConnectionPool):
+        self.pool = pool
+        with self.pool.connection() as connection:
+            connection.executescript(SCHEMA)
+
+    def load(self, id: str, email: str) -> TasksList | None:
+        return self.__fetch_one(
+            """
+            SELECT document, version FROM tasks_lists
+            WHERE id = ? AND (
+                owner_email = ?
+                OR id IN (SELECT tasks_list_id FROM tasks_list_shares WHERE email = ?)
+            )
+            """,
+            (id, email, email),
+        )
+
+    def load_for_owner(self, id: str, owner_email: str) -> TasksList | None:
+        return self.__fetch_one(
+            "SELECT document, version FROM tasks_lists WHERE id = ? AND owner_email = ?",
+            (id, owner_email),
+        )
+
+    def load_by_name(self, name: str, owner_email: str) -> TasksList | None:
+        return self.__fetch_one(
+            "SELECT document, version FROM tasks_lists WHERE owner_email = ? AND name = ?",
+            (owner_email, name),
+        )
+
+    def list_for_user(self, email: str) -> list[TasksList]:
+        with self.pool.connection() as connection:
+            rows = connection.execute(
+                """
+                SELECT document, version FROM tasks_lists
+                WHERE owner_email = ?
+                OR id IN (SELECT tasks_list_id FROM tasks_list_shares WHERE email = ?)
+                ORDER BY rowid
+                """,
+                (email, email),
+            ).fetchall()
+        return [self.__to_domain(row) for row in rows]
+
+    def list_summaries_for_user(self, email: str) -> list[TasksListSummary]:
+        with self.pool.connection() as connection:
+            rows = connection.execute(
+                """
+                SELECT id, name, owner_email,
+                    json_extract(document, '$.last_selected_time') AS last_selected_time,
+                    json_extract(document, '$.shared_with') AS shared_with
+                FROM tasks_lists
+                WHERE owner_email = ?
+                OR id IN (SELECT tasks_list_id FROM tasks_list_shares WHERE email = ?)
+                ORDER BY rowid
+                """,
+                (email, email),
+            ).fetchall()
+        return [
+            TasksListSummary.from_dict(
+                {**dict(row), "shared_with": json.loads(row["shared_with"])}
+            )
+            for row in rows
+        ]
+
+    def list_page_for_user(
+        self, email: str, limit: int, continuation: str | None, summary: bool
+    ) -> tuple[list[TasksList | TasksListSummary], str | None]:
+        if continuation is not None and not continuation.isdigit():
+            raise InvalidContinuationError("Continuation token is not valid")
+        offset = int(continuation or 0)
+        with self.pool.connection() as connection:
+            rows = connection.execute(
+                """
+                SELECT document, version FROM tasks_lists
+                WHERE owner_email = ?
+                OR id IN (SELECT tasks_list_id FROM tasks_list_shares WHERE email = ?)
+                ORDER BY json_extract(document, '$.last_selected_time') DESC, id
+                LIMIT ? OFFSET ?
+                """,
+                (email, email, limit + 1, offset),
+            ).fetchall()
+        next_continuation = str(offset + limit) if len(rows) > limit else None
+        tasks_lists = [self.__to_domain(row) for row in rows[:limit]]
+        if summary:
+            return [
+                TasksListSummary.from_dict(tasks_list.to_dict())
+                for tasks_list in tasks_lists
+            ], next_continuation
+        return tasks_lists, next_continuation
+
+    def add(self, tasks_list: TasksList):
+        with self.pool.connection() as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            self.__execute_unique_name(
+                connection,
+                "INSERT INTO tasks_lists (id, owner_email, name, document, version) VALUES (?, ?, ?, ?, 1)",
+                (
+                    tasks_list.id,
+                    tasks_list.owner_email,
+                    tasks_list.name,
+                    json.dumps(tasks_list.to_dict()),
+                ),
+            )
+            self.__insert_shares(connection, tasks_list)
+        tasks_list.etag = "1"
+
+    def save(self, tasks_list: TasksList, original: dict):
+        with self.pool.connection() as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            updated = self.__execute_unique_name(
+                connection,
+                "UPDATE tasks_lists SET name = ?, document = ?, version = version + 1 WHERE id = ? AND version = ?",
+                (
+                    tasks_list.name,
+                    json.dumps(tasks_list.to_dict()),
+                    tasks_list.id,
+                    int(tasks_list.etag),
+                ),
+            )
+            if updated.rowcount == 0:
+                raise StaleTasksListError("Tasks list has changed since loaded")
+            if tasks_list.shared_with != original["shared_with"]:
+                connection.execute(
+                    "DELETE FROM tasks_list_shares WHERE tasks_list_id = ?",
+                    (tasks_list.id,),
+                )
+                self.__insert_shares(connection, tasks_list)
+        tasks_list.etag = str(int(tasks_list.etag) + 1)
+
+    def save_last_selected_time(
+        self, id: str, owner_email: str, last_selected_time: datetime.datetime
+    ):
+        with self.pool.connection() as connection:
+            connection.execute(
+                "UPDATE tasks_lists SET document = json_set(document, '$.last_selected_time', ?), version = version + 1 WHERE id = ? AND owner_email = ?",
+                (last_selected_time.isoformat(), id, owner_email),
+            )
+
+    def delete(self, tasks_list: TasksList):
+        with self.pool.connection() as connection:
+            deleted = connection.execute(
+                "DELETE FROM tasks_lists WHERE id = ? AND version = ?",
+                (tasks_list.id, int(tasks_list.etag)),
+            )
+            if deleted.rowcount == 0:
+                raise StaleTasksListError("Tasks list has changed since loaded")
+
+    def __fetch_one(self, query: str, parameters: tuple) -> TasksList | None:
+        with self.pool.connection() as connection:
+            row = connection.execute(query, parameters).fetchone()
+        if row is None:
+            return None
+        return self.__to_domain(row)
+
+    @staticmethod
+    def __execute_unique_name(connection, query: str, parameters: tuple):
+        try:
+            return connection.execute(query, parameters)
+        except sqlite3.IntegrityError as error:
+            raise DuplicateTasksListNameError(
+                "Tasks list with name already exists"
+            ) from error
+
+    @staticmethod
+    def __insert_shares(connection, tasks_list: TasksList):
+        connection.executemany(
+            "INSERT INTO tasks_list_shares (tasks_list_id, email) VALUES (?, ?)",
+            [(tasks_list.id, email) for email in tasks_list.shared_with],
+        )
+
+    @staticmethod
+    def __to_domain(row) -> TasksList:
+        tasks_list = TasksList.from_dict(json.loads(row["document"]))
+        tasks_list.etag = str(row["version"])
+        return tasks_list
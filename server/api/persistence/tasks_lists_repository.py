@@ -0,0 +1,94 @@
+import datetime
+from typing import Protocol
+
+from api.domain.tasks_list import TasksList
+from api.domain.tasks_list_summary import TasksListSummary
+
+
+class StaleTasksListError(Exception):
+    def __init__(self, message):
+        super().__init__(message)
+
+
+class DuplicateTasksListNameError(Exception):
+    def __init__(self, message):
+        super().__init__(message)
+
+
+class InvalidContinuationError(Exception):
+    def __init__(self, message):
+        super().__init__(message)
+
+
+class TasksListsRepository(Protocol):
+
+    def load(self, id: str, email: str) -> TasksList | None:
+        pass
+
+    def load_for_owner(self, id: str, owner_email: str) -> TasksList | None:
+        pass
+
+    def load_by_name(self, name: str, owner_email: str) -> TasksList | None:
+        pass
+
+    def list_for_user(self, email: str) -> list[TasksList]:
+        pass
+
+    def list_summaries_for_user(self, email: str) -> list[TasksListSummary]:
+        pass
+
+    def list_page_for_user(
+        self, email: str, limit: int, continuation: str | None, summary: bool
+    ) -> tuple[list[TasksList | TasksListSummary], str | None]:
+        pass
+
+    def add(self, tasks_list: TasksList):
+        pass
+
+    def save(self, tasks_list: TasksList, original: dict):
+        pass
+
+    def save_last_selected_time(
+        self, id: str, owner_email: str, last_selected_time: datetime.datetime
+    ):
+        pass
+
+    def delete(self, tasks_list: TasksList):
+        pass
+
+
+class AsyncTasksListsRepository(Protocol):
+
+    async def load(self, id: str, email: str) -> TasksList | None:
+        pass
+
+    async def load_for_owner(self, id: str, owner_email: str) -> TasksList | None:
+        pass
+
+    async def load_by_name(self, name: str, owner_email: str) -> TasksList | None:
+        pass
+
+    async def list_for_user(self, email: str) -> list[TasksList]:
+        pass
+
+    async def list_summaries_for_user(self, email: str) -> list[TasksListSummary]:
+        pass
+
+    async def list_page_for_user(
+        self, email: str, limit: int, continuation: str | None, summary: bool
+    ) -> tuple[list[TasksList | TasksListSummary], str | None]:
+        pass
+
+    async def add(self, tasks_list: TasksList):
+        pass
+
+    async def save(self, tasks_list: TasksList, original: dict):
+        pass
+
+    async def save_last_selected_time(
+        self, id: str, owner_email: str, last_selected_time: datetime.datetime
+    ):
+        pass
+
+    async def delete(self, tasks_list: TasksList):
+        pass
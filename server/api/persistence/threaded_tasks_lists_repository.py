@@ -0,0 +1,53 @@
+import asyncio
+import datetime
+
+from api.domain.tasks_list import TasksList
+from api.domain.tasks_list_summary import TasksListSummary
+from api.persistence.tasks_lists_repository import TasksListsRepository
+
+
+class ThreadedTasksListsRepository:
+
+    def __init__(self, repository: TasksListsRepository):
+        self.repository = repository
+
+    async def load(self, id: str, email: str) -> TasksList | None:
+        return await asyncio.to_thread(self.repository.load, id, email)
+
+    async def load_for_owner(self, id: str, owner_email: str) -> TasksList | None:
+        return await asyncio.to_thread(self.repository.load_for_owner, id, owner_email)
+
+    async def load_by_name(self, name: str, owner_email: str) -> TasksList | None:
+        return await asyncio.to_thread(self.repository.load_by_name, name, owner_email)
+
+    async def list_for_user(self, email: str) -> list[TasksList]:
+        return await asyncio.to_thread(self.repository.list_for_user, email)
+
+    async def list_summaries_for_user(self, email: str) -> list[TasksListSummary]:
+        return await asyncio.to_thread(self.repository.list_summaries_for_user, email)
+
+    async def list_page_for_user(
+        self, email: str, limit: int, continuation: str | None, summary: bool
+    ) -> tuple[list[TasksList | TasksListSummary], str | None]:
+        return await asyncio.to_thread(
+            self.repository.list_page_for_user, email, limit, continuation, summary
+        )
+
+    async def add(self, tasks_list: TasksList):
+        await asyncio.to_thread(self.repository.add, tasks_list)
+
+    async def save(self, tasks_list: TasksList, original: dict):
+        await asyncio.to_thread(self.repository.save, tasks_list, original)
+
+    async def save_last_selected_time(
+        self, id: str, owner_email: str, last_selected_time: datetime.datetime
+    ):
+        await asyncio.to_thread(
+            self.repository.save_last_selected_time,
+            id,
+            owner_email,
+            last_selected_time,
+        )
+
+    async def delete(self, tasks_list: TasksList):
+        await asyncio.to_thread(self.repository.delete, tasks_list)
@@ -0,0 +1,304 @@
+import logging
+import threading
+import time
+from typing import Any, Callable
+
+from azure.cosmos import ContainerProxy
+from azure.cosmos.exceptions import CosmosHttpResponseError
+from tenacity import (
+    Retrying,
+    retry_if_exception,
+    stop_after_delay,
+    wait_random_exponential,
+)
+
+from api.application.service_busy_exception import ServiceBusyException
+from api.persistence.request_unit_budget import RequestUnitBudget
+
+TOO_MANY_REQUESTS = 429
+CROSS_PARTITION = "*"
+MAX_PARTITIONS = 10000
+
+logger = logging.getLogger(__name__)
+
+
+def is_throttled(error: BaseException) -> bool:
+    return (
+        isinstance(error, CosmosHttpResponseError)
+        and error.status_code == TOO_MANY_REQUESTS
+    )
+
+
+def retry_after_seconds(error: BaseException) -> float:
+    headers = getattr(error, "headers", None) or {}
+    return float(headers.get("x-ms-retry-after-ms", 0)) / 1000
+
+
+class RequestCharge:
+
+    def __init__(self):
+        self.charge = 0.0
+
+    # The SDK passes each call's own response headers, unlike the shared client_connection
+    def __call__(self, headers, result):
+        self.charge = float((headers or {}).get("x-ms-request-charge", 0))
+
+    def take(self) -> float:
+        charge, self.charge = self.charge, 0.0
+        return charge
+
+
+class ThrottleMetrics:
+
+    def __init__(self):
+        self.__lock = threading.Lock()
+        self.throttled = 0
+        self.retries = 0
+        self.exhausted = 0
+        self.retry_wait_seconds = 0.0
+
+    def record_throttled(self, partition_key: str, wait_seconds: float):
+        with self.__lock:
+            self.throttled += 1
+            self.retries += 1
+            self.retry_wait_seconds += wait_seconds
+        logger.info(
+            "Cosmos throttled partition %s, retrying in %.3f s",
+            partition_key,
+            wait_seconds,
+        )
+
+    def record_exhausted(self, partition_key: str):
+        with self.__lock:
+            self.exhausted += 1
+        logger.warning("Gave up on throttled Cosmos partition %s", partition_key)
+
+    def to_dict(self):
+        with self.__lock:
+            return {
+                "throttled": self.throttled,
+                "retries": self.retries,
+                "exhausted": self.exhausted,
+                "retry_wait_seconds": self.retry_wait_seconds,
+            }
+
+
+throttle_metrics = ThrottleMetrics()
+
+
+class PartitionRateLimiter:
+
+    def __init__(
+        self,
+        ru_per_second: float,
+        minimum_ru_per_second: float = 10,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.ru_per_second = ru_per_second
+        self.minimum_ru_per_second = minimum_ru_per_second
+        self.clock = clock
+        self.sleep = sleep
+        self.lock = threading.Lock()
+        self.budgets: dict[str, RequestUnitBudget] = {}
+
+    def budget(self, partition_key: str) -> RequestUnitBudget:
+        with self.lock:
+            budget = self.budgets.get(partition_key)
+            if budget is None:
+                if len(self.budgets) >= MAX_PARTITIONS:
+                    del self.budgets[next(iter(self.budgets))]
+                budget = RequestUnitBudget(self.ru_per_second, self.clock, self.sleep)
+                self.budgets[partition_key] = budget
+            return budget
+
+    def spend(self, partition_key: str, charge: float):
+        self.budget(partition_key).spend(charge)
+
+    # Halve the rate on throttling and win it back gradually, like TCP congestion control
+    def throttled(self, partition_key: str):
+        budget = self.budget(partition_key)
+        with budget.lock:
+            budget.ru_per_second = max(
+                self.minimum_ru_per_second, budget.ru_per_second / 2
+            )
+
+    def succeeded(self, partition_key: str):
+        budget = self.budget(partition_key)
+        with budget.lock:
+            budget.ru_per_second = min(
+                self.ru_per_second, budget.ru_per_second + self.ru_per_second / 10
+            )
+
+
+class ThrottledPages:
+
+    def __init__(
+        self,
+        container: "ThrottledContainer",
+        pages,
+        partition_key: str,
+        charge: RequestCharge,
+    ):
+        self.container = container
+        self.pages = pages
+        self.partition_key = partition_key
+        self.charge = charge
+
+    @property
+    def continuation_token(self):
+        return self.pages.continuation_token
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return self.container.call(
+            self.partition_key, lambda _: iter(list(next(self.pages))), self.charge
+        )
+
+
+class ThrottledQuery:
+
+    def __init__(
+        self,
+        container: "ThrottledContainer",
+        paged,
+        partition_key: str,
+        charge: RequestCharge,
+    ):
+        self.container = container
+        self.paged = paged
+        self.partition_key = partition_key
+        self.charge = charge
+
+    def by_page(self, continuation_token=None):
+        return ThrottledPages(
+            self.container,
+            self.paged.by_page(continuation_token),
+            self.partition_key,
+            self.charge,
+        )
+
+    def __iter__(self):
+        for page in self.by_page():
+            yield from page
+
+
+class ThrottledContainer:
+
+    def __init__(
+        self,
+        container: ContainerProxy,
+        partition_key_path: str,
+        limiter: PartitionRateLimiter,
+        metrics: ThrottleMetrics,
+        budget_seconds: float = 10,
+    ):
+        self.container = container
+        self.partition_key_property = partition_key_path.lstrip("/")
+        self.limiter = limiter
+        self.metrics = metrics
+        self.budget_seconds = budget_seconds
+        self.backoff = wait_random_exponential(multiplier=0.05, max=2)
+
+    def read_item(self, item, partition_key, **kwargs):
+        return self.call(
+            partition_key,
+            lambda charge: self.container.read_item(
+                item, partition_key, response_hook=charge, **kwargs
+            ),
+        )
+
+    def patch_item(self, item, partition_key, patch_operations, **kwargs):
+        return self.call(
+            partition_key,
+            lambda charge: self.container.patch_item(
+                item, partition_key, patch_operations, response_hook=charge, **kwargs
+            ),
+        )
+
+    def delete_item(self, item, partition_key, **kwargs):
+        return self.call(
+            partition_key,
+            lambda charge: self.container.delete_item(
+                item, partition_key, response_hook=charge, **kwargs
+            ),
+        )
+
+    def create_item(self, body, **kwargs):
+        return self.call(
+            body[self.partition_key_property],
+            lambda charge: self.container.create_item(
+                body, response_hook=charge, **kwargs
+            ),
+        )
+
+    def upsert_item(self, body, **kwargs):
+        return self.call(
+            body[self.partition_key_property],
+            lambda charge: self.container.upsert_item(
+                body, response_hook=charge, **kwargs
+            ),
+        )
+
+    def replace_item(self, item, body, **kwargs):
+        return self.call(
+            body[self.partition_key_property],
+            lambda charge: self.container.replace_item(
+                item, body, response_hook=charge, **kwargs
+            ),
+        )
+
+    def query_items(self, *args, **kwargs):
+        charge = RequestCharge()
+        return ThrottledQuery(
+            self,
+            self.container.query_items(*args, response_hook=charge, **kwargs),
+            kwargs.get("partition_key", CROSS_PARTITION),
+            charge,
+        )
+
+    def __getattr__(self, name):
+        return getattr(self.container, name)
+
+    def call(
+        self,
+        partition_key,
+        action: Callable[[RequestCharge], Any],
+        charge: RequestCharge | None = None,
+    ):
+        partition_key = str(partition_key)
+        charge = charge if charge is not None else RequestCharge()
+        retrying = Retrying(
+            retry=retry_if_exception(is_throttled),
+            wait=self.__wait,
+            stop=stop_after_delay(self.budget_seconds),
+            sleep=self.limiter.sleep,
+            before_sleep=lambda retry_state: self.__throttled(
+                partition_key, retry_state
+            ),
+            reraise=True,
+        )
+        try:
+            result = retrying(action, charge)
+        except CosmosHttpResponseError as error:
+            if not is_throttled(error):
+                raise
+            self.metrics.record_exhausted(partition_key)
+            raise ServiceBusyException(
+                "Too many requests, try again shortly"
+            ) from error
+        self.limiter.succeeded(partition_key)
+        self.limiter.spend(partition_key, charge.take())
+        return result
+
+    def __wait(self, retry_state) -> float:
+        return max(
+            retry_after_seconds(retry_state.outcome.exception()),
+            self.backoff(retry_state),
+        )
+
+    def __throttled(self, partition_key: str, retry_state):
+        self.limiter.throttled(partition_key)
+        self.metrics.record_throttled(partition_key, retry_state.upcoming_sleep)
@@ -0,0 +1,131 @@
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+
+from api.application.tasks_list_service import TasksListService
+from api.handlers.jwks_key_store import JwksKeyStore
+
+logger = logging.getLogger(__name__)
+
+
+class WarmStartSnapshot:
+
+    def __init__(self, path: str, max_age_seconds: float = 24 * 60 * 60):
+        self.path = path
+        self.max_age_seconds = max_age_seconds
+
+    # only ids and owners are written, never the contents of anyone's tasks lists
+    def save(self, jwks: dict | None, tasks_lists: list[dict]):
+        snapshot = {
+            "written_at": time.time(),
+            "jwks": jwks,
+            "tasks_lists": [
+                {"id": tasks_list["id"], "owner_email": tasks_list["owner_email"]}
+                for tasks_list in tasks_lists
+            ],
+        }
+        temporary_path = self.path + ".tmp"
+        with open(temporary_path, "w") as file:
+            json.dump(snapshot, file)
+        os.replace(temporary_path, self.path)
+
+    def load(self) -> dict | None:
+        if not os.path.exists(self.path):
+            return None
+        try:
+            with open(self.path) as file:
+                snapshot = json.load(file)
+            written_at = float(snapshot["written_at"])
+        except Exception:
+            logger.warning("Ignoring unreadable warm start snapshot %s", self.path)
+            return None
+        if time.time() - written_at > self.max_age_seconds:
+            return None
+        return snapshot
+
+
+class WarmStarter:
+
+    def __init__(
+        self,
+        snapshot: WarmStartSnapshot,
+        key_store: JwksKeyStore,
+        tasks_list_service: TasksListService,
+        interval_seconds: float = 60,
+        hot_tasks_lists: int = 100,
+    ):
+        self.snapshot = snapshot
+        self.key_store = key_store
+        self.tasks_list_service = tasks_list_service
+        self.interval_seconds = interval_seconds
+        self.hot_tasks_lists = hot_tasks_lists
+        self.stopping = threading.Event()
+        self.thread: threading.Thread | None = None
+        self.reloading: threading.Thread | None = None
+
+    # keys are served straight away while they are fetched again, tasks lists are
+    # read afresh in the background and only then cached
+    def restore(self) -> bool:
+        snapshot = self.snapshot.load()
+        if snapshot is None:
+            return False
+        if snapshot["jwks"] is not None:
+            self.key_store.update(snapshot["jwks"])
+            self.key_store.refresh_in_background()
+        self.reloading = threading.Thread(
+            target=self.reload,
+            args=(snapshot["tasks_lists"],),
+            name="warm-start-reload",
+            daemon=True,
+        )
+        self.reloading.start()
+        return True
+
+    def reload(self, tasks_lists: list[dict]):
+        for tasks_list in tasks_lists:
+            try:
+                self.tasks_list_service.get_by_id_for_owner(
+                    tasks_list["id"], tasks_list["owner_email"]
+                )
+                self.tasks_list_service.get_by_id(
+                    tasks_list["id"], tasks_list["owner_email"]
+                )
+            except Exception:
+                logger.warning(
+                    "Could not reload tasks list %s",
+                    tasks_list.get("id"),
+                    exc_info=True,
+                )
+
+    def capture(self):
+        self.snapshot.save(
+            self.key_store.jwks,
+            self.tasks_list_service.read_counts.hottest(self.hot_tasks_lists),
+        )
+
+    def run(self):
+        while not self.stopping.wait(self.interval_seconds):
+            self.__capture_logging_errors()
+
+    def start(self):
+        atexit.register(self.__capture_logging_errors)
+        self.stopping.clear()
+        self.thread = threading.Thread(
+            target=self.run, name="warm-start-snapshot", daemon=True
+        )
+        self.thread.start()
+
+    def stop(self):
+        self.stopping.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+    def __capture_logging_errors(self):
+        try:
+            self.capture()
+        except Exception:
+            logger.exception("Could not write warm start snapshot")
@@ -0,0 +1,109 @@
+import asyncio
+import importlib
+import logging
+import time
+from typing import Awaitable, Callable
+
+from api.handlers.jwks_key_store import JwksKeyStore
+
+KEEP_ALIVE_ID = "keep-alive"
+
+logger = logging.getLogger(__name__)
+
+# modules the first request would otherwise import while it is being served
+WARMUP_MODULES = [
+    "azure.cosmos._execution_context.execution_dispatcher",
+    "azure.core.pipeline.transport._requests_basic",
+    "jose.backends.cryptography_backend",
+    "api.persistence.converters",
+    "api.persistence.patch_operations",
+]
+
+
+def timed(step: str, action: Callable[[], object]) -> dict:
+    started = time.perf_counter()
+    try:
+        action()
+        return succeeded(step, started)
+    except Exception as error:
+        return failed(step, started, error)
+
+
+async def timed_async(step: str, action: Callable[[], Awaitable]) -> dict:
+    started = time.perf_counter()
+    try:
+        await action()
+        return succeeded(step, started)
+    except Exception as error:
+        return failed(step, started, error)
+
+
+def succeeded(step: str, started: float) -> dict:
+    return {"step": step, "milliseconds": milliseconds_since(started), "ok": True}
+
+
+# the report is served without authorisation, so the error itself is only logged
+def failed(step: str, started: float, error: Exception) -> dict:
+    logger.warning("Warmup step %s failed", step, exc_info=error)
+    return {"step": step, "milliseconds": milliseconds_since(started), "ok": False}
+
+
+def milliseconds_since(started: float) -> float:
+    return round((time.perf_counter() - started) * 1000, 3)
+
+
+class Warmup:
+
+    def __init__(
+        self,
+        tasks_list_service,
+        key_store: JwksKeyStore,
+        modules: list[str] | None = None,
+    ):
+        self.tasks_list_service = tasks_list_service
+        self.key_store = key_store
+        self.modules = modules if modules is not None else WARMUP_MODULES
+
+    def run(self) -> dict:
+        started = time.perf_counter()
+        return self.__report(
+            started,
+            [
+                timed(
+                    "cosmos",
+                    lambda: self.tasks_list_service.repository.load_for_owner(
+                        KEEP_ALIVE_ID, KEEP_ALIVE_ID
+                    ),
+                ),
+                timed("jwks", self.key_store.load),
+                timed("imports", self.import_modules),
+            ],
+        )
+
+    async def run_async(self) -> dict:
+        started = time.perf_counter()
+        return self.__report(
+            started,
+            [
+                await timed_async(
+                    "cosmos",
+                    lambda: self.tasks_list_service.repository.load_for_owner(
+                        KEEP_ALIVE_ID, KEEP_ALIVE_ID
+                    ),
+                ),
+                await asyncio.to_thread(timed, "jwks", self.key_store.load),
+                await asyncio.to_thread(timed, "imports", self.import_modules),
+            ],
+        )
+
+    def import_modules(self):
+        for module in self.modules:
+            importlib.import_module(module)
+
+    @staticmethod
+    def __report(started: float, steps: list[dict]) -> dict:
+        return {
+            "ok": all(step["ok"] for step in steps),
+            "milliseconds": milliseconds_since(started),
+            "steps": steps,
+        }
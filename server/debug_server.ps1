@@ -1,4 +1,4 @@
 uv sync
 .\.venv\Scripts\Activate.ps1
-api/persistence/initialise_cosmos.py
+python -m api.persistence.provision_cosmos
 flask --app api/__init__.py run --debug
\ No newline at end of file
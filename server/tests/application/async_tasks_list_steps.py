@@ -0,0 +1,217 @@
+import asyncio
+
+import pytest
+from api.application.async_tasks_list_service import AsyncTasksListService
+from api.application.invalidation_bus import InvalidationBus, LoopbackTransport
+from api.application.tasks_list_cache import TasksListCache
+from api.persistence.async_cosmos_tasks_lists_repository import (
+    AsyncCosmosTasksListsRepository,
+)
+from api.domain.tasks_list import TasksList
+from api.domain.tasks_list_summary import TasksListSummary
+from tests.asynchronous import run
+from tests.database import (
+    setup_db,
+    get_async_db_connection,
+    get_async_directories_db_connection,
+    clear_db,
+)
+
+tasks_list_service: AsyncTasksListService | None = None
+other_instance: AsyncTasksListService | None = None
+tasks_list: TasksList | None = None
+tasks_lists: list[TasksList] = []
+summaries: list[TasksListSummary] = []
+continuation: str | None = None
+read_tasks_lists: list[TasksList | None] = []
+owner_email = "wibble@wobble.com"
+another_owner_email = "wabble@wubble.com"
+
+
+@pytest.fixture(autouse=True)
+def setup_and_teardown():
+    global tasks_list_service, read_tasks_lists
+    setup_db()
+    tasks_list_service = a_service()
+    read_tasks_lists = []
+    yield
+    tasks_list_service.last_selected_times.flush()
+    clear_db()
+
+
+def a_service(**kwargs) -> AsyncTasksListService:
+    return AsyncTasksListService(
+        AsyncCosmosTasksListsRepository(
+            get_async_db_connection(), get_async_directories_db_connection()
+        ),
+        **kwargs,
+    )
+
+
+def a_service_caching_tasks_lists():
+    global tasks_list_service
+    tasks_list_service = a_service(tasks_list_cache=TasksListCache(100, 60, 60))
+
+
+def a_service_buffering_last_selected_times():
+    global tasks_list_service
+    tasks_list_service = a_service(last_selected_time_flush_seconds=60)
+
+
+def reading_the_tasks_list_around_a_write():
+    async def read():
+        for _ in range(2):
+            read_tasks_lists.append(
+                await tasks_list_service.get_by_id(tasks_list.id, owner_email)
+            )
+        await tasks_list_service.add_task(tasks_list.id, owner_email, "My Task")
+        read_tasks_lists.append(
+            await tasks_list_service.get_by_id(tasks_list.id, owner_email)
+        )
+
+    run(read())
+
+
+def a_caching_service_on_another_instance_sharing_a_bus():
+    global tasks_list_service, other_instance
+    transport = LoopbackTransport()
+    tasks_list_service = a_service(
+        tasks_list_cache=TasksListCache(100, 60, 60),
+        invalidation_bus=InvalidationBus(transport),
+    )
+    other_instance = a_service(
+        tasks_list_cache=TasksListCache(100, 60, 60),
+        invalidation_bus=InvalidationBus(transport),
+    )
+
+
+def the_other_instance_renaming_the_tasks_list_after_it_is_cached():
+    run(tasks_list_service.get_by_id(tasks_list.id, owner_email))
+    run(other_instance.update(tasks_list.id, owner_email, "My Renamed Tasks List"))
+
+
+def updating_last_selected_time_repeatedly():
+    async def select():
+        for _ in range(3):
+            await tasks_list_service.update_last_selected_time(
+                tasks_list.id, owner_email
+            )
+
+    run(select())
+
+
+def flushing_last_selected_times():
+    run(asyncio.to_thread(tasks_list_service.last_selected_times.flush))
+
+
+def an_existing_tasks_list():
+    global tasks_list
+    tasks_list = run(tasks_list_service.add("My Tasks List", owner_email))
+
+
+def a_shared_tasks_list():
+    an_existing_tasks_list()
+    run(tasks_list_service.share(tasks_list.id, owner_email, another_owner_email))
+
+
+def an_unshared_tasks_list():
+    a_shared_tasks_list()
+    run(tasks_list_service.unshare(tasks_list.id, owner_email, another_owner_email))
+
+
+def adding_tasks_concurrently():
+    async def add_tasks():
+        await asyncio.gather(
+            tasks_list_service.add_task(tasks_list.id, owner_email, "First Task"),
+            tasks_list_service.add_task(tasks_list.id, owner_email, "Second Task"),
+        )
+
+    run(add_tasks())
+
+
+def deleting_the_tasks_list():
+    run(tasks_list_service.delete(tasks_list.id, owner_email))
+
+
+def getting_all_tasks_lists():
+    global tasks_lists
+    tasks_lists = run(tasks_list_service.get_all(owner_email))
+
+
+def getting_all_tasks_lists_for_a_sharer():
+    global tasks_lists
+    tasks_lists = run(tasks_list_service.get_all(another_owner_email))
+
+
+def getting_all_tasks_list_summaries_for_a_sharer():
+    global summaries
+    summaries = run(tasks_list_service.get_all_summaries(another_owner_email))
+
+
+def the_tasks_list_summary_is_listed():
+    assert [summary.id for summary in summaries] == [tasks_list.id]
+    assert summaries[0].shared_with == [another_owner_email]
+
+
+def getting_pages_of_one_tasks_list():
+    global tasks_lists, continuation
+    tasks_lists, continuation = run(tasks_list_service.get_page(owner_email, "1", None))
+    next_page, continuation = run(
+        tasks_list_service.get_page(owner_email, "1", continuation)
+    )
+    tasks_lists += next_page
+
+
+def another_existing_tasks_list():
+    run(tasks_list_service.add("Another Tasks List", owner_email))
+
+
+def both_tasks_lists_are_paged_through():
+    assert len(tasks_lists) == 2
+    assert continuation is None
+
+
+def the_tasks_list_is_listed():
+    assert len(tasks_lists) == 1
+    assert tasks_lists[0].id == tasks_list.id
+    assert tasks_lists[0].name == "My Tasks List"
+
+
+def there_are_no_tasks_lists():
+    assert tasks_lists == []
+
+
+def both_tasks_are_kept():
+    the_tasks_list = run(tasks_list_service.get_by_id(tasks_list.id, owner_email))
+    assert sorted(task.content for task in the_tasks_list.tasks) == [
+        "First Task",
+        "Second Task",
+    ]
+
+
+def the_tasks_list_is_read_from_the_cache_until_it_is_written():
+    cache = tasks_list_service.tasks_list_cache
+    assert (cache.hits, cache.misses) == (4, 0)
+    assert [len(the_tasks_list.tasks) for the_tasks_list in read_tasks_lists] == [
+        0,
+        0,
+        1,
+    ]
+
+
+def the_renamed_tasks_list_is_read():
+    the_tasks_list = run(tasks_list_service.get_by_id(tasks_list.id, owner_email))
+    assert the_tasks_list.name == "My Renamed Tasks List"
+
+
+def the_last_selected_time_is_visible_before_it_is_written():
+    assert tasks_list_service.last_selected_times.writes == 0
+    the_tasks_list = run(tasks_list_service.get_by_id(tasks_list.id, owner_email))
+    assert the_tasks_list.last_selected_time is not None
+
+
+def the_last_selected_time_is_written_once():
+    assert tasks_list_service.last_selected_times.writes == 1
+    tasks_list_service.tasks_list_cache.invalidate(tasks_list.id)
+    the_tasks_list = run(tasks_list_service.get_by_id(tasks_list.id, owner_email))
+    assert the_tasks_list.last_selected_time is not None
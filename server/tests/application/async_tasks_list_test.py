@@ -0,0 +1,75 @@
+from tests.specification import *
+from tests.application.async_tasks_list_steps import *
+
+
+def test_get_all_tasks_lists():
+    Given(an_existing_tasks_list)
+    When(getting_all_tasks_lists)
+    Then(the_tasks_list_is_listed)
+
+
+def test_page_through_tasks_lists():
+    Given(an_existing_tasks_list)
+    And(another_existing_tasks_list)
+    When(getting_pages_of_one_tasks_list)
+    Then(both_tasks_lists_are_paged_through)
+
+
+def test_sharer_can_get_a_shared_tasks_list():
+    Given(a_shared_tasks_list)
+    When(getting_all_tasks_lists_for_a_sharer)
+    Then(the_tasks_list_is_listed)
+
+
+def test_sharer_can_get_a_shared_tasks_list_summary():
+    Given(a_shared_tasks_list)
+    When(getting_all_tasks_list_summaries_for_a_sharer)
+    Then(the_tasks_list_summary_is_listed)
+
+
+def test_sharer_cannot_get_an_unshared_tasks_list():
+    Given(an_unshared_tasks_list)
+    When(getting_all_tasks_lists_for_a_sharer)
+    Then(there_are_no_tasks_lists)
+
+
+def test_deleted_tasks_list_is_not_listed():
+    Given(an_existing_tasks_list)
+    And(deleting_the_tasks_list)
+    When(getting_all_tasks_lists)
+    Then(there_are_no_tasks_lists)
+
+
+def test_concurrent_task_additions_are_both_kept():
+    Given(an_existing_tasks_list)
+    When(adding_tasks_concurrently)
+    Then(both_tasks_are_kept)
+
+
+def test_cached_tasks_lists_are_read_from_memory_until_written():
+    Given(a_service_caching_tasks_lists)
+    And(an_existing_tasks_list)
+    When(reading_the_tasks_list_around_a_write)
+    Then(the_tasks_list_is_read_from_the_cache_until_it_is_written)
+
+
+def test_writes_on_another_instance_evict_cached_tasks_lists():
+    Given(a_caching_service_on_another_instance_sharing_a_bus)
+    And(an_existing_tasks_list)
+    When(the_other_instance_renaming_the_tasks_list_after_it_is_cached)
+    Then(the_renamed_tasks_list_is_read)
+
+
+def test_last_selected_times_are_buffered_but_visible():
+    Given(a_service_buffering_last_selected_times)
+    And(an_existing_tasks_list)
+    When(updating_last_selected_time_repeatedly)
+    Then(the_last_selected_time_is_visible_before_it_is_written)
+
+
+def test_buffered_last_selected_times_are_written_once():
+    Given(a_service_buffering_last_selected_times)
+    And(an_existing_tasks_list)
+    And(updating_last_selected_time_repeatedly)
+    When(flushing_last_selected_times)
+    Then(the_last_selected_time_is_written_once)
@@ -0,0 +1,84 @@
+import pytest
+
+from api.application.invalidation_bus import InvalidationBus, LoopbackTransport
+from api.application.tasks_list_cache import TasksListCache
+from api.application.tasks_list_service import TasksListService
+from api.domain.tasks_list import TasksList
+from api.persistence.cosmos_tasks_lists_repository import CosmosTasksListsRepository
+from tests.database import (
+    setup_db,
+    get_db_connection,
+    get_directories_db_connection,
+    clear_db,
+)
+
+owner_email = "wibble@wobble.com"
+sharer_email = "jackie@chan.com"
+transport: LoopbackTransport | None = None
+instances: list[TasksListService] = []
+tasks_list: TasksList | None = None
+
+
+@pytest.fixture(autouse=True)
+def setup_and_teardown():
+    global transport, instances, tasks_list
+    setup_db()
+    transport = LoopbackTransport()
+    instances = []
+    tasks_list = None
+    yield
+    clear_db()
+
+
+def two_instances_caching_tasks_lists():
+    for _ in range(2):
+        instances.append(
+            TasksListService(
+                CosmosTasksListsRepository(
+                    get_db_connection(), get_directories_db_connection()
+                ),
+                tasks_list_cache=TasksListCache(100, 60, 60),
+                invalidation_bus=InvalidationBus(transport),
+            )
+        )
+
+
+def a_shared_tasks_list_read_on_both_instances():
+    global tasks_list
+    tasks_list = instances[0].add("My Tasks List", owner_email)
+    instances[0].share(tasks_list.id, owner_email, sharer_email)
+    for instance in instances:
+        instance.get_by_id(tasks_list.id, sharer_email)
+
+
+def renaming_it_on_the_first_instance():
+    instances[0].update(tasks_list.id, owner_email, "My Renamed Tasks List")
+
+
+def unsharing_it_on_the_first_instance():
+    instances[0].unshare(tasks_list.id, owner_email, sharer_email)
+
+
+def deleting_it_on_the_first_instance():
+    instances[0].delete(tasks_list.id, owner_email)
+
+
+def the_second_instance_reads_the_new_name():
+    assert (
+        instances[1].get_by_id(tasks_list.id, sharer_email).name
+        == "My Renamed Tasks List"
+    )
+
+
+def the_first_instance_still_serves_it_from_its_cache():
+    misses = instances[0].tasks_list_cache.misses
+    instances[0].get_by_id(tasks_list.id, sharer_email)
+    assert instances[0].tasks_list_cache.misses == misses
+
+
+def the_sharer_can_no_longer_read_it_on_the_second_instance():
+    assert instances[1].get_by_id(tasks_list.id, sharer_email) is None
+
+
+def the_second_instance_no_longer_finds_it():
+    assert instances[1].get_by_id_for_owner(tasks_list.id, owner_email) is None
@@ -0,0 +1,24 @@
+from tests.specification import *
+from tests.application.invalidation_bus_steps import *
+
+
+def test_updates_evict_other_instances_cached_tasks_lists():
+    Given(two_instances_caching_tasks_lists)
+    And(a_shared_tasks_list_read_on_both_instances)
+    When(renaming_it_on_the_first_instance)
+    Then(the_second_instance_reads_the_new_name)
+    And(the_first_instance_still_serves_it_from_its_cache)
+
+
+def test_unsharing_evicts_other_instances_cached_tasks_lists():
+    Given(two_instances_caching_tasks_lists)
+    And(a_shared_tasks_list_read_on_both_instances)
+    When(unsharing_it_on_the_first_instance)
+    Then(the_sharer_can_no_longer_read_it_on_the_second_instance)
+
+
+def test_deleting_evicts_other_instances_cached_tasks_lists():
+    Given(two_instances_caching_tasks_lists)
+    And(a_shared_tasks_list_read_on_both_instances)
+    When(deleting_it_on_the_first_instance)
+    Then(the_second_instance_no_longer_finds_it)
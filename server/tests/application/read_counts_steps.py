@@ -0,0 +1,44 @@
+import pytest
+
+from api.application.read_counts import ReadCounts
+from api.domain.tasks_list import TasksList
+
+owner_email = "wibble@wobble.com"
+read_counts: ReadCounts | None = None
+tasks_lists: list[TasksList] = []
+
+
+@pytest.fixture(autouse=True)
+def setup_and_teardown():
+    global read_counts, tasks_lists
+    read_counts = ReadCounts(max_size=4)
+    tasks_lists = [TasksList(f"Tasks List {index}", owner_email) for index in range(6)]
+    yield
+
+
+def reading_tasks_lists_different_numbers_of_times():
+    for times, tasks_list in zip([1, 3, 2], tasks_lists):
+        for _ in range(times):
+            read_counts.record(tasks_list)
+    read_counts.record(None)
+
+
+def reading_more_tasks_lists_than_are_counted():
+    for _ in range(5):
+        read_counts.record(tasks_lists[0])
+    for tasks_list in tasks_lists[1:]:
+        read_counts.record(tasks_list)
+
+
+def the_most_read_come_first():
+    assert read_counts.hottest(2) == [
+        {"id": tasks_lists[1].id, "owner_email": owner_email},
+        {"id": tasks_lists[2].id, "owner_email": owner_email},
+    ]
+
+
+def the_counts_stay_bounded_and_keep_the_busiest():
+    assert len(read_counts) <= 4
+    assert read_counts.hottest(1) == [
+        {"id": tasks_lists[0].id, "owner_email": owner_email}
+    ]
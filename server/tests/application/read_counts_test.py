@@ -0,0 +1,12 @@
+from tests.specification import *
+from tests.application.read_counts_steps import *
+
+
+def test_ranks_tasks_lists_by_reads():
+    When(reading_tasks_lists_different_numbers_of_times)
+    Then(the_most_read_come_first)
+
+
+def test_forgets_the_least_read_tasks_lists_when_full():
+    When(reading_more_tasks_lists_than_are_counted)
+    Then(the_counts_stay_bounded_and_keep_the_busiest)
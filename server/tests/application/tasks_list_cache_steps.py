@@ -0,0 +1,63 @@
+import pytest
+
+from api.application.tasks_list_cache import MEMBER_ACCESS, TasksListCache
+from api.domain.tasks_list import TasksList
+
+cache: TasksListCache | None = None
+loads: list[str] = []
+owner_email = "wibble@wobble.com"
+
+
+@pytest.fixture(autouse=True)
+def setup_and_teardown():
+    global cache, loads
+    cache = None
+    loads = []
+    yield
+
+
+def a_cache_holding_two_tasks_lists():
+    global cache
+    cache = TasksListCache(2, 60, 60)
+
+
+def a_cache_that_expires_immediately():
+    global cache
+    cache = TasksListCache(2, 0, 0)
+
+
+def load(id: str):
+    loads.append(id)
+    return TasksList(id, owner_email, id=id)
+
+
+def reading(id: str):
+    return cache.load(id, owner_email, MEMBER_ACCESS, lambda: load(id))
+
+
+def reading_three_tasks_lists_then_the_first_again():
+    for id in ["1", "2", "1", "3", "1", "2"]:
+        reading(id)
+
+
+def reading_a_tasks_list_twice():
+    reading("1")
+    reading("1")
+
+
+def mutating_a_read_tasks_list():
+    reading("1").name = "Changed"
+
+
+def the_least_recently_used_tasks_list_is_evicted():
+    assert loads == ["1", "2", "3", "2"]
+    assert len(cache) == 2
+
+
+def the_tasks_list_is_loaded_each_time():
+    assert loads == ["1", "1"]
+
+
+def the_cached_tasks_list_is_unchanged():
+    assert reading("1").name == "1"
+    assert loads == ["1"]
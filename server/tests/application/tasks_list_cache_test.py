@@ -0,0 +1,20 @@
+from tests.specification import *
+from tests.application.tasks_list_cache_steps import *
+
+
+def test_evicts_the_least_recently_used_tasks_list():
+    Given(a_cache_holding_two_tasks_lists)
+    When(reading_three_tasks_lists_then_the_first_again)
+    Then(the_least_recently_used_tasks_list_is_evicted)
+
+
+def test_expired_tasks_lists_are_loaded_again():
+    Given(a_cache_that_expires_immediately)
+    When(reading_a_tasks_list_twice)
+    Then(the_tasks_list_is_loaded_each_time)
+
+
+def test_callers_cannot_change_cached_tasks_lists():
+    Given(a_cache_holding_two_tasks_lists)
+    When(mutating_a_read_tasks_list)
+    Then(the_cached_tasks_list_is_unchanged)
@@ -1,12 +1,27 @@
-import base64
-
-from tests.datetime import NewDateTimeNow, the_updated_datetime
+﻿import base64
+
+from tests.datetime import (
+    NewDateTimeNow,
+    OldDateTimeNow,
+    the_datetime,
+    the_updated_datetime,
+)
 import datetime
+import signal
 import pytest
+import pytest_mock
 from azure.cosmos import ContainerProxy
+from api.application.tasks_list_cache import TasksListCache
 from api.application.tasks_list_service import TasksListService
+from api.persistence.cosmos_tasks_lists_repository import CosmosTasksListsRepository
 from api.domain.tasks_list import TasksList
-from tests.database import setup_db, get_db_connection, clear_db
+from api.domain.tasks_list_summary import TasksListSummary
+from tests.database import (
+    setup_db,
+    get_db_connection,
+    get_directories_db_connection,
+    clear_db,
+)
 
 db: ContainerProxy
 tasks_list_service: TasksListService
@@ -14,6 +29,15 @@ tasks_list: TasksList
 tasks_lists: list[TasksList]
 another_tasks_list: TasksList
 tasks_list_id: str
+operation_results: list[dict] = []
+summaries: list[TasksListSummary] = []
+page: list[TasksList | TasksListSummary] = []
+continuation: str | None = None
+read_tasks_lists: list[TasksList | None] = []
+writes_before_batch = 0
+save: pytest_mock.MockType
+saved: pytest_mock.MockType
+previous_sigterm_handler = None
 owner_email = "wibble@wobble.com"
 another_owner_email = "wabble@wubble.com"
 
@@ -23,7 +47,9 @@ def setup_and_teardown():
     global db, tasks_list_service
     setup_db()
     db = get_db_connection()
-    tasks_list_service = TasksListService(db)
+    tasks_list_service = TasksListService(
+        CosmosTasksListsRepository(db, get_directories_db_connection())
+    )
     yield
     clear_db()
 
@@ -56,6 +82,56 @@ def getting_all_tasks_lists_for_another_owner():
     tasks_lists = tasks_list_service.get_all(another_owner_email)
 
 
+def getting_all_tasks_lists_for_a_sharer():
+    global tasks_list_service, tasks_lists
+    tasks_lists = tasks_list_service.get_all(another_owner_email)
+
+
+def getting_all_tasks_list_summaries():
+    global tasks_list_service, summaries
+    summaries = tasks_list_service.get_all_summaries(owner_email)
+
+
+def getting_all_tasks_list_summaries_for_a_sharer():
+    global tasks_list_service, summaries
+    summaries = tasks_list_service.get_all_summaries(another_owner_email)
+
+
+def tasks_lists_selected_at_different_times():
+    for day, name in enumerate(["Oldest", "Middle", "Newest"]):
+        tasks_list_service.repository.add(
+            TasksList(
+                name,
+                owner_email,
+                last_selected_time=datetime.datetime(2024, 1, day + 1),
+            )
+        )
+
+
+def getting_the_first_page_of_two_tasks_lists():
+    global page, continuation
+    page, continuation = tasks_list_service.get_page(owner_email, "2", None)
+
+
+def getting_the_next_page_of_two_tasks_lists():
+    global page, continuation
+    getting_the_first_page_of_two_tasks_lists()
+    page, continuation = tasks_list_service.get_page(owner_email, "2", continuation)
+
+
+def getting_a_page_of_summaries():
+    global page, continuation
+    page, continuation = tasks_list_service.get_page(owner_email, "1", None, True)
+
+
+def getting_a_page_with_an_invalid_limit():
+    tasks_list_service.get_page(owner_email, "1000", None)
+
+
+def getting_a_page_with_a_malformed_continuation():
+    tasks_list_service.get_page(owner_email, "1", "not a continuation")
+
+
 def creating_another_tasks_list():
     global tasks_list_service
     tasks_list_service.add(another_tasks_list_name(), owner_email)
@@ -77,8 +153,15 @@ def renaming_a_tasks_list():
 
 
 def renaming_a_tasks_list_to_existing_name():
-    global tasks_list_service, tasks_list_id
-    tasks_list_service.update(tasks_list_id, owner_email, another_tasks_list_name())
+    global tasks_list_service
+    tasks_list_service.update(tasks_list.id, owner_email, another_tasks_list_name())
+
+
+def another_owner_adding_a_tasks_list_with_the_same_name():
+    global another_tasks_list
+    another_tasks_list = tasks_list_service.add(
+        a_tasks_list_name(), another_owner_email
+    )
 
 
 def renaming_a_tasks_list_to_same_name():
@@ -92,6 +175,74 @@ def updating_last_selected_time():
     tasks_list_service.update_last_selected_time(tasks_list.id, owner_email)
 
 
+def a_service_buffering_last_selected_times():
+    global tasks_list_service
+    tasks_list_service = TasksListService(
+        CosmosTasksListsRepository(db, get_directories_db_connection()), 60
+    )
+
+
+def a_service_caching_tasks_lists():
+    global tasks_list_service
+    tasks_list_service = TasksListService(
+        CosmosTasksListsRepository(db, get_directories_db_connection()),
+        tasks_list_cache=TasksListCache(100, 60, 60),
+    )
+
+
+def adding_tasks_and_reading_the_tasks_list_repeatedly():
+    global read_tasks_lists
+    tasks_list_service.add_task(tasks_list.id, owner_email, "My Task")
+    read_tasks_lists = [
+        tasks_list_service.get_by_id_for_owner(tasks_list.id, owner_email)
+        for _ in range(3)
+    ]
+    tasks_list_service.add_task(tasks_list.id, owner_email, "Another Task")
+    read_tasks_lists.append(tasks_list_service.get_by_id(tasks_list.id, owner_email))
+
+
+def the_sharer_reading_the_tasks_list():
+    assert tasks_list_service.get_by_id(tasks_list.id, another_owner_email) is not None
+
+
+def reading_the_tasks_list_for_the_owner():
+    assert (
+        tasks_list_service.get_by_id_for_owner(tasks_list.id, owner_email) is not None
+    )
+
+
+def reading_a_missing_tasks_list_twice():
+    global read_tasks_lists
+    read_tasks_lists = [
+        tasks_list_service.get_by_id("non_existing", owner_email) for _ in range(2)
+    ]
+
+
+def updating_last_selected_time_repeatedly():
+    global tasks_list_service
+    datetime.datetime = OldDateTimeNow
+    for _ in range(3):
+        tasks_list_service.update_last_selected_time(tasks_list.id, owner_email)
+    tasks_list_service.update_last_selected_time(tasks_list.id, another_owner_email)
+
+
+def flushing_last_selected_times():
+    tasks_list_service.last_selected_times.flush()
+
+
+def the_worker_being_stopped_with_a(mocker: pytest_mock.MockerFixture):
+    def step():
+        global previous_sigterm_handler
+        previous_sigterm_handler = mocker.Mock()
+        mocker.patch(
+            "api.application.last_selected_times.previous_sigterm_handler",
+            previous_sigterm_handler,
+        )
+        signal.getsignal(signal.SIGTERM)(signal.SIGTERM, None)
+
+    return step
+
+
 def deleting_a_tasks_list():
     global tasks_list_service
     tasks_list_service.delete(tasks_list.id, owner_email)
@@ -145,6 +296,22 @@ def adding_a_task():
     tasks_list_service.add_task(tasks_list.id, owner_email, "My Task")
 
 
+def another_writer_adding_a_task_at_the_same_time():
+    global db, tasks_list
+    read_item = db.read_item
+    tasks_list_id = tasks_list.id
+
+    def read_item_then_let_another_writer_in(*args, **kwargs):
+        db.read_item = read_item
+        item = read_item(*args, **kwargs)
+        TasksListService(
+            CosmosTasksListsRepository(db, get_directories_db_connection())
+        ).add_task(tasks_list_id, owner_email, "Their Task")
+        return item
+
+    db.read_item = read_item_then_let_another_writer_in
+
+
 def adding_a_task_for_non_existing_tasks_list():
     global tasks_list_service
     tasks_list_service.add_task("non_existing", owner_email, "My Task")
@@ -190,6 +357,62 @@ def carrying_a_task():
     tasks_list_service.carry_task(tasks_list.id, owner_email, tasks_list.tasks[0].id)
 
 
+def deciding_every_task_in_the_full_tasks_list():
+    global tasks_list_service, tasks_list
+    for task in tasks_list.tasks[:21]:
+        tasks_list_service.carry_task(tasks_list.id, owner_email, task.id)
+    tasks_list_service.remove_task(tasks_list.id, owner_email, tasks_list.tasks[21].id)
+
+
+def deciding_every_task_in_one_batch():
+    global tasks_list_service, operation_results, writes_before_batch
+    writes_before_batch = tasks_list_service.concurrency_metrics.writes
+    operations = [{"op": "carry", "task_id": task.id} for task in tasks_list.tasks[:21]]
+    operations.append({"op": "remove", "task_id": tasks_list.tasks[21].id})
+    operation_results = tasks_list_service.apply_task_operations(
+        tasks_list.id, owner_email, operations
+    )
+
+
+def applying_operations_including_a_missing_task():
+    global tasks_list_service, operation_results
+    operation_results = tasks_list_service.apply_task_operations(
+        tasks_list.id,
+        owner_email,
+        [
+            {"op": "add", "content": "Another Task"},
+            {"op": "tick", "task_id": "non_existing"},
+            {"op": "tick", "task_id": tasks_list.tasks[0].id},
+        ],
+    )
+
+
+def applying_only_failing_operations_with_a(mocker: pytest_mock.MockerFixture):
+    def step():
+        global tasks_list_service, tasks_list, operation_results
+        global writes_before_batch, save, saved
+        writes_before_batch = tasks_list_service.concurrency_metrics.writes
+        save = mocker.spy(tasks_list_service.repository, "save")
+        saved = mocker.spy(tasks_list_service.writes, "saved")
+        operation_results = tasks_list_service.apply_task_operations(
+            tasks_list.id,
+            owner_email,
+            [
+                {"op": "tick", "task_id": "non_existing"},
+                {"op": "remove", "task_id": "also_non_existing"},
+            ],
+        )
+
+    return step
+
+
+def applying_an_unknown_operation():
+    global tasks_list_service
+    tasks_list_service.apply_task_operations(
+        tasks_list.id, owner_email, [{"op": "wibble", "task_id": "wobble"}]
+    )
+
+
 def sharing_tasks_list():
     global tasks_list_service
     tasks_list_service.share(tasks_list.id, owner_email, another_owner_email)
@@ -233,6 +456,48 @@ def all_tasks_lists_are_retrieved():
     assert tasks_lists[1].name == "Another Tasks List"
 
 
+def all_tasks_list_summaries_are_retrieved():
+    global tasks_list_service, tasks_list
+    tasks_list = tasks_list_service.get(a_tasks_list_name(), owner_email)
+    assert [summary.name for summary in summaries] == [
+        "My Tasks List",
+        "Another Tasks List",
+    ]
+    assert summaries[0] == TasksListSummary(
+        tasks_list.id,
+        tasks_list.name,
+        owner_email,
+        tasks_list.last_selected_time,
+        [],
+    )
+
+
+def the_sharer_sees_the_shared_tasks_list_summary():
+    assert len(summaries) == 1
+    assert summaries[0].id == tasks_list.id
+    assert summaries[0].shared_with == [another_owner_email]
+
+
+def there_are_no_tasks_list_summaries():
+    assert summaries == []
+
+
+def the_most_recently_selected_tasks_lists_come_first():
+    assert [tasks_list.name for tasks_list in page] == ["Newest", "Middle"]
+    assert continuation is not None
+
+
+def the_remaining_tasks_list_is_returned():
+    assert [tasks_list.name for tasks_list in page] == ["Oldest"]
+    assert continuation is None
+
+
+def a_page_of_summaries_is_returned():
+    assert len(page) == 1
+    assert type(page[0]) is TasksListSummary
+    assert page[0].name == "Newest"
+
+
 def the_last_selected_time_is_updated():
     global tasks_list_service, tasks_list
     tasks_list = tasks_list_service.get(a_tasks_list_name(), owner_email)
@@ -240,6 +505,62 @@ def the_last_selected_time_is_updated():
     assert tasks_list.last_selected_time.time() == the_updated_datetime.time()
 
 
+def the_last_selected_time_is_read_before_it_is_written():
+    global tasks_list_service, tasks_list
+    assert tasks_list_service.last_selected_times.writes == 0
+    stored = db.read_item(tasks_list.id, partition_key=owner_email)
+    assert stored["last_selected_time"] == the_updated_datetime.isoformat()
+    tasks_list = tasks_list_service.get(a_tasks_list_name(), owner_email)
+    assert tasks_list.last_selected_time == the_datetime
+    assert [
+        summary.last_selected_time
+        for summary in tasks_list_service.get_all_summaries(another_owner_email)
+    ] == [the_datetime]
+
+
+def the_worker_is_stopped_after_the_last_selected_time_is_written():
+    the_last_selected_time_is_written_once()
+    previous_sigterm_handler.assert_called_once_with(signal.SIGTERM, None)
+
+
+def the_last_selected_time_is_written_once():
+    assert tasks_list_service.last_selected_times.writes == 1
+    stored = db.read_item(tasks_list.id, partition_key=owner_email)
+    assert stored["last_selected_time"] == the_datetime.isoformat()
+
+
+def the_reads_are_served_from_the_cache():
+    assert tasks_list_service.tasks_list_cache.misses == 0
+    assert tasks_list_service.concurrency_metrics.conflicts == 0
+    assert [len(read.tasks) for read in read_tasks_lists] == [1, 1, 1, 2]
+
+
+def the_sharer_can_no_longer_read_the_tasks_list():
+    assert tasks_list_service.get_by_id(tasks_list.id, another_owner_email) is None
+
+
+def the_tasks_list_can_no_longer_be_read():
+    assert tasks_list_service.get_by_id_for_owner(tasks_list.id, owner_email) is None
+
+
+def the_missing_tasks_list_is_read_once():
+    assert read_tasks_lists == [None, None]
+    assert tasks_list_service.tasks_list_cache.misses == 1
+    assert tasks_list_service.tasks_list_cache.hits == 1
+
+
+def both_owners_have_a_tasks_list_with_the_name():
+    for email in [owner_email, another_owner_email]:
+        assert tasks_list_service.get(a_tasks_list_name(), email) is not None
+
+
+def the_sharer_can_see_the_shared_tasks_list():
+    global tasks_lists
+    assert len(tasks_lists) == 1
+    assert tasks_lists[0].id == tasks_list.id
+    assert tasks_lists[0].owner_email == owner_email
+
+
 def there_are_no_tasks_lists():
     global tasks_list_service, tasks_lists
     assert len(tasks_lists) == 0
@@ -269,6 +590,13 @@ def the_task_is_added_to_the_tasks_list():
     assert tasks_list.tasks[0].content == "My Task"
 
 
+def both_tasks_are_added_to_the_tasks_list():
+    global tasks_list_service, tasks_list
+    tasks_list = tasks_list_service.get(a_tasks_list_name(), owner_email)
+    assert [task.content for task in tasks_list.tasks] == ["Their Task", "My Task"]
+    assert tasks_list_service.concurrency_metrics.conflicts == 1
+
+
 def the_task_is_stored_in_base64_ascii():
     global db
     item = list(db.read_all_items())[0]
@@ -297,6 +625,43 @@ def the_task_is_carried_in_the_tasks_list():
     assert tasks_list.tasks[0].is_carried is True
 
 
+def a_new_page_is_started_with_the_carried_tasks():
+    global tasks_list_service, tasks_list
+    tasks_list = tasks_list_service.get(a_tasks_list_name(), owner_email)
+    assert len(tasks_list.tasks) == 21
+    assert all(task.is_carried is False for task in tasks_list.tasks)
+    assert all(task.page_count == 1 for task in tasks_list.tasks)
+
+
+def the_batch_is_written_once():
+    global tasks_list_service
+    assert tasks_list_service.concurrency_metrics.writes == writes_before_batch + 1
+    assert all("error" not in result for result in operation_results)
+
+
+def the_batch_is_not_written():
+    global tasks_list_service
+    assert all("error" in result for result in operation_results)
+    save.assert_not_called()
+    saved.assert_not_called()
+    assert tasks_list_service.concurrency_metrics.writes == writes_before_batch
+
+
+def each_operation_reports_its_result():
+    global tasks_list_service, tasks_list
+    assert operation_results[0]["op"] == "add"
+    assert operation_results[1] == {
+        "op": "tick",
+        "task_id": "non_existing",
+        "error": "Task not found",
+    }
+    assert operation_results[2] == {"op": "tick", "task_id": tasks_list.tasks[0].id}
+    tasks_list = tasks_list_service.get(a_tasks_list_name(), owner_email)
+    assert tasks_list.tasks[0].is_ticked is True
+    assert tasks_list.tasks[1].id == operation_results[0]["id"]
+    assert tasks_list.tasks[1].content == "Another Task"
+
+
 def the_tasks_list_is_shared():
     global tasks_list_service, tasks_list
     tasks_list = tasks_list_service.get(a_tasks_list_name(), owner_email)
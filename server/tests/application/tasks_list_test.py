@@ -16,6 +16,55 @@ def test_get_all_tasks_lists():
     Then(all_tasks_lists_are_retrieved)
 
 
+def test_get_all_tasks_list_summaries():
+    Given(an_existing_tasks_list)
+    And(another_existing_tasks_list)
+    When(getting_all_tasks_list_summaries)
+    Then(all_tasks_list_summaries_are_retrieved)
+
+
+def test_sharer_gets_summary_of_shared_tasks_list():
+    Given(a_shared_tasks_list)
+    When(getting_all_tasks_list_summaries_for_a_sharer)
+    Then(the_sharer_sees_the_shared_tasks_list_summary)
+
+
+def test_non_owner_gets_no_tasks_list_summaries():
+    Given(an_existing_tasks_list)
+    When(getting_all_tasks_list_summaries_for_a_sharer)
+    Then(there_are_no_tasks_list_summaries)
+
+
+def test_get_first_page_of_most_recently_selected_tasks_lists():
+    Given(tasks_lists_selected_at_different_times)
+    When(getting_the_first_page_of_two_tasks_lists)
+    Then(the_most_recently_selected_tasks_lists_come_first)
+
+
+def test_get_next_page_of_tasks_lists():
+    Given(tasks_lists_selected_at_different_times)
+    When(getting_the_next_page_of_two_tasks_lists)
+    Then(the_remaining_tasks_list_is_returned)
+
+
+def test_get_page_of_tasks_list_summaries():
+    Given(tasks_lists_selected_at_different_times)
+    When(getting_a_page_of_summaries)
+    Then(a_page_of_summaries_is_returned)
+
+
+def test_cannot_get_page_larger_than_maximum():
+    Given(tasks_lists_selected_at_different_times)
+    When(validating(getting_a_page_with_an_invalid_limit))
+    Then(informs("Limit must be between 1 and 100"))
+
+
+def test_cannot_get_page_from_a_malformed_continuation():
+    Given(tasks_lists_selected_at_different_times)
+    When(validating(getting_a_page_with_a_malformed_continuation))
+    Then(informs("Continuation token is not valid"))
+
+
 def test_non_owner_cannot_get_a_tasks_list():
     Given(an_existing_tasks_list)
     When(getting_all_tasks_lists_for_another_owner)
@@ -45,6 +94,12 @@ def test_cannot_add_tasks_list_with_existing_name():
     Then(informs("Tasks list with name already exists"))
 
 
+def test_different_owners_can_use_the_same_name():
+    Given(an_existing_tasks_list)
+    When(another_owner_adding_a_tasks_list_with_the_same_name)
+    Then(both_owners_have_a_tasks_list_with_the_name)
+
+
 def test_cannot_rename_tasks_list_to_existing_name():
     Given(an_existing_tasks_list)
     And(another_existing_tasks_list)
@@ -64,6 +119,58 @@ def test_update_last_selected_time():
     Then(the_last_selected_time_is_updated)
 
 
+def test_last_selected_times_are_buffered_but_visible():
+    Given(a_service_buffering_last_selected_times)
+    And(a_shared_tasks_list)
+    When(updating_last_selected_time_repeatedly)
+    Then(the_last_selected_time_is_read_before_it_is_written)
+
+
+def test_buffered_last_selected_times_are_written_once():
+    Given(a_service_buffering_last_selected_times)
+    And(a_shared_tasks_list)
+    And(updating_last_selected_time_repeatedly)
+    When(flushing_last_selected_times)
+    Then(the_last_selected_time_is_written_once)
+
+
+def test_buffered_last_selected_times_are_written_when_the_worker_stops(mocker):
+    Given(a_service_buffering_last_selected_times)
+    And(a_shared_tasks_list)
+    And(updating_last_selected_time_repeatedly)
+    When(the_worker_being_stopped_with_a(mocker))
+    Then(the_worker_is_stopped_after_the_last_selected_time_is_written)
+
+
+def test_cached_tasks_lists_are_read_from_memory():
+    Given(a_service_caching_tasks_lists)
+    And(an_existing_tasks_list)
+    When(adding_tasks_and_reading_the_tasks_list_repeatedly)
+    Then(the_reads_are_served_from_the_cache)
+
+
+def test_unsharing_evicts_the_sharers_cached_tasks_list():
+    Given(a_service_caching_tasks_lists)
+    And(a_shared_tasks_list)
+    And(the_sharer_reading_the_tasks_list)
+    When(unsharing_tasks_list)
+    Then(the_sharer_can_no_longer_read_the_tasks_list)
+
+
+def test_deleting_evicts_the_cached_tasks_list():
+    Given(a_service_caching_tasks_lists)
+    And(an_existing_tasks_list)
+    And(reading_the_tasks_list_for_the_owner)
+    When(deleting_a_tasks_list)
+    Then(the_tasks_list_can_no_longer_be_read)
+
+
+def test_missing_tasks_lists_are_cached():
+    Given(a_service_caching_tasks_lists)
+    When(reading_a_missing_tasks_list_twice)
+    Then(the_missing_tasks_list_is_read_once)
+
+
 def test_delete_tasks_list():
     Given(an_existing_tasks_list)
     When(deleting_a_tasks_list)
@@ -82,6 +189,13 @@ def test_add_a_task_to_tasks_list():
     Then(the_task_is_added_to_the_tasks_list)
 
 
+def test_concurrent_task_additions_are_both_kept():
+    Given(an_existing_tasks_list)
+    And(another_writer_adding_a_task_at_the_same_time)
+    When(adding_a_task)
+    Then(both_tasks_are_added_to_the_tasks_list)
+
+
 def test_tasks_stored_in_base64_ascii():
     Given(an_existing_tasks_list)
     When(adding_a_task)
@@ -124,6 +238,37 @@ def test_carry_a_task_from_tasks_list():
     Then(the_task_is_carried_in_the_tasks_list)
 
 
+def test_deciding_every_task_starts_a_new_page():
+    Given(an_existing_tasks_list_which_is_full)
+    When(deciding_every_task_in_the_full_tasks_list)
+    Then(a_new_page_is_started_with_the_carried_tasks)
+
+
+def test_deciding_every_task_in_one_batch_writes_once():
+    Given(an_existing_tasks_list_which_is_full)
+    When(deciding_every_task_in_one_batch)
+    Then(a_new_page_is_started_with_the_carried_tasks)
+    And(the_batch_is_written_once)
+
+
+def test_batch_reports_result_of_each_operation():
+    Given(an_existing_tasks_list_with_a_task)
+    When(applying_operations_including_a_missing_task)
+    Then(each_operation_reports_its_result)
+
+
+def test_batch_where_every_operation_fails_is_not_written(mocker):
+    Given(an_existing_tasks_list_with_a_task)
+    When(applying_only_failing_operations_with_a(mocker))
+    Then(the_batch_is_not_written)
+
+
+def test_cannot_apply_unknown_operation():
+    Given(an_existing_tasks_list_with_a_task)
+    When(validating(applying_an_unknown_operation))
+    Then(informs("Operation must be one of add, tick, carry, remove"))
+
+
 def test_cannot_carry_task_for_non_existing_tasks_list():
     Given(an_existing_tasks_list)
     When(validating(carrying_a_task_for_non_existing_tasks_list))
@@ -155,6 +300,26 @@ def test_a_sharer_can_see_their_list_and_a_shared_list():
     Then(the_sharer_can_see_their_list_and_a_shared_list)
 
 
+def test_a_sharer_can_see_a_shared_list():
+    Given(a_shared_tasks_list)
+    When(getting_all_tasks_lists_for_a_sharer)
+    Then(the_sharer_can_see_the_shared_tasks_list)
+
+
+def test_a_sharer_cannot_see_an_unshared_list():
+    Given(a_shared_tasks_list)
+    And(unsharing_tasks_list)
+    When(getting_all_tasks_lists_for_a_sharer)
+    Then(there_are_no_tasks_lists)
+
+
+def test_a_sharer_cannot_see_a_deleted_list():
+    Given(a_shared_tasks_list)
+    And(deleting_a_tasks_list)
+    When(getting_all_tasks_lists_for_a_sharer)
+    Then(there_are_no_tasks_lists)
+
+
 def test_a_sharer_cannot_update_a_list_name():
     Given(a_shared_tasks_list)
     When(validating(a_sharer_renaming_a_tasks_list))
@@ -0,0 +1,163 @@
+import json
+import threading
+
+import pytest
+
+from api.application.tasks_list_cache import TasksListCache
+from api.application.tasks_list_service import TasksListService
+from api.domain.tasks_list import TasksList
+from api.handlers.jwks_key_store import JwksKeyStore
+from api.persistence.cosmos_tasks_lists_repository import CosmosTasksListsRepository
+from api.warm_start import WarmStarter, WarmStartSnapshot
+from tests.auth_zero_tokens import get_jwks, kid
+from tests.database import (
+    setup_db,
+    get_db_connection,
+    get_directories_db_connection,
+    clear_db,
+)
+
+owner_email = "wibble@wobble.com"
+snapshot_path: str = ""
+release = threading.Event()
+tasks_list: TasksList | None = None
+warm_starter: WarmStarter | None = None
+restored = False
+
+
+@pytest.fixture(autouse=True)
+def setup_and_teardown(tmp_path):
+    global snapshot_path, release, tasks_list, warm_starter, restored
+    setup_db()
+    snapshot_path = str(tmp_path / "warm_start.json")
+    release = threading.Event()
+    tasks_list = None
+    warm_starter = None
+    restored = False
+    yield
+    release.set()
+    clear_db()
+
+
+def a_service_caching_tasks_lists() -> TasksListService:
+    return TasksListService(
+        CosmosTasksListsRepository(
+            get_db_connection(), get_directories_db_connection()
+        ),
+        tasks_list_cache=TasksListCache(100, 60, 60),
+    )
+
+
+def a_warm_starter(
+    max_age_seconds: float = 60,
+    service: TasksListService | None = None,
+    hot_tasks_lists: int = 100,
+) -> WarmStarter:
+    def slow_fetch():
+        release.wait(5)
+        return get_jwks()
+
+    return WarmStarter(
+        WarmStartSnapshot(snapshot_path, max_age_seconds),
+        JwksKeyStore(slow_fetch),
+        service if service is not None else a_service_caching_tasks_lists(),
+        hot_tasks_lists=hot_tasks_lists,
+    )
+
+
+# the snapshotting instance runs with the default, disabled, tasks list cache
+def a_warm_instance(hot_tasks_lists: int = 100) -> WarmStarter:
+    the_warm_starter = a_warm_starter(
+        service=TasksListService(
+            CosmosTasksListsRepository(
+                get_db_connection(), get_directories_db_connection()
+            )
+        ),
+        hot_tasks_lists=hot_tasks_lists,
+    )
+    the_warm_starter.key_store.update(get_jwks())
+    return the_warm_starter
+
+
+def a_snapshot_of_a_warm_instance():
+    global tasks_list
+    the_warm_starter = a_warm_instance()
+    service = the_warm_starter.tasks_list_service
+    tasks_list = service.add("My Tasks List", owner_email)
+    service.get_by_id(tasks_list.id, owner_email)
+    the_warm_starter.capture()
+
+
+def a_snapshot_of_the_most_read_tasks_list():
+    global tasks_list
+    the_warm_starter = a_warm_instance(hot_tasks_lists=1)
+    service = the_warm_starter.tasks_list_service
+    tasks_list = service.add("My Tasks List", owner_email)
+    another_tasks_list = service.add("Another Tasks List", owner_email)
+    service.get_by_id(another_tasks_list.id, owner_email)
+    for _ in range(3):
+        service.get_by_id(tasks_list.id, owner_email)
+    service.get_by_id(another_tasks_list.id, owner_email)
+    the_warm_starter.capture()
+
+
+def a_new_instance_starting():
+    global warm_starter, restored
+    warm_starter = a_warm_starter()
+    restored = warm_starter.restore()
+
+
+def a_new_instance_starting_after_the_snapshot_is_too_old():
+    global warm_starter, restored
+    warm_starter = a_warm_starter(max_age_seconds=0)
+    restored = warm_starter.restore()
+
+
+def the_tasks_list_renamed_by_another_instance():
+    service = a_service_caching_tasks_lists()
+    service.update(tasks_list.id, owner_email, "My Renamed Tasks List")
+
+
+def the_restored_tasks_lists_being_reloaded():
+    warm_starter.reloading.join(5)
+
+
+def the_keys_are_served_while_they_are_fetched_again():
+    assert restored
+    assert warm_starter.key_store.key(kid) is not None
+    assert not release.is_set()
+
+
+def the_tasks_list_is_served_from_the_cache():
+    service = warm_starter.tasks_list_service
+    served = service.get_by_id(tasks_list.id, owner_email)
+    assert served.name == "My Tasks List"
+    assert service.tasks_list_cache.hits == 1
+
+
+def the_snapshot_holds_no_tasks_list_contents():
+    with open(snapshot_path) as file:
+        snapshot = json.load(file)
+    assert snapshot["tasks_lists"] == [
+        {"id": tasks_list.id, "owner_email": owner_email}
+    ]
+    assert "My Tasks List" not in json.dumps(snapshot)
+
+
+def the_renamed_tasks_list_is_served():
+    assert (
+        warm_starter.tasks_list_service.get_by_id(tasks_list.id, owner_email).name
+        == "My Renamed Tasks List"
+    )
+
+
+def nothing_is_restored():
+    assert not restored
+    assert warm_starter.key_store.jwks is None
+    assert len(warm_starter.tasks_list_service.tasks_list_cache) == 0
+
+
+def only_the_most_read_tasks_list_is_snapshotted():
+    with open(snapshot_path) as file:
+        snapshot = json.load(file)
+    assert [item["id"] for item in snapshot["tasks_lists"]] == [tasks_list.id]
@@ -0,0 +1,34 @@
+from tests.specification import *
+from tests.application.warm_start_steps import *
+
+
+def test_new_instances_start_with_the_snapshot():
+    Given(a_snapshot_of_a_warm_instance)
+    When(a_new_instance_starting)
+    And(the_restored_tasks_lists_being_reloaded)
+    Then(the_keys_are_served_while_they_are_fetched_again)
+    And(the_tasks_list_is_served_from_the_cache)
+
+
+def test_snapshots_hold_only_ids_and_owners():
+    When(a_snapshot_of_a_warm_instance)
+    Then(the_snapshot_holds_no_tasks_list_contents)
+
+
+def test_snapshots_hold_the_most_read_tasks_lists():
+    When(a_snapshot_of_the_most_read_tasks_list)
+    Then(only_the_most_read_tasks_list_is_snapshotted)
+
+
+def test_restored_tasks_lists_are_read_afresh():
+    Given(a_snapshot_of_a_warm_instance)
+    And(the_tasks_list_renamed_by_another_instance)
+    When(a_new_instance_starting)
+    And(the_restored_tasks_lists_being_reloaded)
+    Then(the_renamed_tasks_list_is_served)
+
+
+def test_old_snapshots_are_ignored():
+    Given(a_snapshot_of_a_warm_instance)
+    When(a_new_instance_starting_after_the_snapshot_is_too_old)
+    Then(nothing_is_restored)
@@ -0,0 +1,8 @@
+import asyncio
+
+# One loop for the whole run, as the async Cosmos client's session is bound to it
+loop = asyncio.new_event_loop()
+
+
+def run(coroutine):
+    return loop.run_until_complete(coroutine)
@@ -0,0 +1,55 @@
+import json
+import sys
+import time
+
+from api.app import create_app
+from api.application.tasks_list_service import TasksListService
+from api.cache import cache, cache_config
+from api.persistence.repository_factory import create_tasks_lists_repository
+from tests.auth_zero_tokens import get_jwks
+from tests.handlers.mocking_utilities import the_headers
+from tests.handlers.routing import task_url, tasks_list_url_with_id, tasks_url
+
+
+TASKS_PER_LIST = 20
+
+
+def benchmark(iterations: int) -> float:
+    app = create_app(
+        TasksListService(
+            create_tasks_lists_repository({"storage": "memory", "database": "bench"})
+        )
+    )
+    cache.init_app(app, config=cache_config)
+    with app.app_context():
+        cache.set("jwks", get_jwks())
+    client = app.test_client()
+    # A list holds at most 22 tasks, so spread the added tasks over enough lists
+    tasks_list_ids = []
+    for number in range(iterations // TASKS_PER_LIST + 1):
+        response = client.post(
+            tasks_url(), json={"name": f"Benchmark {number}"}, headers=the_headers()
+        )
+        assert response.status_code == 201, response.status_code
+        tasks_list_ids.append(json.loads(response.data)["id"])
+    started = time.perf_counter()
+    for iteration in range(iterations):
+        tasks_list_id = tasks_list_ids[iteration // TASKS_PER_LIST]
+        response = client.post(
+            task_url(tasks_list_id),
+            json={"content": f"Task {iteration}"},
+            headers=the_headers(),
+        )
+        assert response.status_code == 201, response.status_code
+        response = client.get(
+            tasks_list_url_with_id(tasks_list_id), headers=the_headers()
+        )
+        assert response.status_code == 200, response.status_code
+        response = client.get(tasks_url() + "?view=summary", headers=the_headers())
+        assert response.status_code == 200, response.status_code
+    return 3 * iterations / (time.perf_counter() - started)
+
+
+if __name__ == "__main__":
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    print(f"{benchmark(iterations):.0f} requests/second")
@@ -1,11 +1,22 @@
 ﻿from azure.cosmos import CosmosClient, PartitionKey
+from azure.cosmos.aio import CosmosClient as AsyncCosmosClient
 import urllib3
 from pathlib import Path
 import yaml
 import os
 from api.persistence.run_cosmos import start_and_wait_for_cosmos
+from api.persistence.in_memory_cosmos import (
+    InMemoryAsyncCosmosClient,
+    InMemoryCosmosClient,
+)
 
-from api.persistence.constants import TASKS_LISTS_CONTAINER_ID, TASKS_LISTS_PARTITION_KEY_PATH
+from api.persistence.constants import (
+    TASKS_LISTS_CONTAINER_ID,
+    TASKS_LISTS_PARTITION_KEY_PATH,
+    TASKS_LISTS_UNIQUE_KEY_POLICY,
+    USER_DIRECTORIES_CONTAINER_ID,
+    USER_DIRECTORIES_PARTITION_KEY_PATH,
+)
 
 urllib3.disable_warnings()
 path = Path(__file__).parent / "config.yaml"
@@ -14,10 +25,15 @@ config = yaml.safe_load(open(path))
 connection_string = config["connection_string"]
 
 client = None
-if os.name == "nt":
-    client = start_and_wait_for_cosmos(connection_string)
+if os.getenv("IN_MEMORY_COSMOS") is not None:
+    client = InMemoryCosmosClient()
+    async_client = InMemoryAsyncCosmosClient(client)
 else:
-    client = CosmosClient.from_connection_string(connection_string)
+    if os.name == "nt":
+        client = start_and_wait_for_cosmos(connection_string)
+    else:
+        client = CosmosClient.from_connection_string(connection_string)
+    async_client = AsyncCosmosClient.from_connection_string(connection_string)
 
 
 def setup_db():
@@ -27,6 +43,13 @@ def setup_db():
         partition_key=PartitionKey(
             path=TASKS_LISTS_PARTITION_KEY_PATH,
         ),
+        unique_key_policy=TASKS_LISTS_UNIQUE_KEY_POLICY,
+    )
+    client.get_database_client(config["database"]).create_container_if_not_exists(
+        id=USER_DIRECTORIES_CONTAINER_ID,
+        partition_key=PartitionKey(
+            path=USER_DIRECTORIES_PARTITION_KEY_PATH,
+        ),
     )
 
 
@@ -36,5 +59,23 @@ def get_db_connection():
     )
 
 
+def get_directories_db_connection():
+    return client.get_database_client(config["database"]).get_container_client(
+        USER_DIRECTORIES_CONTAINER_ID
+    )
+
+
+def get_async_db_connection():
+    return async_client.get_database_client(config["database"]).get_container_client(
+        TASKS_LISTS_CONTAINER_ID
+    )
+
+
+def get_async_directories_db_connection():
+    return async_client.get_database_client(config["database"]).get_container_client(
+        USER_DIRECTORIES_CONTAINER_ID
+    )
+
+
 def clear_db():
     client.delete_database(config["database"])
@@ -0,0 +1,49 @@
+from api.domain.task_operation import TaskOperation
+from api.domain.tasks_list import TasksList
+
+tasks_list: TasksList = TasksList("My Tasks List", "wibble@wobble.com")
+operation: TaskOperation | None = None
+result: dict = {}
+
+
+def a_tasks_list():
+    global tasks_list
+    tasks_list = TasksList("My Tasks List", "wibble@wobble.com")
+
+
+def a_tick_operation_dictionary():
+    global operation
+    operation = TaskOperation.from_dict({"op": "tick", "task_id": "wibble"})
+
+
+def an_unknown_operation_dictionary():
+    TaskOperation.from_dict({"op": "wibble"})
+
+
+def an_add_operation_dictionary_without_content():
+    TaskOperation.from_dict({"op": "add"})
+
+
+def applying_an_add_operation():
+    global result
+    result = TaskOperation("add", content="My Task").apply_to(tasks_list)
+
+
+def applying_a_tick_operation_for_a_missing_task():
+    global result
+    result = TaskOperation("tick", task_id="wibble").apply_to(tasks_list)
+
+
+def the_tick_operation_is_read():
+    assert operation == TaskOperation("tick", task_id="wibble")
+    assert operation.to_dict() == {"op": "tick", "task_id": "wibble"}
+
+
+def the_task_is_added_and_its_id_reported():
+    assert result == {"op": "add", "id": tasks_list.tasks[0].id}
+    assert tasks_list.tasks[0].content == "My Task"
+
+
+def the_error_is_reported_and_nothing_changes():
+    assert result == {"op": "tick", "task_id": "wibble", "error": "Task not found"}
+    assert tasks_list.tasks == []
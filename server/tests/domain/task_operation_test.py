@@ -0,0 +1,29 @@
+from tests.specification import *
+from tests.domain.task_operation_steps import *
+
+
+def test_reads_operation_from_dictionary():
+    When(a_tick_operation_dictionary)
+    Then(the_tick_operation_is_read)
+
+
+def test_rejects_unknown_operation():
+    When(validating(an_unknown_operation_dictionary))
+    Then(informs("Operation must be one of add, tick, carry, remove"))
+
+
+def test_rejects_add_operation_without_content():
+    When(validating(an_add_operation_dictionary_without_content))
+    Then(informs("Add operation requires content"))
+
+
+def test_add_operation_reports_new_task_id():
+    Given(a_tasks_list)
+    When(applying_an_add_operation)
+    Then(the_task_is_added_and_its_id_reported)
+
+
+def test_failed_operation_reports_error():
+    Given(a_tasks_list)
+    When(applying_a_tick_operation_for_a_missing_task)
+    Then(the_error_is_reported_and_nothing_changes)
@@ -0,0 +1,54 @@
+from api.domain.user_directory import UserDirectory
+
+user_directory: UserDirectory = UserDirectory("wibble@wobble.com")
+an_owner_email = "wibble@wobble.com"
+a_sharer_email = "jackie@chan.com"
+
+
+def an_empty_user_directory():
+    global user_directory
+    user_directory = UserDirectory(an_owner_email)
+
+
+def a_user_directory_with_a_tasks_list():
+    global user_directory
+    user_directory = UserDirectory(an_owner_email)
+    user_directory.add("1", "My Tasks List", an_owner_email)
+
+
+def adding_a_tasks_list():
+    user_directory.add("1", "My Tasks List", an_owner_email)
+
+
+def adding_the_same_tasks_list_again():
+    user_directory.add("1", "My Tasks List", an_owner_email)
+
+
+def adding_a_shared_tasks_list():
+    user_directory.add("2", "Shared Tasks List", a_sharer_email)
+
+
+def removing_the_tasks_list():
+    user_directory.remove("1")
+
+
+def round_tripping_the_user_directory():
+    global user_directory
+    user_directory = UserDirectory.from_dict(user_directory.to_dict())
+
+
+def the_user_directory_lists_the_tasks_list():
+    assert len(user_directory.tasks_lists) == 1
+    assert user_directory.tasks_lists[0].id == "1"
+    assert user_directory.tasks_lists[0].name == "My Tasks List"
+    assert user_directory.tasks_lists[0].owner_email == an_owner_email
+
+
+def the_user_directory_lists_both_tasks_lists():
+    assert [entry.id for entry in user_directory.tasks_lists] == ["1", "2"]
+    assert user_directory.tasks_lists[1].owner_email == a_sharer_email
+
+
+def the_user_directory_is_empty():
+    assert user_directory.email == an_owner_email
+    assert len(user_directory.tasks_lists) == 0
@@ -0,0 +1,32 @@
+from tests.specification import *
+from tests.domain.user_directory_steps import *
+
+
+def test_can_add_a_tasks_list_to_a_user_directory():
+    Given(an_empty_user_directory)
+    When(adding_a_tasks_list)
+    Then(the_user_directory_lists_the_tasks_list)
+
+
+def test_adding_a_tasks_list_twice_lists_it_once():
+    Given(a_user_directory_with_a_tasks_list)
+    When(adding_the_same_tasks_list_again)
+    Then(the_user_directory_lists_the_tasks_list)
+
+
+def test_can_add_a_shared_tasks_list_to_a_user_directory():
+    Given(a_user_directory_with_a_tasks_list)
+    When(adding_a_shared_tasks_list)
+    Then(the_user_directory_lists_both_tasks_lists)
+
+
+def test_can_remove_a_tasks_list_from_a_user_directory():
+    Given(a_user_directory_with_a_tasks_list)
+    When(removing_the_tasks_list)
+    Then(the_user_directory_is_empty)
+
+
+def test_user_directory_survives_a_round_trip():
+    Given(a_user_directory_with_a_tasks_list)
+    When(round_tripping_the_user_directory)
+    Then(the_user_directory_lists_the_tasks_list)
@@ -0,0 +1,144 @@
+import json
+from http import HTTPStatus
+import pytest
+from api.async_app import check_async_options, create_async_app
+from api.application.async_tasks_list_service import AsyncTasksListService
+from api.cache import async_cache
+from api.persistence.async_cosmos_tasks_lists_repository import (
+    AsyncCosmosTasksListsRepository,
+)
+from tests.asynchronous import run
+from tests.database import (
+    setup_db,
+    get_async_db_connection,
+    get_async_directories_db_connection,
+    clear_db,
+)
+from tests.handlers.mocking_utilities import the_headers, the_headers_for_a_sharer
+from tests.handlers.routing import *
+
+response = None
+response_data = None
+client = None
+tasks_list_id = None
+another_email = "arghhhhh@wobble.com"
+
+
+@pytest.fixture(autouse=True)
+def setup_and_teardown():
+    global client
+    setup_db()
+    app = create_async_app(
+        AsyncTasksListService(
+            AsyncCosmosTasksListsRepository(
+                get_async_db_connection(), get_async_directories_db_connection()
+            )
+        )
+    )
+    client = app.test_client()
+    async_cache.clear()
+    yield
+    clear_db()
+
+
+def request(method, url, **kwargs):
+    global response, response_data
+
+    async def send():
+        the_response = await getattr(client, method)(url, **kwargs)
+        return the_response, await the_response.get_data(as_text=True)
+
+    response, response_data = run(send())
+
+
+def adding_a_tasks_list():
+    global tasks_list_id
+    request("post", tasks_url(), json={"name": "My Tasks List"}, headers=the_headers())
+    tasks_list_id = json.loads(response_data)["id"]
+
+
+def a_tasks_list():
+    adding_a_tasks_list()
+
+
+def adding_a_tasks_list_with_the_same_name():
+    request("post", tasks_url(), json={"name": "My Tasks List"}, headers=the_headers())
+
+
+def a_shared_tasks_list():
+    adding_a_tasks_list()
+    request(
+        "patch",
+        tasks_list_url_share(tasks_list_id),
+        json={"share_with": another_email},
+        headers=the_headers(),
+    )
+
+
+def adding_a_task_to_tasks_list():
+    request(
+        "post",
+        task_url(tasks_list_id),
+        json={"content": "A Task"},
+        headers=the_headers(),
+    )
+
+
+def listing_tasks_lists():
+    request("get", tasks_url(), headers=the_headers())
+
+
+def listing_tasks_lists_as_a_sharer():
+    request("get", tasks_url(), headers=the_headers_for_a_sharer())
+
+
+def listing_tasks_lists_without_authorisation():
+    request("get", tasks_url())
+
+
+def getting_a_missing_tasks_list():
+    request("get", tasks_list_url_with_id("missing"), headers=the_headers())
+
+
+def the_tasks_list_is_added():
+    assert response.status_code == HTTPStatus.CREATED
+    request("get", tasks_list_url_with_id(tasks_list_id), headers=the_headers())
+    assert response.status_code == HTTPStatus.OK
+    assert json.loads(response_data)["name"] == "My Tasks List"
+
+
+def the_tasks_list_is_listed():
+    assert response.status_code == HTTPStatus.OK
+    assert [tasks_list["id"] for tasks_list in json.loads(response_data)] == [
+        tasks_list_id
+    ]
+
+
+def the_task_is_added():
+    assert response.status_code == HTTPStatus.CREATED
+    request("get", tasks_list_url_with_id(tasks_list_id), headers=the_headers())
+    assert json.loads(response_data)["tasks"][0]["content"] == "A Task"
+
+
+def the_duplicate_name_is_rejected():
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+    assert json.loads(response_data)["error"] == "Tasks list with name already exists"
+
+
+def the_tasks_list_is_not_found():
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+def the_request_is_unauthorised():
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
+
+
+def starting_with_metrics_and_warm_start():
+    check_async_options(
+        {
+            "asgi": True,
+            "cosmos_metrics": True,
+            "cosmos_partition_ru_per_second": 0,
+            "warm_start_snapshot_path": "warm_start.json",
+        }
+    )
@@ -0,0 +1,52 @@
+from tests.handlers.mocking_utilities import an_app_with_a
+from tests.handlers.async_tasks_list_handler_steps import *
+from tests.specification import *
+
+
+def test_can_add_tasks_list(mocker):
+    Given(an_app_with_a(mocker))
+    When(adding_a_tasks_list)
+    Then(the_tasks_list_is_added)
+
+
+def test_cannot_add_tasks_list_with_duplicate_name(mocker):
+    Given(an_app_with_a(mocker))
+    And(a_tasks_list)
+    When(adding_a_tasks_list_with_the_same_name)
+    Then(the_duplicate_name_is_rejected)
+
+
+def test_can_list_shared_tasks_lists(mocker):
+    Given(an_app_with_a(mocker))
+    And(a_shared_tasks_list)
+    When(listing_tasks_lists_as_a_sharer)
+    Then(the_tasks_list_is_listed)
+
+
+def test_can_add_task_to_tasks_list(mocker):
+    Given(an_app_with_a(mocker))
+    And(a_tasks_list)
+    When(adding_a_task_to_tasks_list)
+    Then(the_task_is_added)
+
+
+def test_returns_not_found_for_missing_tasks_list(mocker):
+    Given(an_app_with_a(mocker))
+    When(getting_a_missing_tasks_list)
+    Then(the_tasks_list_is_not_found)
+
+
+def test_requires_authorisation(mocker):
+    Given(an_app_with_a(mocker))
+    When(listing_tasks_lists_without_authorisation)
+    Then(the_request_is_unauthorised)
+
+
+def test_rejects_options_the_async_app_does_not_support():
+    When(validating(starting_with_metrics_and_warm_start))
+    Then(
+        informs(
+            "cosmos_metrics, warm_start_snapshot_path cannot be used with asgi: true,"
+            " turn them off or set asgi: false"
+        )
+    )
@@ -1,11 +1,19 @@
-﻿import pytest
+﻿import time
+
+import pytest
 from flask import Flask
 from flask.testing import FlaskClient
 from flask.views import MethodView
 from flask_cors import CORS
+from jose import jwt
 
 from api.cache import cache, cache_config
-from api.handlers.auth_zero_decorators import requires_auth
+from api.handlers.auth_zero_decorators import (
+    VerifiedTokens,
+    jwks_key_store,
+    requires_auth,
+    verified_tokens,
+)
 from api.handlers.exception_handlers import handle_exception
 from api.handlers.requests import AUTHORIZATION_HEADER_KEY
 from api.handlers.responses import *
@@ -22,6 +30,8 @@ from tests.handlers.routing import nonsense_url
 response = None
 client: FlaskClient = None
 headers = None
+decode_spy = None
+tokens: VerifiedTokens | None = None
 
 
 @pytest.fixture(autouse=True)
@@ -30,6 +40,8 @@ def setup_and_teardown():
     an_app()
     reset_mocks()
     cache.clear()
+    verified_tokens.clear()
+    jwks_key_store.clear()
     yield
     client.__exit__(None, None, None)
 
@@ -96,6 +108,42 @@ def a_valid_request():
 
 def a_reset_cache():
     cache.clear()
+    verified_tokens.clear()
+    jwks_key_store.clear()
+
+
+def a_valid_request_watched_by_a(mocker):
+    def step():
+        global decode_spy
+        a_valid_request()
+        decode_spy = mocker.spy(jwt, "decode")
+
+    return step
+
+
+def verified_tokens_expiring_in(seconds: int):
+    def step():
+        global tokens
+        tokens = VerifiedTokens(2, 30)
+        tokens.add("token", {"exp": time.time() + seconds})
+
+    return step
+
+
+def a_verified_token_not_valid_for(seconds: int):
+    def step():
+        global tokens
+        tokens = VerifiedTokens(2, 30)
+        tokens.add("token", {"exp": time.time() + 3600, "nbf": time.time() + seconds})
+
+    return step
+
+
+def verifying_three_tokens():
+    global tokens
+    tokens = VerifiedTokens(2, 30)
+    for token in ["first", "second", "third"]:
+        tokens.add(token, {"exp": time.time() + 3600})
 
 
 def making_the_request():
@@ -170,6 +218,24 @@ def allows_valid_token():
     assert response.status_code == HTTPStatus.OK
 
 
+def the_token_is_verified_once():
+    assert response.status_code == HTTPStatus.OK
+    decode_spy.assert_called_once()
+
+
+def the_token_is_reused():
+    assert tokens.get("token") is not None
+
+
+def the_token_is_verified_again():
+    assert tokens.get("token") is None
+
+
+def only_the_latest_tokens_are_kept():
+    assert len(tokens) == 2
+    assert tokens.get("first") is None
+
+
 def a_tasks_list_name():
     return "My Tasks List"
 
@@ -84,3 +84,31 @@ def test_recognises_valid_token(mocker):
     And(a_valid_request)
     When(making_the_request)
     Then(allows_valid_token)
+
+
+def test_verifies_a_repeated_token_once(mocker):
+    Given(an_app_with_a(mocker))
+    And(a_valid_request_watched_by_a(mocker))
+    When(making_the_request)
+    And(making_the_request)
+    Then(the_token_is_verified_once)
+
+
+def test_reuses_verified_tokens_within_the_clock_skew_of_expiry():
+    Given(verified_tokens_expiring_in(-10))
+    Then(the_token_is_reused)
+
+
+def test_verifies_expired_tokens_again():
+    Given(verified_tokens_expiring_in(-60))
+    Then(the_token_is_verified_again)
+
+
+def test_does_not_reuse_tokens_before_they_are_valid():
+    Given(a_verified_token_not_valid_for(60))
+    Then(the_token_is_verified_again)
+
+
+def test_keeps_a_bounded_number_of_verified_tokens():
+    When(verifying_three_tokens)
+    Then(only_the_latest_tokens_are_kept)
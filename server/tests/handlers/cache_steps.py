@@ -0,0 +1,141 @@
+import pytest
+import pytest_mock
+import redis
+from cachelib import BaseCache, RedisCache, SimpleCache
+from flask import Flask
+from flask_caching import Cache
+
+from api.cache import (
+    REDIS_KEY_PREFIX,
+    FallbackCache,
+    cache_config_for,
+    create_backend,
+)
+from tests.auth_zero_tokens import get_jwks
+
+cache_dir: str = ""
+caches: list[Cache] = []
+apps: list[Flask] = []
+backend: BaseCache | None = None
+stand_in_redis: "StandInRedis | None" = None
+fallback_cache: FallbackCache | None = None
+read: dict | None = None
+
+
+@pytest.fixture(autouse=True)
+def setup_and_teardown(tmp_path):
+    global cache_dir, caches, apps, backend, fallback_cache, read, stand_in_redis
+    cache_dir = str(tmp_path / "cache")
+    caches = []
+    apps = []
+    backend = None
+    stand_in_redis = None
+    fallback_cache = None
+    read = None
+    yield
+
+
+class UnavailableCache(BaseCache):
+
+    def get(self, key):
+        raise ConnectionError("Cache is unavailable")
+
+    def set(self, key, value, timeout=None):
+        raise ConnectionError("Cache is unavailable")
+
+
+class StandInRedis:
+
+    def __init__(self):
+        self.values: dict[str, bytes] = {}
+        self.expiries: dict[str, int | None] = {}
+
+    def ping(self) -> bool:
+        return True
+
+    def get(self, name: str) -> bytes | None:
+        return self.values.get(name)
+
+    def set(self, name: str, value: bytes, ex: int | None = None) -> bool:
+        self.values[name] = value
+        self.expiries[name] = ex
+        return True
+
+
+def two_instances_sharing_a_filesystem_cache():
+    for _ in range(2):
+        app = Flask(__name__)
+        cache = Cache()
+        cache.init_app(
+            app,
+            config=cache_config_for(
+                {"cache_type": "filesystem", "cache_dir": cache_dir}
+            ),
+        )
+        apps.append(app)
+        caches.append(cache)
+
+
+def an_unreachable_redis_cache():
+    global backend
+    backend = create_backend(
+        {"cache_type": "redis", "cache_redis_url": "redis://localhost:1/0"}
+    )
+
+
+def a_reachable_redis_cache_with_a(mocker: pytest_mock.MockerFixture):
+    global backend, stand_in_redis
+    stand_in_redis = StandInRedis()
+    mocker.patch.object(redis.Redis, "from_url", return_value=stand_in_redis)
+    backend = create_backend(
+        {"cache_type": "redis", "cache_redis_url": "redis://cache:6379/0"}
+    )
+
+
+def a_shared_cache_that_goes_down():
+    global fallback_cache
+    fallback_cache = FallbackCache(UnavailableCache())
+
+
+def one_instance_caching_the_jwks():
+    with apps[0].app_context():
+        caches[0].set("jwks", get_jwks())
+
+
+def the_other_instance_reading_it():
+    global read
+    with apps[1].app_context():
+        read = caches[1].get("jwks")
+
+
+def caching_the_jwks():
+    global read
+    fallback_cache.set("jwks", get_jwks())
+    read = fallback_cache.get("jwks")
+
+
+def the_jwks_is_shared():
+    assert read == get_jwks()
+
+
+def caching_the_jwks_in_redis():
+    global read
+    backend.set("jwks", get_jwks())
+    read = backend.get("jwks")
+
+
+def the_jwks_is_stored_in_redis():
+    assert isinstance(backend, RedisCache)
+    assert read == get_jwks()
+    assert stand_in_redis.expiries == {f"{REDIS_KEY_PREFIX}jwks": 300}
+
+
+def the_cache_falls_back_to_in_process():
+    assert isinstance(backend, SimpleCache)
+    backend.set("jwks", get_jwks())
+    assert backend.get("jwks") == get_jwks()
+
+
+def the_jwks_is_cached_in_process():
+    assert read == get_jwks()
+    assert fallback_cache.degraded
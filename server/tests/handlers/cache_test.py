@@ -0,0 +1,26 @@
+from tests.specification import *
+from tests.handlers.cache_steps import *
+
+
+def test_instances_share_a_filesystem_cache():
+    Given(two_instances_sharing_a_filesystem_cache)
+    And(one_instance_caching_the_jwks)
+    When(the_other_instance_reading_it)
+    Then(the_jwks_is_shared)
+
+
+def test_caches_in_redis_when_it_is_reachable(mocker):
+    Given(a_reachable_redis_cache_with_a(mocker))
+    When(caching_the_jwks_in_redis)
+    Then(the_jwks_is_stored_in_redis)
+
+
+def test_falls_back_to_in_process_cache_when_redis_is_unreachable():
+    When(an_unreachable_redis_cache)
+    Then(the_cache_falls_back_to_in_process)
+
+
+def test_caches_in_process_while_the_shared_cache_is_down():
+    Given(a_shared_cache_that_goes_down)
+    When(caching_the_jwks)
+    Then(the_jwks_is_cached_in_process)
@@ -6,6 +6,8 @@ from flask.testing import FlaskClient
 
 from api.app import create_app
 from api.cache import cache, cache_config
+from api.application.conflict_exception import ConflictException
+from api.application.service_busy_exception import ServiceBusyException
 from api.application.validation_exception import ValidationException
 from tests.handlers.mocking_utilities import the_headers
 from tests.handlers.routing import tasks_url
@@ -27,6 +29,16 @@ class FakeTaskListServiceWithValidationException:
         raise ValidationException("wibble")
 
 
+class FakeTaskListServiceWithConflictException:
+    def add(self, name: str, owner_email: str):
+        raise ConflictException("wubble")
+
+
+class FakeTaskListServiceWithServiceBusyException:
+    def add(self, name: str, owner_email: str):
+        raise ServiceBusyException("wabble")
+
+
 class FakeTaskListServiceWithException:
     def add(self, name: str, owner_email: str):
         raise Exception("wobble")
@@ -39,6 +51,20 @@ def a_validation_error():
     client = app.test_client()
 
 
+def a_conflict_error():
+    global client
+    app = create_app(FakeTaskListServiceWithConflictException())
+    cache.init_app(app, config=cache_config)
+    client = app.test_client()
+
+
+def a_service_busy_error():
+    global client
+    app = create_app(FakeTaskListServiceWithServiceBusyException())
+    cache.init_app(app, config=cache_config)
+    client = app.test_client()
+
+
 def an_error():
     global client
     app = create_app(FakeTaskListServiceWithException())
@@ -56,6 +82,16 @@ def the_validation_error_is_handled():
     assert json.loads(response.data)["error"] == "wibble"
 
 
+def the_conflict_error_is_handled():
+    assert response.status_code == HTTPStatus.CONFLICT
+    assert json.loads(response.data)["error"] == "wubble"
+
+
+def the_service_busy_error_is_handled():
+    assert response.status_code == HTTPStatus.SERVICE_UNAVAILABLE
+    assert json.loads(response.data)["error"] == "wabble"
+
+
 def the_error_is_handled():
     assert response.status_code == HTTPStatus.INTERNAL_SERVER_ERROR
     assert json.loads(response.data)["error"] == "Internal server error"
@@ -10,6 +10,20 @@ def test_can_catch_validation_error(mocker):
     Then(the_validation_error_is_handled)
 
 
+def test_can_catch_conflict_error(mocker):
+    Given(an_app_with_a(mocker))
+    And(a_conflict_error)
+    When(catching_the_error)
+    Then(the_conflict_error_is_handled)
+
+
+def test_can_catch_service_busy_error(mocker):
+    Given(an_app_with_a(mocker))
+    And(a_service_busy_error)
+    When(catching_the_error)
+    Then(the_service_busy_error_is_handled)
+
+
 def test_can_catch_error(mocker):
     Given(an_app_with_a(mocker))
     And(an_error)
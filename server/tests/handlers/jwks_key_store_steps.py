@@ -0,0 +1,124 @@
+import threading
+import time
+
+import pytest
+from jose.backends.base import Key
+
+from api.handlers.jwks_key_store import JwksKeyStore
+from tests.auth_zero_tokens import get_jwks, get_jwks_with_wrong_key_id, kid
+
+store: JwksKeyStore | None = None
+found: list = []
+fetched = threading.Event()
+release = threading.Event()
+jwks_to_fetch = get_jwks
+fail_fetch = False
+
+
+@pytest.fixture(autouse=True)
+def setup_and_teardown():
+    global store, found, fetched, release, jwks_to_fetch, fail_fetch
+    store = None
+    found = []
+    fetched = threading.Event()
+    release = threading.Event()
+    jwks_to_fetch = get_jwks
+    fail_fetch = False
+    yield
+    release.set()
+
+
+def slow_fetch():
+    fetched.set()
+    release.wait(5)
+    if fail_fetch:
+        raise TimeoutError("Auth0 is slow")
+    return jwks_to_fetch()
+
+
+def fetch():
+    return jwks_to_fetch()
+
+
+def a_store_that_never_refreshes():
+    global store
+    store = JwksKeyStore(fetch, max_age_seconds=3600, min_refetch_seconds=3600)
+
+
+def a_store_with_a_slow_fetch():
+    global store
+    store = JwksKeyStore(slow_fetch, max_age_seconds=3600)
+
+
+def a_loaded_store_due_to_refresh_from_a_slow_failing_fetch():
+    global store, fail_fetch
+    store = JwksKeyStore(slow_fetch, max_age_seconds=0, refresh_ahead_seconds=0)
+    store.update(get_jwks())
+    fail_fetch = True
+
+
+def a_loaded_store_allowed_to_refetch():
+    global store, jwks_to_fetch
+    store = JwksKeyStore(fetch, max_age_seconds=3600, min_refetch_seconds=0)
+    jwks_to_fetch = get_jwks_with_wrong_key_id
+    store.key("54321")
+    jwks_to_fetch = get_jwks
+
+
+def looking_up_the_key_twice():
+    found.extend([store.key(kid), store.key(kid)])
+
+
+def looking_up_the_key_from_many_threads():
+    threads = [
+        threading.Thread(target=lambda: found.append(store.key(kid))) for _ in range(10)
+    ]
+    for thread in threads:
+        thread.start()
+    fetched.wait(5)
+    time.sleep(0.05)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+
+def looking_up_the_key_while_it_refreshes():
+    found.append(store.key(kid))
+    fetched.wait(5)
+    found.append(store.key(kid))
+    release.set()
+
+
+def looking_up_an_unknown_key():
+    found.append(store.key("unknown"))
+
+
+def looking_up_a_rotated_key():
+    found.append(store.key(kid))
+
+
+def the_key_is_constructed_from_one_fetch():
+    assert isinstance(found[0], Key)
+    assert found[0] is found[1]
+    assert store.fetches == 1
+
+
+def every_thread_gets_the_key_from_one_fetch():
+    assert len(found) == 10
+    assert all(key is found[0] and key is not None for key in found)
+    assert store.fetches == 1
+
+
+def the_stale_key_is_served_without_waiting():
+    assert found[0] is not None
+    assert found[1] is found[0]
+
+
+def the_unknown_key_is_not_refetched():
+    assert found[-1] is None
+    assert store.fetches == 1
+
+
+def the_rotated_key_is_refetched():
+    assert found[0] is not None
+    assert store.fetches == 2
@@ -0,0 +1,33 @@
+from tests.specification import *
+from tests.handlers.jwks_key_store_steps import *
+
+
+def test_constructs_keys_once_per_fetch():
+    Given(a_store_that_never_refreshes)
+    When(looking_up_the_key_twice)
+    Then(the_key_is_constructed_from_one_fetch)
+
+
+def test_concurrent_lookups_share_one_fetch():
+    Given(a_store_with_a_slow_fetch)
+    When(looking_up_the_key_from_many_threads)
+    Then(every_thread_gets_the_key_from_one_fetch)
+
+
+def test_serves_stale_keys_while_refreshing():
+    Given(a_loaded_store_due_to_refresh_from_a_slow_failing_fetch)
+    When(looking_up_the_key_while_it_refreshes)
+    Then(the_stale_key_is_served_without_waiting)
+
+
+def test_does_not_refetch_unknown_keys_too_often():
+    Given(a_store_that_never_refreshes)
+    When(looking_up_the_key_twice)
+    And(looking_up_an_unknown_key)
+    Then(the_unknown_key_is_not_refetched)
+
+
+def test_refetches_an_unknown_key_after_rotation():
+    Given(a_loaded_store_allowed_to_refetch)
+    When(looking_up_a_rotated_key)
+    Then(the_rotated_key_is_refetched)
@@ -0,0 +1,113 @@
+import json
+from http import HTTPStatus
+
+import pytest
+from flask.testing import FlaskClient
+
+from api.app import create_app
+from api.application.async_tasks_list_service import AsyncTasksListService
+from api.application.tasks_list_service import TasksListService
+from api.async_app import create_async_app
+from api.cache import async_cache, cache, cache_config
+from api.handlers.async_auth_zero_decorators import async_jwks_key_store
+from api.handlers.auth_zero_decorators import jwks_key_store
+from api.persistence.async_cosmos_tasks_lists_repository import (
+    AsyncCosmosTasksListsRepository,
+)
+from api.persistence.cosmos_tasks_lists_repository import CosmosTasksListsRepository
+from tests.asynchronous import run
+from tests.database import (
+    setup_db,
+    get_db_connection,
+    get_directories_db_connection,
+    get_async_db_connection,
+    get_async_directories_db_connection,
+    clear_db,
+)
+from tests.handlers import mocking_utilities
+from tests.handlers.routing import keep_alive_url
+
+client: FlaskClient | None = None
+status_code: int | None = None
+report: dict | None = None
+
+
+@pytest.fixture(autouse=True)
+def setup_and_teardown():
+    global client, status_code, report
+    setup_db()
+    app = create_app(
+        TasksListService(
+            CosmosTasksListsRepository(
+                get_db_connection(), get_directories_db_connection()
+            )
+        )
+    )
+    cache.init_app(app, config=cache_config)
+    client = app.test_client()
+    cache.clear()
+    async_cache.clear()
+    jwks_key_store.clear()
+    async_jwks_key_store.clear()
+    status_code = None
+    report = None
+    yield
+    client.__exit__(None, None, None)
+    clear_db()
+
+
+def auth_zero_being_unreachable():
+    mocking_utilities.get_jwks_mock.side_effect = OSError("Auth0 is unreachable")
+
+
+def calling_keep_alive():
+    global status_code, report
+    response = client.get(keep_alive_url())
+    status_code = response.status_code
+    report = json.loads(response.data)
+
+
+def calling_keep_alive_on_the_async_app():
+    global status_code, report
+    app = create_async_app(
+        AsyncTasksListService(
+            AsyncCosmosTasksListsRepository(
+                get_async_db_connection(), get_async_directories_db_connection()
+            )
+        )
+    )
+
+    async def send():
+        response = await app.test_client().get(keep_alive_url())
+        return response.status_code, json.loads(await response.get_data(as_text=True))
+
+    status_code, report = run(send())
+
+
+def every_step_is_timed():
+    assert status_code == HTTPStatus.OK
+    assert report["ok"] is True
+    assert [step["step"] for step in report["steps"]] == ["cosmos", "jwks", "imports"]
+    assert all(step["ok"] and step["milliseconds"] >= 0 for step in report["steps"])
+    assert report["milliseconds"] >= 0
+
+
+def the_keys_are_loaded():
+    assert jwks_key_store.jwks is not None
+
+
+def the_failing_step_is_reported():
+    assert status_code == HTTPStatus.SERVICE_UNAVAILABLE
+    assert report["ok"] is False
+    jwks_step = report["steps"][1]
+    assert jwks_step["ok"] is False
+    assert report["steps"][0]["ok"] and report["steps"][2]["ok"]
+
+
+def the_error_is_logged_but_not_returned_with_a(caplog):
+    def step():
+        assert "Auth0 is unreachable" not in json.dumps(report)
+        assert "Warmup step jwks failed" in caplog.text
+        assert "Auth0 is unreachable" in caplog.text
+
+    return step
@@ -0,0 +1,24 @@
+from tests.specification import *
+from tests.handlers.keep_alive_handler_steps import *
+from tests.handlers.mocking_utilities import an_app_with_a
+
+
+def test_keep_alive_warms_and_times_each_step_without_authorisation(mocker):
+    Given(an_app_with_a(mocker))
+    When(calling_keep_alive)
+    Then(every_step_is_timed)
+    And(the_keys_are_loaded)
+
+
+def test_keep_alive_reports_the_step_that_failed(mocker, caplog):
+    Given(an_app_with_a(mocker))
+    And(auth_zero_being_unreachable)
+    When(calling_keep_alive)
+    Then(the_failing_step_is_reported)
+    And(the_error_is_logged_but_not_returned_with_a(caplog))
+
+
+def test_async_keep_alive_warms_and_times_each_step(mocker):
+    Given(an_app_with_a(mocker))
+    When(calling_keep_alive_on_the_async_app)
+    Then(every_step_is_timed)
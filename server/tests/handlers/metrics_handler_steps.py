@@ -0,0 +1,45 @@
+import json
+from http import HTTPStatus
+import pytest
+from flask import Flask
+from flask.testing import FlaskClient
+from api.cache import cache, cache_config
+from api.handlers.metrics_handlers import register_metrics_handlers
+from api.persistence.instrumented_container import CosmosMetrics
+from tests.handlers.mocking_utilities import the_headers
+from tests.handlers.routing import cosmos_metrics_url
+
+response = None
+client: FlaskClient = None
+metrics: CosmosMetrics | None = None
+
+
+@pytest.fixture(autouse=True)
+def setup_and_teardown():
+    global client, metrics
+    metrics = CosmosMetrics()
+    app = Flask(__name__)
+    register_metrics_handlers(app, metrics)
+    cache.init_app(app, config=cache_config)
+    client = app.test_client()
+    cache.clear()
+    yield
+    client.__exit__(None, None, None)
+
+
+def some_recorded_cosmos_calls():
+    metrics.record("get_all", "query_items", 3.0, 12.0, 4.0, 2)
+    metrics.record("add", "upsert_item", 10.0, 20.0, 8.0, 1)
+
+
+def getting_the_cosmos_metrics():
+    global response
+    response = client.get(cosmos_metrics_url(), headers=the_headers())
+
+
+def the_most_expensive_operations_are_listed_first():
+    assert response.status_code == HTTPStatus.OK
+    operations = json.loads(response.data)["operations"]
+    assert [entry["operation"] for entry in operations] == ["add", "get_all"]
+    assert operations[0]["request_charge"] == 10.0
+    assert operations[1]["items"] == 2
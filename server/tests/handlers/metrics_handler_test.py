@@ -0,0 +1,10 @@
+from tests.specification import *
+from tests.handlers.metrics_handler_steps import *
+from tests.handlers.mocking_utilities import an_app_with_a
+
+
+def test_lists_cosmos_metrics_by_request_charge(mocker):
+    Given(an_app_with_a(mocker))
+    And(some_recorded_cosmos_calls)
+    When(getting_the_cosmos_metrics)
+    Then(the_most_expensive_operations_are_listed_first)
@@ -34,6 +34,10 @@ def task_url(tasks_list_id):
     return f"{tasks_list_url_with_id(tasks_list_id)}/task"
 
 
+def task_operations_url(tasks_list_id):
+    return f"{tasks_list_url_with_id(tasks_list_id)}/operations"
+
+
 def task_url_with_id(tasks_list_id, task_id):
     return f"{tasks_list_url_with_id(tasks_list_id)}/task/{task_id}"
 
@@ -48,3 +52,7 @@ def carry_task_url(tasks_list_id, task_id):
 
 def remove_task_url(tasks_list_id, task_id):
     return f"{task_url_with_id(tasks_list_id, task_id)}/remove"
+
+
+def cosmos_metrics_url():
+    return "http://localhost:5000/api/metrics/cosmos"
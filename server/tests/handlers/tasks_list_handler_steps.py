@@ -10,7 +10,14 @@ from flask.testing import FlaskClient
 from api.cache import cache, cache_config
 from api.app import create_app
 from api.application.tasks_list_service import TasksListService
-from tests.database import setup_db, get_db_connection, clear_db
+from api.persistence.cosmos_tasks_lists_repository import CosmosTasksListsRepository
+from tests.database import (
+    setup_db,
+    get_db_connection,
+    get_directories_db_connection,
+    clear_db,
+)
+from api.handlers.requests import CONTINUATION_HEADER_KEY
 from tests.handlers.mocking_utilities import the_headers, the_headers_for_a_sharer
 from tests.handlers.routing import *
 
@@ -24,7 +31,13 @@ another_email = "arghhhhh@wobble.com"
 def setup_and_teardown():
     global client
     setup_db()
-    app = create_app(TasksListService(get_db_connection()))
+    app = create_app(
+        TasksListService(
+            CosmosTasksListsRepository(
+                get_db_connection(), get_directories_db_connection()
+            )
+        )
+    )
     cache.init_app(app, config=cache_config)
     client = app.test_client()
     cache.clear()
@@ -58,6 +71,22 @@ def listing_tasks_lists():
     response = client.get(tasks_url(), headers=the_headers())
 
 
+def listing_tasks_list_summaries():
+    global response
+    response = client.get(tasks_url() + "?view=summary", headers=the_headers())
+
+
+def listing_one_tasks_list_at_a_time():
+    global response
+    response = client.get(tasks_url() + "?limit=1", headers=the_headers())
+    continuation = response.headers[CONTINUATION_HEADER_KEY]
+    response = client.get(
+        tasks_url(),
+        query_string={"limit": "1", "continuation": continuation},
+        headers=the_headers(),
+    )
+
+
 def a_tasks_list():
     adding_a_tasks_list()
 
@@ -142,6 +171,30 @@ def carrying_a_task_in_tasks_list():
     )
 
 
+def applying_task_operations_to_tasks_list():
+    global response
+    task_id = json.loads(response.data)["id"]
+    response = client.post(
+        task_operations_url(tasks_list_id),
+        json={
+            "operations": [
+                {"op": "tick", "task_id": task_id},
+                {"op": "add", "content": "Another Task"},
+            ]
+        },
+        headers=the_headers(),
+    )
+
+
+def applying_an_invalid_task_operation_to_tasks_list():
+    global response
+    response = client.post(
+        task_operations_url(tasks_list_id),
+        json={"operations": [{"op": "tick"}]},
+        headers=the_headers(),
+    )
+
+
 def sharing_the_tasks_list():
     global response
     response = client.patch(
@@ -192,6 +245,29 @@ def the_tasks_lists_are_listed():
     assert response_data[1]["name"] == another_tasks_list_name()
 
 
+def the_tasks_list_summaries_are_listed():
+    global response
+    assert response.status_code == HTTPStatus.OK
+    response_data = json.loads(response.data)
+    assert [summary["name"] for summary in response_data] == [
+        a_tasks_list_name(),
+        another_tasks_list_name(),
+    ]
+    assert set(response_data[0].keys()) == {
+        "id",
+        "name",
+        "owner_email",
+        "last_selected_time",
+        "shared_with",
+    }
+
+
+def the_second_tasks_list_is_the_last_page():
+    assert response.status_code == HTTPStatus.OK
+    assert len(json.loads(response.data)) == 1
+    assert CONTINUATION_HEADER_KEY not in response.headers
+
+
 def the_tasks_list_is_updated():
     global response
     assert response.status_code == HTTPStatus.NO_CONTENT
@@ -237,6 +313,23 @@ def the_task_is_ticked_in_the_tasks_list():
     assert json.loads(response.data)["tasks"][0]["is_ticked"] is True
 
 
+def the_task_operations_are_applied():
+    global response
+    assert response.status_code == HTTPStatus.OK
+    results = json.loads(response.data)["results"]
+    assert [result["op"] for result in results] == ["tick", "add"]
+    response = client.get(tasks_list_url_with_id(tasks_list_id), headers=the_headers())
+    tasks = json.loads(response.data)["tasks"]
+    assert tasks[0]["is_ticked"] is True
+    assert tasks[1]["id"] == results[1]["id"]
+    assert tasks[1]["content"] == "Another Task"
+
+
+def the_task_operations_are_rejected():
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+    assert json.loads(response.data)["error"] == "Tick operation requires a task_id"
+
+
 def the_task_is_removed_from_the_tasks_list():
     global response
     assert response.status_code == HTTPStatus.NO_CONTENT
@@ -24,6 +24,22 @@ def test_can_list_tasks_lists(mocker):
     Then(the_tasks_lists_are_listed)
 
 
+def test_can_list_tasks_list_summaries(mocker):
+    Given(an_app_with_a(mocker))
+    And(a_tasks_list)
+    And(another_tasks_list)
+    When(listing_tasks_list_summaries)
+    Then(the_tasks_list_summaries_are_listed)
+
+
+def test_can_page_through_tasks_lists(mocker):
+    Given(an_app_with_a(mocker))
+    And(a_tasks_list)
+    And(another_tasks_list)
+    When(listing_one_tasks_list_at_a_time)
+    Then(the_second_tasks_list_is_the_last_page)
+
+
 def test_can_update_tasks_list(mocker):
     Given(an_app_with_a(mocker))
     And(a_tasks_list)
@@ -52,6 +68,20 @@ def test_can_add_task_to_tasks_list(mocker):
     Then(the_task_is_added_to_the_tasks_list)
 
 
+def test_can_apply_task_operations_to_tasks_list(mocker):
+    Given(an_app_with_a(mocker))
+    And(a_tasks_list_with_tasks)
+    When(applying_task_operations_to_tasks_list)
+    Then(the_task_operations_are_applied)
+
+
+def test_rejects_invalid_task_operations(mocker):
+    Given(an_app_with_a(mocker))
+    And(a_tasks_list_with_tasks)
+    When(applying_an_invalid_task_operation_to_tasks_list)
+    Then(the_task_operations_are_rejected)
+
+
 def test_can_tick_task_in_tasks_list(mocker):
     Given(an_app_with_a(mocker))
     And(a_tasks_list_with_tasks)
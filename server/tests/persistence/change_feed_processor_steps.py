@@ -0,0 +1,161 @@
+import pytest
+
+from api.domain.tasks_list import TasksList
+from api.persistence.change_feed_processor import (
+    ChangeFeedCheckpoint,
+    ChangeFeedProcessor,
+)
+from api.persistence.cosmos_tasks_lists_repository import CosmosTasksListsRepository
+from tests.database import (
+    setup_db,
+    get_db_connection,
+    get_directories_db_connection,
+    clear_db,
+)
+
+owner_email = "wibble@wobble.com"
+sharer_email = "jackie@chan.com"
+repository: CosmosTasksListsRepository | None = None
+checkpoint_path: str | None = None
+handled: list[dict] = []
+processing_failed = False
+
+
+@pytest.fixture(autouse=True)
+def setup_and_teardown(tmp_path):
+    global repository, checkpoint_path, handled, processing_failed
+    setup_db()
+    repository = CosmosTasksListsRepository(
+        get_db_connection(), get_directories_db_connection()
+    )
+    checkpoint_path = str(tmp_path / "change_feed.checkpoint.json")
+    handled = []
+    processing_failed = False
+    yield
+    clear_db()
+
+
+def a_processor(*handlers, max_item_count: int = 100) -> ChangeFeedProcessor:
+    processor = ChangeFeedProcessor(
+        get_db_connection(),
+        ChangeFeedCheckpoint(checkpoint_path),
+        max_item_count=max_item_count,
+    )
+    for handler in handlers:
+        processor.register(handler)
+    return processor
+
+
+def adding(name: str):
+    repository.add(TasksList(name, owner_email))
+
+
+def two_added_tasks_lists():
+    adding("My Tasks List")
+    adding("Another Tasks List")
+
+
+def changes_already_processed():
+    two_added_tasks_lists()
+    a_processor().process_changes()
+    adding("Newest Tasks List")
+
+
+def a_shared_tasks_list_missing_from_the_directories():
+    tasks_list = TasksList("My Tasks List", owner_email)
+    tasks_list.share(sharer_email)
+    get_db_connection().upsert_item(tasks_list.to_dict())
+
+
+def processing_the_changes():
+    a_processor(handled.append).process_changes()
+
+
+def processing_the_changes_with_a_failing_handler():
+    global processing_failed
+
+    def failing_handler(document: dict):
+        raise Exception("Projection failed")
+
+    try:
+        a_processor(failing_handler).process_changes()
+    except Exception:
+        processing_failed = True
+
+
+def processing_one_change_per_page_failing_on_the_second():
+    global processing_failed
+
+    def failing_on_the_second(document: dict):
+        if len(handled) == 1:
+            raise Exception("Projection failed")
+        handled.append(document)
+
+    try:
+        a_processor(failing_on_the_second, max_item_count=1).process_changes()
+    except Exception:
+        processing_failed = True
+
+
+def processing_the_changes_three_times_failing_on_one_document():
+    global processing_failed
+    processor = a_processor()
+
+    def failing_on_my_tasks_list(document: dict):
+        if document["name"] == "My Tasks List":
+            raise Exception("Projection failed")
+        handled.append(document)
+
+    processor.register(failing_on_my_tasks_list)
+    for _ in range(processor.max_attempts):
+        try:
+            processor.process_changes()
+        except Exception:
+            processing_failed = True
+
+
+def processing_the_changes_into_directories():
+    a_processor(repository.project_to_directories).process_changes()
+
+
+def each_changed_document_is_handled():
+    assert sorted(document["name"] for document in handled) == [
+        "Another Tasks List",
+        "My Tasks List",
+    ]
+
+
+def only_the_new_change_is_handled():
+    assert [document["name"] for document in handled] == ["Newest Tasks List"]
+
+
+def the_changes_are_handled_again_next_time():
+    assert processing_failed
+    processing_the_changes()
+    each_changed_document_is_handled()
+
+
+def only_the_failed_page_is_handled_again():
+    assert processing_failed
+    assert [document["name"] for document in handled] == ["My Tasks List"]
+    handled.clear()
+    processing_the_changes()
+    assert [document["name"] for document in handled] == ["Another Tasks List"]
+
+
+def the_failing_document_is_skipped_and_the_feed_moves_on():
+    assert processing_failed
+    assert [document["name"] for document in handled] == ["Another Tasks List"]
+    handled.clear()
+    processing_the_changes()
+    assert handled == []
+
+
+def the_owner_and_sharer_directories_list_it():
+    for email in [owner_email, sharer_email]:
+        directory = get_directories_db_connection().read_item(
+            email, partition_key=email
+        )
+        assert [entry["name"] for entry in directory["tasks_lists"]] == [
+            "My Tasks List"
+        ]
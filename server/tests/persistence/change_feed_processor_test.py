@@ -0,0 +1,38 @@
+from tests.specification import *
+from tests.persistence.change_feed_processor_steps import *
+
+
+def test_handlers_receive_each_changed_document():
+    Given(two_added_tasks_lists)
+    When(processing_the_changes)
+    Then(each_changed_document_is_handled)
+
+
+def test_resumes_from_the_checkpoint():
+    Given(changes_already_processed)
+    When(processing_the_changes)
+    Then(only_the_new_change_is_handled)
+
+
+def test_does_not_checkpoint_changes_that_failed():
+    Given(two_added_tasks_lists)
+    When(processing_the_changes_with_a_failing_handler)
+    Then(the_changes_are_handled_again_next_time)
+
+
+def test_checkpoints_after_each_page():
+    Given(two_added_tasks_lists)
+    When(processing_one_change_per_page_failing_on_the_second)
+    Then(only_the_failed_page_is_handled_again)
+
+
+def test_skips_a_change_that_keeps_failing():
+    Given(two_added_tasks_lists)
+    When(processing_the_changes_three_times_failing_on_one_document)
+    Then(the_failing_document_is_skipped_and_the_feed_moves_on)
+
+
+def test_projects_changes_into_user_directories():
+    Given(a_shared_tasks_list_missing_from_the_directories)
+    When(processing_the_changes_into_directories)
+    Then(the_owner_and_sharer_directories_list_it)
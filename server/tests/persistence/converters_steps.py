@@ -0,0 +1,67 @@
+from api.domain.tasks_list_summary import TasksListSummary
+from api.persistence.converters import convert_to_domain, convert_to_domain_list
+
+items_read = 0
+converted = None
+
+
+def a_summary(name: str) -> dict:
+    return {
+        "id": name,
+        "name": name,
+        "owner_email": "wibble@wobble.com",
+        "last_selected_time": "2024-01-01T00:00:00",
+        "shared_with": [],
+    }
+
+
+def many_items():
+    global items_read
+    for name in ["First", "Second", "Third"]:
+        items_read += 1
+        yield a_summary(name)
+
+
+def no_items():
+    yield from []
+
+
+def reset_items_read():
+    global items_read, converted
+    items_read = 0
+    converted = None
+
+
+def converting_the_first_of_many_items():
+    global converted
+    reset_items_read()
+    converted = convert_to_domain(TasksListSummary, many_items())
+
+
+def converting_the_first_of_no_items():
+    global converted
+    reset_items_read()
+    converted = convert_to_domain(TasksListSummary, no_items())
+
+
+def converting_many_items_to_a_list():
+    global converted
+    reset_items_read()
+    converted = convert_to_domain_list(TasksListSummary, many_items())
+
+
+def only_the_first_item_is_read():
+    assert converted.name == "First"
+    assert items_read == 1
+
+
+def nothing_is_converted():
+    assert converted is None
+
+
+def items_are_read_as_they_are_consumed():
+    assert items_read == 0
+    assert next(converted).name == "First"
+    assert items_read == 1
+    assert [summary.name for summary in converted] == ["Second", "Third"]
+    assert items_read == 3
@@ -0,0 +1,17 @@
+from tests.specification import *
+from tests.persistence.converters_steps import *
+
+
+def test_converting_one_item_stops_after_the_first():
+    When(converting_the_first_of_many_items)
+    Then(only_the_first_item_is_read)
+
+
+def test_converting_one_of_no_items_returns_none():
+    When(converting_the_first_of_no_items)
+    Then(nothing_is_converted)
+
+
+def test_converting_a_list_is_lazy():
+    When(converting_many_items_to_a_list)
+    Then(items_are_read_as_they_are_consumed)
@@ -0,0 +1,71 @@
+import pytest
+
+from api.domain.tasks_list import TasksList
+from api.persistence.cosmos_tasks_lists_repository import CosmosTasksListsRepository
+from api.persistence.in_memory_cosmos import InMemoryContainer
+from api.persistence.tasks_lists_repository import DuplicateTasksListNameError
+
+owner_email = "wibble@wobble.com"
+container: InMemoryContainer | None = None
+repository: CosmosTasksListsRepository | None = None
+duplicate_name_rejected = False
+
+
+@pytest.fixture(autouse=True)
+def setup_and_teardown():
+    global container, repository, duplicate_name_rejected
+    container = None
+    repository = None
+    duplicate_name_rejected = False
+    yield
+
+
+def a_repository_over_a_container(unique_key_paths: list[str]):
+    global container, repository
+    container = InMemoryContainer("tasks_lists", "/owner_email", unique_key_paths)
+    repository = CosmosTasksListsRepository(
+        container, InMemoryContainer("user_directories", "/id")
+    )
+    repository.add(TasksList("My Tasks List", owner_email))
+
+
+def a_container_created_without_a_unique_key():
+    a_repository_over_a_container([])
+
+
+def a_container_created_with_a_unique_key():
+    a_repository_over_a_container(["/name"])
+
+
+def adding_a_tasks_list_with_the_same_name():
+    global duplicate_name_rejected
+    try:
+        repository.add(TasksList("My Tasks List", owner_email))
+    except DuplicateTasksListNameError:
+        duplicate_name_rejected = True
+
+
+def renaming_another_tasks_list_to_the_same_name():
+    global duplicate_name_rejected
+    another_tasks_list = TasksList("Another Tasks List", owner_email)
+    repository.add(another_tasks_list)
+    original = another_tasks_list.to_dict()
+    another_tasks_list.name = "My Tasks List"
+    try:
+        repository.save(another_tasks_list, original)
+    except DuplicateTasksListNameError:
+        duplicate_name_rejected = True
+
+
+def the_duplicate_name_is_rejected():
+    assert duplicate_name_rejected is True
+    names = [document["name"] for document in container.documents.values()]
+    assert names.count("My Tasks List") == 1
+
+
+def names_are_checked_by_query():
+    assert repository.unique_names is False
+
+
+def names_are_left_to_the_unique_key():
+    assert repository.unique_names is True
@@ -0,0 +1,22 @@
+from tests.specification import *
+from tests.persistence.cosmos_tasks_lists_repository_steps import *
+
+
+def test_checks_names_by_query_without_a_unique_key():
+    Given(a_container_created_without_a_unique_key)
+    When(adding_a_tasks_list_with_the_same_name)
+    Then(the_duplicate_name_is_rejected)
+    And(names_are_checked_by_query)
+
+
+def test_checks_renames_by_query_without_a_unique_key():
+    Given(a_container_created_without_a_unique_key)
+    When(renaming_another_tasks_list_to_the_same_name)
+    Then(the_duplicate_name_is_rejected)
+
+
+def test_relies_on_the_unique_key_when_provisioned():
+    Given(a_container_created_with_a_unique_key)
+    When(adding_a_tasks_list_with_the_same_name)
+    Then(the_duplicate_name_is_rejected)
+    And(names_are_left_to_the_unique_key)
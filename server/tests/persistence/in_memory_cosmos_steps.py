@@ -0,0 +1,119 @@
+import pytest
+from azure.core import MatchConditions
+from azure.cosmos.exceptions import (
+    CosmosAccessConditionFailedError,
+    CosmosResourceExistsError,
+)
+
+from api.persistence.in_memory_cosmos import InMemoryContainer
+
+container: InMemoryContainer | None = None
+results: list = []
+saved: dict | None = None
+conflict_rejected = False
+
+
+@pytest.fixture(autouse=True)
+def setup_and_teardown():
+    global container, results, saved, conflict_rejected
+    container = None
+    results = []
+    saved = None
+    conflict_rejected = False
+    yield
+
+
+def a_container_with_tasks_lists():
+    global container
+    container = InMemoryContainer(
+        "tasks_lists", "/owner_email", ["/name"], {"query_items": 3.5}
+    )
+    container.create_item(
+        {
+            "id": "1",
+            "owner_email": "wibble@wobble.com",
+            "name": "B",
+            "shared_with": ["jackie@chan.com"],
+        }
+    )
+    container.create_item(
+        {"id": "2", "owner_email": "wibble@wobble.com", "name": "A", "shared_with": []}
+    )
+    container.create_item(
+        {"id": "3", "owner_email": "will@smith.com", "name": "A", "shared_with": []}
+    )
+
+
+def querying_by_owner_and_sharer_in_name_order():
+    global results
+    results = list(
+        container.query_items(
+            "SELECT c.id FROM c WHERE c.owner_email = @email "
+            "OR ARRAY_CONTAINS(c.shared_with, @sharer) ORDER BY c.name",
+            parameters=[
+                {"name": "@email", "value": "will@smith.com"},
+                {"name": "@sharer", "value": "jackie@chan.com"},
+            ],
+        )
+    )
+
+
+def counting_one_owners_tasks_lists():
+    global results
+    results = list(
+        container.query_items(
+            "SELECT VALUE COUNT(1) FROM c",
+            partition_key="wibble@wobble.com",
+        )
+    )
+
+
+def saving_with_a_stale_etag():
+    global saved, conflict_rejected
+    saved = container.read_item("1", "wibble@wobble.com")
+    container.upsert_item({**saved, "name": "C"})
+    try:
+        container.replace_item(
+            "1",
+            {**saved, "name": "D"},
+            etag=saved["_etag"],
+            match_condition=MatchConditions.IfNotModified,
+        )
+    except CosmosAccessConditionFailedError:
+        conflict_rejected = True
+
+
+def renaming_to_an_existing_name():
+    global conflict_rejected
+    try:
+        container.upsert_item(
+            {
+                **container.read_item("2", "wibble@wobble.com"),
+                "name": "B",
+            }
+        )
+    except CosmosResourceExistsError:
+        conflict_rejected = True
+
+
+def the_matching_ids_are_returned_in_order():
+    assert results == [{"id": "3"}, {"id": "1"}]
+
+
+def the_query_is_charged():
+    headers = container.client_connection.last_response_headers
+    assert headers["x-ms-request-charge"] == "3.5"
+
+
+def only_that_owners_tasks_lists_are_counted():
+    assert results == [2]
+
+
+def the_stale_write_is_rejected():
+    assert conflict_rejected
+    assert container.read_item("1", "wibble@wobble.com")["name"] == "C"
+
+
+def the_duplicate_name_is_rejected():
+    assert conflict_rejected
+    assert container.read_item("2", "wibble@wobble.com")["name"] == "A"
@@ -0,0 +1,27 @@
+from tests.specification import *
+from tests.persistence.in_memory_cosmos_steps import *
+
+
+def test_queries_filter_project_and_order():
+    Given(a_container_with_tasks_lists)
+    When(querying_by_owner_and_sharer_in_name_order)
+    Then(the_matching_ids_are_returned_in_order)
+    And(the_query_is_charged)
+
+
+def test_queries_can_be_scoped_to_a_partition():
+    Given(a_container_with_tasks_lists)
+    When(counting_one_owners_tasks_lists)
+    Then(only_that_owners_tasks_lists_are_counted)
+
+
+def test_rejects_writes_with_a_stale_etag():
+    Given(a_container_with_tasks_lists)
+    When(saving_with_a_stale_etag)
+    Then(the_stale_write_is_rejected)
+
+
+def test_rejects_duplicate_unique_keys_within_a_partition():
+    Given(a_container_with_tasks_lists)
+    When(renaming_to_an_existing_name)
+    Then(the_duplicate_name_is_rejected)
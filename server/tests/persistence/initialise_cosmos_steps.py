@@ -0,0 +1,91 @@
+import pytest
+import pytest_mock
+
+from api.persistence import initialise_cosmos
+from api.persistence.constants import (
+    TASKS_LISTS_CONTAINER_ID,
+    TASKS_LISTS_UNIQUE_KEY_POLICY,
+    USER_DIRECTORIES_CONTAINER_ID,
+)
+from api.persistence.initialise_cosmos import LazyContainerProxy, client_options
+from api.persistence.provision_cosmos import provision
+
+from_connection_string = None
+client = None
+container: LazyContainerProxy | None = None
+options: dict | None = None
+
+
+@pytest.fixture(autouse=True)
+def setup_and_teardown():
+    global container
+    container = None
+    yield
+
+
+def a_cosmos_client_with_a(mocker: pytest_mock.MockerFixture):
+    global from_connection_string
+    mocker.patch.object(initialise_cosmos, "client", None)
+    from_connection_string = mocker.patch(
+        "api.persistence.initialise_cosmos.CosmosClient.from_connection_string"
+    )
+
+
+def a_mock_cosmos_client_with_a(mocker: pytest_mock.MockerFixture):
+    global client
+    client = mocker.MagicMock()
+
+
+def creating_a_lazy_container():
+    global container
+    container = LazyContainerProxy(TASKS_LISTS_CONTAINER_ID)
+
+
+def reading_twice_from_a_lazy_container():
+    creating_a_lazy_container()
+    container.read_item("wibble", partition_key="wobble")
+    container.read_item("wibble", partition_key="wobble")
+
+
+def building_client_options_with_partition_rate_limiting():
+    global options
+    options = client_options({"cosmos_partition_ru_per_second": 200})
+
+
+def provisioning():
+    provision(client, "testdb")
+
+
+def no_connection_is_made():
+    from_connection_string.assert_not_called()
+
+
+def one_connection_is_made_and_reused():
+    from_connection_string.assert_called_once()
+    database = from_connection_string.return_value.get_database_client
+    database.assert_called_once_with(initialise_cosmos.config["database"])
+    the_container = database.return_value.get_container_client
+    the_container.assert_called_once_with(TASKS_LISTS_CONTAINER_ID)
+    assert the_container.return_value.read_item.call_count == 2
+
+
+def the_database_and_containers_are_created():
+    client.create_database_if_not_exists.assert_called_once_with(
+        id="testdb", offer_throughput=400
+    )
+    database = client.create_database_if_not_exists.return_value
+    created = [
+        call.kwargs["id"]
+        for call in database.create_container_if_not_exists.call_args_list
+    ]
+    assert created == [TASKS_LISTS_CONTAINER_ID, USER_DIRECTORIES_CONTAINER_ID]
+    tasks_lists = database.create_container_if_not_exists.call_args_list[0]
+    assert tasks_lists.kwargs["unique_key_policy"] == TASKS_LISTS_UNIQUE_KEY_POLICY
+    assert "indexing_policy" not in tasks_lists.kwargs
+    database.replace_container.assert_not_called()
+
+
+def the_sdk_does_not_retry_throttled_requests():
+    retry_options = options["connection_policy"].RetryOptions
+    assert retry_options.MaxRetryAttemptCount == 0
+    assert retry_options.MaxWaitTimeInSeconds == 0
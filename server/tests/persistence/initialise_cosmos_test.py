@@ -0,0 +1,25 @@
+from tests.specification import *
+from tests.persistence.initialise_cosmos_steps import *
+
+
+def test_creating_a_container_does_not_connect(mocker):
+    Given(a_cosmos_client_with_a(mocker))
+    When(creating_a_lazy_container)
+    Then(no_connection_is_made)
+
+
+def test_first_use_connects_once(mocker):
+    Given(a_cosmos_client_with_a(mocker))
+    When(reading_twice_from_a_lazy_container)
+    Then(one_connection_is_made_and_reused)
+
+
+def test_rate_limiting_leaves_throttle_retries_to_the_container():
+    When(building_client_options_with_partition_rate_limiting)
+    Then(the_sdk_does_not_retry_throttled_requests)
+
+
+def test_provisioning_creates_database_and_containers(mocker):
+    Given(a_mock_cosmos_client_with_a(mocker))
+    When(provisioning)
+    Then(the_database_and_containers_are_created)
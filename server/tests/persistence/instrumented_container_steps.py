@@ -0,0 +1,211 @@
+import threading
+
+import pytest
+import pytest_mock
+
+from api.application.operation_context import traced_operations
+from api.application.tasks_list_service import TasksListService
+from api.persistence.cosmos_tasks_lists_repository import CosmosTasksListsRepository
+from api.persistence.instrumented_container import (
+    CosmosMetrics,
+    InstrumentedContainer,
+)
+from tests.database import (
+    setup_db,
+    get_db_connection,
+    get_directories_db_connection,
+    clear_db,
+)
+
+metrics: CosmosMetrics | None = None
+container: InstrumentedContainer | None = None
+items: list | None = None
+
+
+@pytest.fixture(autouse=True)
+def setup_and_teardown():
+    global metrics, container, items
+    metrics = CosmosMetrics()
+    container = None
+    items = None
+    yield
+
+
+@traced_operations
+class AService:
+
+    def read(self):
+        return container.read_item("wibble", partition_key="wobble")
+
+    def read_via_another_method(self):
+        return self.read()
+
+    def read_cheaply(self):
+        return container.read_item("cheap", partition_key="wobble")
+
+    def read_dearly(self):
+        return container.read_item("dear", partition_key="wobble")
+
+    def query(self):
+        return [
+            list(page)
+            for page in container.query_items("SELECT * FROM c").by_page(None)
+        ]
+
+
+def charged(request_charge: str, duration_ms: str = "1.5") -> dict:
+    return {
+        "x-ms-request-charge": request_charge,
+        "x-ms-request-duration-ms": duration_ms,
+    }
+
+
+def a_container_charging_for_each_call_with_a(mocker: pytest_mock.MockerFixture):
+    global container
+    the_container = mocker.MagicMock()
+    # the shared headers belong to whichever call finished last, so are never read
+    the_container.client_connection.last_response_headers = charged("1000", "1000")
+
+    def read_item(item, partition_key, response_hook, **kwargs):
+        response_hook(charged("2.5"), None)
+        return {"id": item}
+
+    def query_items(*args, response_hook, **kwargs):
+        response_hook(the_container.client_connection.last_response_headers, None)
+
+        def pages():
+            for page in [[{"id": "1"}, {"id": "2"}], [{"id": "3"}]]:
+                response_hook(charged("2.5"), page)
+                yield iter(page)
+
+        paged = mocker.MagicMock()
+        paged.by_page.return_value = pages()
+        return paged
+
+    the_container.read_item.side_effect = read_item
+    the_container.query_items.side_effect = query_items
+    container = InstrumentedContainer(the_container, metrics)
+
+
+def a_container_charging_differently_for_concurrent_calls_with_a(
+    mocker: pytest_mock.MockerFixture,
+):
+    global container
+    the_container = mocker.MagicMock()
+    charges = {"cheap": "1.0", "dear": "9.0"}
+    both_answered = threading.Barrier(2, timeout=5)
+
+    def read_item(item, partition_key, response_hook, **kwargs):
+        the_container.client_connection.last_response_headers = charged(charges[item])
+        response_hook(charged(charges[item]), None)
+        both_answered.wait()
+        return {"id": item}
+
+    the_container.read_item.side_effect = read_item
+    container = InstrumentedContainer(the_container, metrics)
+
+
+def an_instrumented_tasks_lists_repository():
+    global container
+    setup_db()
+    container = InstrumentedContainer(get_db_connection(), metrics)
+
+
+def reading_twice_in_a_service_operation():
+    AService().read()
+    AService().read()
+
+
+def reading_in_a_nested_service_operation():
+    AService().read_via_another_method()
+
+
+def reading_concurrently_in_two_service_operations():
+    threads = [
+        threading.Thread(target=AService().read_cheaply),
+        threading.Thread(target=AService().read_dearly),
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def querying_two_pages_in_a_service_operation():
+    global items
+    items = AService().query()
+
+
+def adding_a_tasks_list_through_the_service():
+    try:
+        TasksListService(
+            CosmosTasksListsRepository(
+                container,
+                InstrumentedContainer(get_directories_db_connection(), metrics),
+            )
+        ).add("My Tasks List", "wibble@wobble.com")
+    finally:
+        clear_db()
+
+
+def the_charge_and_latency_are_recorded_against_the_operation():
+    [stats] = metrics.to_dict()
+    assert stats["operation"] == "read"
+    assert stats["call"] == "read_item"
+    assert stats["calls"] == 2
+    assert stats["request_charge"] == 5.0
+    assert stats["mean_request_charge"] == 2.5
+    assert stats["server_latency_ms"] == 3.0
+    assert stats["client_latency_ms"] >= 0
+    assert stats["items"] == 2
+
+
+def the_charge_is_recorded_against_the_outer_operation():
+    [stats] = metrics.to_dict()
+    assert stats["operation"] == "read_via_another_method"
+
+
+def each_page_and_its_items_are_recorded():
+    assert items == [[{"id": "1"}, {"id": "2"}], [{"id": "3"}]]
+    [stats] = metrics.to_dict()
+    assert stats["call"] == "query_items"
+    assert stats["calls"] == 2
+    assert stats["items"] == 3
+    assert stats["request_charge"] == 5.0
+
+
+def each_operation_is_charged_for_its_own_call():
+    charges = {
+        stats["operation"]: stats["request_charge"] for stats in metrics.to_dict()
+    }
+    assert charges == {"read_cheaply": 1.0, "read_dearly": 9.0}
+
+
+def listing_tasks_lists_shared_by_two_owners_through_the_service():
+    service = TasksListService(
+        CosmosTasksListsRepository(
+            container,
+            InstrumentedContainer(get_directories_db_connection(), metrics),
+        )
+    )
+    try:
+        for owner_email in ["wibble@wobble.com", "wobble@wibble.com"]:
+            tasks_list = service.add("My Tasks List", owner_email)
+            service.share(tasks_list.id, owner_email, "reader@wobble.com")
+        metrics.clear()
+        service.get_all("reader@wobble.com")
+        service.get_all_summaries("reader@wobble.com")
+    finally:
+        clear_db()
+
+
+def the_fanned_out_reads_are_attributed_to_listing():
+    calls = {(stats["operation"], stats["call"]) for stats in metrics.to_dict()}
+    assert {operation for operation, _ in calls} == {"get_all", "get_all_summaries"}
+    assert ("get_all", "read_item") in calls
+    assert ("get_all_summaries", "query_items") in calls
+
+
+def the_calls_are_attributed_to_adding():
+    operations = {stats["operation"] for stats in metrics.to_dict()}
+    assert operations == {"add"}
@@ -0,0 +1,38 @@
+from tests.specification import *
+from tests.persistence.instrumented_container_steps import *
+
+
+def test_records_charge_and_latency_per_operation(mocker):
+    Given(a_container_charging_for_each_call_with_a(mocker))
+    When(reading_twice_in_a_service_operation)
+    Then(the_charge_and_latency_are_recorded_against_the_operation)
+
+
+def test_nested_service_calls_are_attributed_to_the_outer_operation(mocker):
+    Given(a_container_charging_for_each_call_with_a(mocker))
+    When(reading_in_a_nested_service_operation)
+    Then(the_charge_is_recorded_against_the_outer_operation)
+
+
+def test_charges_concurrent_calls_to_their_own_operations(mocker):
+    Given(a_container_charging_differently_for_concurrent_calls_with_a(mocker))
+    When(reading_concurrently_in_two_service_operations)
+    Then(each_operation_is_charged_for_its_own_call)
+
+
+def test_records_each_page_of_a_query(mocker):
+    Given(a_container_charging_for_each_call_with_a(mocker))
+    When(querying_two_pages_in_a_service_operation)
+    Then(each_page_and_its_items_are_recorded)
+
+
+def test_records_calls_made_by_the_tasks_list_service():
+    Given(an_instrumented_tasks_lists_repository)
+    When(adding_a_tasks_list_through_the_service)
+    Then(the_calls_are_attributed_to_adding)
+
+
+def test_records_fanned_out_reads_against_the_listing_operation():
+    Given(an_instrumented_tasks_lists_repository)
+    When(listing_tasks_lists_shared_by_two_owners_through_the_service)
+    Then(the_fanned_out_reads_are_attributed_to_listing)
@@ -0,0 +1,162 @@
+import sys
+
+import pytest
+import pytest_mock
+import redis
+
+from api.domain.tasks_list import TasksList
+from api.persistence.change_feed_processor import (
+    ChangeFeedCheckpoint,
+    ChangeFeedProcessor,
+)
+from api.persistence.cosmos_tasks_lists_repository import CosmosTasksListsRepository
+from api.application.invalidation_bus import InvalidationBus, LoopbackTransport
+from api.persistence.invalidation_transports import (
+    ChangeFeedInvalidationTransport,
+    create_invalidation_bus,
+)
+from tests.database import (
+    setup_db,
+    get_db_connection,
+    get_directories_db_connection,
+    clear_db,
+)
+
+owner_email = "wibble@wobble.com"
+repository: CosmosTasksListsRepository | None = None
+processor: ChangeFeedProcessor | None = None
+tasks_list: TasksList | None = None
+received: list[dict] = []
+bus: InvalidationBus | None = None
+
+
+@pytest.fixture(autouse=True)
+def setup_and_teardown():
+    global repository, processor, tasks_list, received, bus
+    setup_db()
+    repository = CosmosTasksListsRepository(
+        get_db_connection(), get_directories_db_connection()
+    )
+    processor = None
+    tasks_list = None
+    received = []
+    bus = None
+    yield
+    clear_db()
+
+
+class StandInPubSub:
+
+    def __init__(self, client: "StandInRedis"):
+        self.client = client
+
+    def subscribe(self, **handlers):
+        self.client.handlers.update(handlers)
+
+    def run_in_thread(self, sleep_time: float, daemon: bool):
+        return self
+
+    def stop(self):
+        pass
+
+
+class StandInRedis:
+
+    def __init__(self):
+        self.handlers = {}
+
+    def ping(self) -> bool:
+        return True
+
+    def pubsub(self, ignore_subscribe_messages: bool) -> StandInPubSub:
+        return StandInPubSub(self)
+
+    def publish(self, channel: str, data: str):
+        self.handlers[channel]({"data": data})
+
+
+def a_redis_invalidation_bus_with_a(mocker: pytest_mock.MockerFixture):
+    global bus
+    mocker.patch.object(redis.Redis, "from_url", return_value=StandInRedis())
+    bus = create_invalidation_bus({"invalidation_transport": "redis"})
+    bus.subscribe(received.append)
+
+
+def a_redis_invalidation_bus_without_redis_installed_with_a(
+    mocker: pytest_mock.MockerFixture,
+):
+    global bus
+    mocker.patch.dict(sys.modules, {"redis": None})
+    bus = create_invalidation_bus({"invalidation_transport": "redis"})
+
+
+def an_unreachable_redis_invalidation_bus():
+    global bus
+    bus = create_invalidation_bus(
+        {"invalidation_transport": "redis", "cache_redis_url": "redis://localhost:1/0"}
+    )
+
+
+def publishing_an_invalidation():
+    bus.publish("wibble", '"wobble"')
+
+
+def the_invalidation_is_received():
+    assert received == [{"list_id": "wibble", "etag": '"wobble"'}]
+
+
+def the_app_runs_without_a_bus():
+    assert bus is None
+
+
+def a_tasks_list_written_before_subscribing():
+    repository.add(TasksList("Old Tasks List", owner_email))
+
+
+def a_change_feed_transport_starting_from_now():
+    global processor
+    processor = ChangeFeedProcessor(
+        get_db_connection(), ChangeFeedCheckpoint(), start_from_beginning=False
+    )
+    processor.process_changes()
+    ChangeFeedInvalidationTransport(processor).subscribe(received.append)
+
+
+def writing_a_tasks_list():
+    global tasks_list
+    tasks_list = TasksList("My Tasks List", owner_email)
+    repository.add(tasks_list)
+    processor.process_changes()
+
+
+def only_the_new_write_is_received_with_its_etag():
+    assert received == [{"list_id": tasks_list.id, "etag": tasks_list.etag}]
+
+
+def a_change_feed_transport_publishing_deletes_another_way():
+    global processor, bus
+    processor = ChangeFeedProcessor(
+        get_db_connection(), ChangeFeedCheckpoint(), start_from_beginning=False
+    )
+    processor.process_changes()
+    bus = InvalidationBus(
+        ChangeFeedInvalidationTransport(processor, deletes=LoopbackTransport())
+    )
+    bus.subscribe(received.append)
+
+
+def writing_then_deleting_a_tasks_list():
+    global tasks_list
+    tasks_list = TasksList("My Tasks List", owner_email)
+    repository.add(tasks_list)
+    bus.publish(tasks_list.id, tasks_list.etag)
+    repository.delete(tasks_list)
+    bus.publish(tasks_list.id, None)
+    processor.process_changes()
+
+
+def the_write_arrives_by_the_change_feed_and_the_delete_by_the_other_way():
+    assert received == [
+        {"list_id": tasks_list.id, "etag": None},
+        {"list_id": tasks_list.id, "etag": tasks_list.etag},
+    ]
@@ -0,0 +1,31 @@
+from tests.specification import *
+from tests.persistence.invalidation_transports_steps import *
+
+
+def test_redis_transport_delivers_published_invalidations(mocker):
+    Given(a_redis_invalidation_bus_with_a(mocker))
+    When(publishing_an_invalidation)
+    Then(the_invalidation_is_received)
+
+
+def test_runs_without_a_bus_when_redis_is_not_installed(mocker):
+    When(a_redis_invalidation_bus_without_redis_installed_with_a(mocker))
+    Then(the_app_runs_without_a_bus)
+
+
+def test_runs_without_a_bus_when_redis_is_unreachable():
+    When(an_unreachable_redis_invalidation_bus)
+    Then(the_app_runs_without_a_bus)
+
+
+def test_change_feed_transport_publishes_new_writes_with_their_etags():
+    Given(a_tasks_list_written_before_subscribing)
+    And(a_change_feed_transport_starting_from_now)
+    When(writing_a_tasks_list)
+    Then(only_the_new_write_is_received_with_its_etag)
+
+
+def test_change_feed_transport_publishes_deletes_another_way():
+    Given(a_change_feed_transport_publishing_deletes_another_way)
+    When(writing_then_deleting_a_tasks_list)
+    Then(the_write_arrives_by_the_change_feed_and_the_delete_by_the_other_way)
@@ -0,0 +1,137 @@
+import json
+import threading
+
+import pytest
+
+from api.domain.tasks_list import TasksList
+from api.persistence.migration_runner import (
+    MigrationProgress,
+    MigrationRunner,
+    id_ranges,
+)
+from api.persistence.request_unit_budget import RequestUnitBudget
+from tests.database import setup_db, get_db_connection, clear_db
+
+checkpoint_path = ""
+migrated_ids: list[str] = []
+migrated_ids_lock = threading.Lock()
+documents: list[dict] = []
+ranges: list[tuple[str | None, str | None]] = []
+sleeps: list[float] = []
+now = 0.0
+progress: MigrationProgress | None = None
+
+
+@pytest.fixture(autouse=True)
+def setup_and_teardown(tmp_path):
+    global checkpoint_path, migrated_ids, documents, sleeps, now
+    setup_db()
+    checkpoint_path = str(tmp_path / "migration.checkpoint.json")
+    migrated_ids = []
+    documents = []
+    sleeps = []
+    now = 0.0
+    yield
+    clear_db()
+
+
+def record_migration(container, document):
+    with migrated_ids_lock:
+        migrated_ids.append(document["id"])
+    return False
+
+
+def a_runner():
+    return MigrationRunner(
+        get_db_connection,
+        record_migration,
+        checkpoint_path=checkpoint_path,
+        ru_per_second=1000000,
+        workers=4,
+        page_size=3,
+    )
+
+
+def a_container_of_tasks_lists():
+    for i in range(30):
+        tasks_list = TasksList(f"Tasks List {i}", f"owner{i % 3}@wobble.com")
+        get_db_connection().upsert_item(tasks_list.to_dict())
+        documents.append(tasks_list.to_dict())
+
+
+def legacy_tasks_lists_with_ids_outside_the_hex_digits():
+    for id in ["-legacy", "Legacy", "~legacy"]:
+        tasks_list = TasksList(f"Tasks List {id}", "owner0@wobble.com")
+        tasks_list.id = id
+        get_db_connection().upsert_item(tasks_list.to_dict())
+        documents.append(tasks_list.to_dict())
+
+
+def a_checkpoint_with_the_first_range_done():
+    with open(checkpoint_path, "w") as file:
+        json.dump({"-4": {"continuation": None, "done": True, "migrated": 7}}, file)
+
+
+def a_completed_migration():
+    a_runner().run()
+    migrated_ids.clear()
+
+
+def running_the_migration():
+    a_runner().run()
+
+
+def splitting_ids_into_four_ranges():
+    global ranges
+    ranges = id_ranges(4)
+
+
+def spending_more_than_the_budget():
+    budget = RequestUnitBudget(10, clock=lambda: now, sleep=sleeps.append)
+    budget.spend(5)
+    budget.spend(10)
+
+
+def migrating_ten_of_a_hundred_documents_in_two_seconds():
+    global progress, now
+    progress = MigrationProgress(100, 0, clock=lambda: now)
+    now = 2.0
+    progress.record(10, 20.0)
+
+
+def every_document_is_migrated_once():
+    assert sorted(migrated_ids) == sorted(document["id"] for document in documents)
+    with open(checkpoint_path) as file:
+        checkpoint = json.load(file)
+    assert all(the_range["done"] for the_range in checkpoint.values())
+    assert sum(the_range["migrated"] for the_range in checkpoint.values()) == len(
+        documents
+    )
+
+
+def only_documents_outside_the_first_range_are_migrated():
+    assert sorted(migrated_ids) == sorted(
+        document["id"] for document in documents if document["id"][0] >= "4"
+    )
+
+
+def nothing_is_migrated_again():
+    assert migrated_ids == []
+
+
+def the_ranges_cover_every_id_once():
+    assert ranges == [(None, "4"), ("4", "8"), ("8", "c"), ("c", None)]
+
+
+def the_caller_waits_for_the_budget_to_refill():
+    assert sleeps == [0.5]
+
+
+def throughput_and_eta_are_reported():
+    assert progress.to_dict() == {
+        "migrated": 10,
+        "total": 100,
+        "documents_per_second": 5.0,
+        "request_units_per_second": 10.0,
+        "eta_seconds": 18.0,
+    }
@@ -0,0 +1,44 @@
+from tests.specification import *
+from tests.persistence.migration_runner_steps import *
+
+
+def test_migrates_every_document_once():
+    Given(a_container_of_tasks_lists)
+    When(running_the_migration)
+    Then(every_document_is_migrated_once)
+
+
+def test_migrates_ids_outside_the_hex_digits():
+    Given(a_container_of_tasks_lists)
+    And(legacy_tasks_lists_with_ids_outside_the_hex_digits)
+    When(running_the_migration)
+    Then(every_document_is_migrated_once)
+
+
+def test_resumes_from_checkpoint():
+    Given(a_container_of_tasks_lists)
+    And(a_checkpoint_with_the_first_range_done)
+    When(running_the_migration)
+    Then(only_documents_outside_the_first_range_are_migrated)
+
+
+def test_completed_migration_is_not_repeated():
+    Given(a_container_of_tasks_lists)
+    And(a_completed_migration)
+    When(running_the_migration)
+    Then(nothing_is_migrated_again)
+
+
+def test_splits_ids_into_ranges():
+    When(splitting_ids_into_four_ranges)
+    Then(the_ranges_cover_every_id_once)
+
+
+def test_waits_when_request_unit_budget_is_spent():
+    When(spending_more_than_the_budget)
+    Then(the_caller_waits_for_the_budget_to_refill)
+
+
+def test_reports_throughput_and_eta():
+    When(migrating_ten_of_a_hundred_documents_in_two_seconds)
+    Then(throughput_and_eta_are_reported)
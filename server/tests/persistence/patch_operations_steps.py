@@ -0,0 +1,88 @@
+from api.domain.tasks_list import TasksList
+from api.persistence.patch_operations import to_patch_operations
+
+tasks_list: TasksList = TasksList("My Tasks List", "wibble@wobble.com")
+before: dict = tasks_list.to_dict()
+patch_operations: list[dict] | None = None
+
+
+def a_tasks_list_with_a_task():
+    global tasks_list, before
+    tasks_list = TasksList("My Tasks List", "wibble@wobble.com")
+    tasks_list.add("wibble")
+    before = tasks_list.to_dict()
+
+
+def a_full_tasks_list():
+    global tasks_list, before
+    tasks_list = TasksList("My Tasks List", "wibble@wobble.com")
+    for _ in range(22):
+        tasks_list.add("wibble")
+    before = tasks_list.to_dict()
+
+
+def a_full_tasks_list_with_one_task_left_to_decide():
+    global tasks_list, before
+    a_full_tasks_list()
+    for task in tasks_list.tasks[:21]:
+        tasks_list.carry(task.id)
+    before = tasks_list.to_dict()
+
+
+def ticking_the_task():
+    global patch_operations
+    tasks_list.tick(tasks_list.tasks[0].id)
+    patch_operations = to_patch_operations(before, tasks_list.to_dict())
+
+
+def carrying_the_first_task():
+    global patch_operations
+    tasks_list.carry(tasks_list.tasks[0].id)
+    patch_operations = to_patch_operations(before, tasks_list.to_dict())
+
+
+def removing_the_last_task():
+    global patch_operations
+    tasks_list.remove(tasks_list.tasks[-1].id)
+    patch_operations = to_patch_operations(before, tasks_list.to_dict())
+
+
+def adding_another_task():
+    global patch_operations
+    tasks_list.add("wobble")
+    patch_operations = to_patch_operations(before, tasks_list.to_dict())
+
+
+def sharing_the_tasks_list():
+    global patch_operations
+    tasks_list.share("jackie@chan.com")
+    patch_operations = to_patch_operations(before, tasks_list.to_dict())
+
+
+def the_task_is_ticked_with_a_single_set():
+    assert patch_operations == [
+        dict(op="set", path="/tasks/0/is_ticked", value=True),
+    ]
+
+
+def the_task_is_carried_with_a_set_per_changed_field():
+    assert patch_operations == [
+        dict(op="set", path="/tasks/0/is_carried", value=True),
+        dict(op="set", path="/tasks/0/page_count", value=1),
+    ]
+
+
+def the_task_is_appended():
+    assert patch_operations == [
+        dict(op="add", path="/tasks/-", value=tasks_list.tasks[-1].to_dict()),
+    ]
+
+
+def the_shared_with_list_is_set():
+    assert patch_operations == [
+        dict(op="set", path="/shared_with", value=["jackie@chan.com"]),
+    ]
+
+
+def the_tasks_list_must_be_replaced():
+    assert patch_operations is None
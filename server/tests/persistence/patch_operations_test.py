@@ -0,0 +1,32 @@
+from tests.specification import *
+from tests.persistence.patch_operations_steps import *
+
+
+def test_ticking_a_task_sets_one_flag():
+    Given(a_tasks_list_with_a_task)
+    When(ticking_the_task)
+    Then(the_task_is_ticked_with_a_single_set)
+
+
+def test_carrying_a_task_sets_only_changed_fields():
+    Given(a_full_tasks_list)
+    When(carrying_the_first_task)
+    Then(the_task_is_carried_with_a_set_per_changed_field)
+
+
+def test_adding_a_task_appends_it():
+    Given(a_tasks_list_with_a_task)
+    When(adding_another_task)
+    Then(the_task_is_appended)
+
+
+def test_sharing_a_tasks_list_sets_shared_with():
+    Given(a_tasks_list_with_a_task)
+    When(sharing_the_tasks_list)
+    Then(the_shared_with_list_is_set)
+
+
+def test_starting_a_new_page_replaces_the_tasks_list():
+    Given(a_full_tasks_list_with_one_task_left_to_decide)
+    When(removing_the_last_task)
+    Then(the_tasks_list_must_be_replaced)
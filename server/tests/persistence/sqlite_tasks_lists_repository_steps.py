@@ -0,0 +1,227 @@
+import datetime
+
+import pytest
+
+from api.domain.tasks_list import TasksList
+from api.domain.tasks_list_summary import TasksListSummary
+from api.persistence.sqlite_connection_pool import SqliteConnectionPool
+from api.persistence.sqlite_tasks_lists_repository import SqliteTasksListsRepository
+from api.persistence.tasks_lists_repository import (
+    DuplicateTasksListNameError,
+    InvalidContinuationError,
+    StaleTasksListError,
+)
+
+pool: SqliteConnectionPool | None = None
+repository: SqliteTasksListsRepository | None = None
+tasks_list: TasksList = TasksList("My Tasks List", "wibble@wobble.com")
+stale_tasks_list: TasksList = TasksList("My Tasks List", "wibble@wobble.com")
+loaded: TasksList | None = None
+listed: list[TasksList] = []
+summaries: list[TasksListSummary] = []
+pages: list[list[str]] = []
+stale_write_rejected = False
+duplicate_name_rejected = False
+continuation_rejected = False
+owner_email = "wibble@wobble.com"
+sharer_email = "jackie@chan.com"
+
+
+@pytest.fixture(autouse=True)
+def setup_and_teardown(tmp_path):
+    global pool, repository, stale_write_rejected, duplicate_name_rejected
+    global continuation_rejected
+    pool = SqliteConnectionPool(str(tmp_path / "rule_of_three.db"), size=2)
+    repository = SqliteTasksListsRepository(pool)
+    stale_write_rejected = False
+    duplicate_name_rejected = False
+    continuation_rejected = False
+    yield
+    pool.close()
+
+
+def an_added_tasks_list():
+    global tasks_list
+    tasks_list = TasksList("My Tasks List", owner_email)
+    tasks_list.add("My Task")
+    repository.add(tasks_list)
+
+
+def another_owners_tasks_list():
+    repository.add(TasksList("Another Tasks List", "will@smith.com"))
+
+
+def a_shared_tasks_list():
+    an_added_tasks_list()
+    original = tasks_list.to_dict()
+    tasks_list.share(sharer_email)
+    repository.save(tasks_list, original)
+
+
+def an_unshared_tasks_list():
+    a_shared_tasks_list()
+    original = tasks_list.to_dict()
+    tasks_list.unshare(sharer_email)
+    repository.save(tasks_list, original)
+
+
+def a_copy_loaded_before_another_write():
+    global stale_tasks_list
+    stale_tasks_list = repository.load_for_owner(tasks_list.id, owner_email)
+    original = tasks_list.to_dict()
+    tasks_list.tick(tasks_list.tasks[0].id)
+    repository.save(tasks_list, original)
+
+
+def loading_it_for_the_owner():
+    global loaded
+    loaded = repository.load_for_owner(tasks_list.id, owner_email)
+
+
+def loading_it_by_name():
+    global loaded
+    loaded = repository.load_by_name("My Tasks List", owner_email)
+
+
+def loading_it_for_the_sharer():
+    global loaded
+    loaded = repository.load(tasks_list.id, sharer_email)
+
+
+def listing_tasks_lists_for_the_owner():
+    global listed
+    listed = repository.list_for_user(owner_email)
+
+
+def listing_tasks_lists_for_the_sharer():
+    global listed
+    listed = repository.list_for_user(sharer_email)
+
+
+def listing_summaries_for_the_sharer():
+    global summaries
+    summaries = repository.list_summaries_for_user(sharer_email)
+
+
+def paging_through_tasks_lists_for_the_owner():
+    global pages
+    pages = []
+    continuation = None
+    while True:
+        page, continuation = repository.list_page_for_user(
+            owner_email, 1, continuation, False
+        )
+        pages.append([the_tasks_list.id for the_tasks_list in page])
+        if continuation is None:
+            break
+
+
+def paging_from_a_malformed_continuation():
+    global continuation_rejected
+    try:
+        repository.list_page_for_user(owner_email, 1, "wibble", False)
+    except InvalidContinuationError:
+        continuation_rejected = True
+
+
+def saving_the_stale_copy():
+    global stale_write_rejected
+    original = stale_tasks_list.to_dict()
+    stale_tasks_list.name = "Stale Name"
+    try:
+        repository.save(stale_tasks_list, original)
+    except StaleTasksListError:
+        stale_write_rejected = True
+
+
+def saving_only_the_last_selected_time():
+    repository.save_last_selected_time(
+        tasks_list.id, owner_email, datetime.datetime(2024, 1, 1)
+    )
+
+
+def adding_another_with_the_same_name():
+    global duplicate_name_rejected
+    try:
+        repository.add(TasksList("My Tasks List", owner_email))
+    except DuplicateTasksListNameError:
+        duplicate_name_rejected = True
+
+
+def renaming_another_to_the_same_name():
+    global duplicate_name_rejected
+    another = TasksList("Another Tasks List", owner_email)
+    repository.add(another)
+    original = another.to_dict()
+    another.name = "My Tasks List"
+    try:
+        repository.save(another, original)
+    except DuplicateTasksListNameError:
+        duplicate_name_rejected = True
+
+
+def deleting_it():
+    repository.delete(repository.load_for_owner(tasks_list.id, owner_email))
+
+
+def the_tasks_list_is_loaded():
+    assert loaded is not None
+    assert loaded.id == tasks_list.id
+    assert loaded.name == "My Tasks List"
+    assert loaded.tasks[0].content == "My Task"
+
+
+def only_the_last_selected_time_has_changed():
+    loaded = repository.load_for_owner(tasks_list.id, owner_email)
+    assert loaded.last_selected_time == datetime.datetime(2024, 1, 1)
+    assert loaded.tasks[0].content == "My Task"
+    assert loaded.etag == str(int(tasks_list.etag) + 1)
+
+
+def the_duplicate_name_is_rejected():
+    assert duplicate_name_rejected
+
+
+def nothing_is_loaded():
+    assert loaded is None
+
+
+def only_the_tasks_list_is_listed():
+    assert [the_tasks_list.id for the_tasks_list in listed] == [tasks_list.id]
+
+
+def the_tasks_list_summary_is_listed():
+    assert summaries == [
+        TasksListSummary(
+            tasks_list.id,
+            "My Tasks List",
+            owner_email,
+            tasks_list.last_selected_time,
+            [sharer_email],
+        )
+    ]
+
+
+def each_page_holds_one_tasks_list():
+    assert pages == [[tasks_list.id]]
+
+
+def the_continuation_is_rejected():
+    assert continuation_rejected is True
+
+
+def no_tasks_lists_are_listed():
+    assert listed == []
+
+
+def the_stale_write_is_rejected():
+    assert stale_write_rejected is True
+    assert repository.load_for_owner(tasks_list.id, owner_email).name == (
+        "My Tasks List"
+    )
+
+
+def the_database_uses_write_ahead_logging():
+    with pool.connection() as connection:
+        journal_mode = connection.execute("PRAGMA journal_mode").fetchone()[0]
+    assert journal_mode == "wal"
@@ -0,0 +1,99 @@
+from tests.specification import *
+from tests.persistence.sqlite_tasks_lists_repository_steps import *
+
+
+def test_can_load_an_added_tasks_list():
+    Given(an_added_tasks_list)
+    When(loading_it_for_the_owner)
+    Then(the_tasks_list_is_loaded)
+
+
+def test_can_load_a_tasks_list_by_name():
+    Given(an_added_tasks_list)
+    When(loading_it_by_name)
+    Then(the_tasks_list_is_loaded)
+
+
+def test_sharer_can_load_a_shared_tasks_list():
+    Given(a_shared_tasks_list)
+    When(loading_it_for_the_sharer)
+    Then(the_tasks_list_is_loaded)
+
+
+def test_non_sharer_cannot_load_a_tasks_list():
+    Given(an_added_tasks_list)
+    When(loading_it_for_the_sharer)
+    Then(nothing_is_loaded)
+
+
+def test_lists_only_the_owners_tasks_lists():
+    Given(an_added_tasks_list)
+    And(another_owners_tasks_list)
+    When(listing_tasks_lists_for_the_owner)
+    Then(only_the_tasks_list_is_listed)
+
+
+def test_lists_tasks_lists_shared_with_a_user():
+    Given(a_shared_tasks_list)
+    When(listing_tasks_lists_for_the_sharer)
+    Then(only_the_tasks_list_is_listed)
+
+
+def test_lists_summaries_of_tasks_lists_shared_with_a_user():
+    Given(a_shared_tasks_list)
+    When(listing_summaries_for_the_sharer)
+    Then(the_tasks_list_summary_is_listed)
+
+
+def test_pages_through_tasks_lists():
+    Given(an_added_tasks_list)
+    When(paging_through_tasks_lists_for_the_owner)
+    Then(each_page_holds_one_tasks_list)
+
+
+def test_rejects_a_malformed_continuation():
+    Given(an_added_tasks_list)
+    When(paging_from_a_malformed_continuation)
+    Then(the_continuation_is_rejected)
+
+
+def test_does_not_list_unshared_tasks_lists():
+    Given(an_unshared_tasks_list)
+    When(listing_tasks_lists_for_the_sharer)
+    Then(no_tasks_lists_are_listed)
+
+
+def test_rejects_saving_a_stale_tasks_list():
+    Given(an_added_tasks_list)
+    And(a_copy_loaded_before_another_write)
+    When(saving_the_stale_copy)
+    Then(the_stale_write_is_rejected)
+
+
+def test_can_delete_a_tasks_list():
+    Given(an_added_tasks_list)
+    And(deleting_it)
+    When(loading_it_for_the_owner)
+    Then(nothing_is_loaded)
+
+
+def test_uses_write_ahead_logging():
+    Then(the_database_uses_write_ahead_logging)
+
+
+def test_saves_only_the_last_selected_time():
+    Given(an_added_tasks_list)
+    When(saving_only_the_last_selected_time)
+    Then(only_the_last_selected_time_has_changed)
+
+
+def test_rejects_a_duplicate_name_for_the_same_owner():
+    Given(an_added_tasks_list)
+    When(adding_another_with_the_same_name)
+    Then(the_duplicate_name_is_rejected)
+
+
+def test_rejects_a_rename_to_a_duplicate_name():
+    Given(an_added_tasks_list)
+    When(renaming_another_to_the_same_name)
+    Then(the_duplicate_name_is_rejected)
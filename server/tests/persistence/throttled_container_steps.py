@@ -0,0 +1,110 @@
+import pytest
+import pytest_mock
+from azure.cosmos.exceptions import CosmosHttpResponseError
+
+from api.application.service_busy_exception import ServiceBusyException
+from api.persistence.throttled_container import (
+    PartitionRateLimiter,
+    ThrottledContainer,
+    ThrottleMetrics,
+)
+
+owner_email = "wibble@wobble.com"
+another_owner_email = "wabble@wubble.com"
+sleeps: list[float] = []
+metrics: ThrottleMetrics | None = None
+limiter: PartitionRateLimiter | None = None
+inner_container = None
+container: ThrottledContainer | None = None
+result = None
+gave_up = False
+
+
+@pytest.fixture(autouse=True)
+def setup_and_teardown():
+    global sleeps, metrics, limiter, result, gave_up
+    sleeps = []
+    metrics = ThrottleMetrics()
+    limiter = PartitionRateLimiter(100, clock=lambda: 0, sleep=sleeps.append)
+    result = None
+    gave_up = False
+    yield
+
+
+def a_throttled_error() -> CosmosHttpResponseError:
+    error = CosmosHttpResponseError(status_code=429, message="Too many requests")
+    error.headers = {"x-ms-retry-after-ms": "300"}
+    return error
+
+
+def reading_charging(charge: str):
+    def read_item(item, partition_key, response_hook, **kwargs):
+        response_hook({"x-ms-request-charge": charge}, None)
+        return {"id": item}
+
+    return read_item
+
+
+def a_container_charging_50_request_units_with_a(
+    mocker: pytest_mock.MockerFixture, budget_seconds: float = 10
+):
+    global inner_container, container
+    inner_container = mocker.MagicMock()
+    inner_container.client_connection.last_response_headers = {
+        "x-ms-request-charge": "1000"
+    }
+    inner_container.read_item.side_effect = reading_charging("50")
+    container = ThrottledContainer(
+        inner_container, "/owner_email", limiter, metrics, budget_seconds
+    )
+
+
+def a_container_throttled_once_with_a(mocker: pytest_mock.MockerFixture):
+    a_container_charging_50_request_units_with_a(mocker)
+    errors = [a_throttled_error()]
+
+    def read_item(*args, **kwargs):
+        if errors:
+            raise errors.pop()
+        return reading_charging("50")(*args, **kwargs)
+
+    inner_container.read_item.side_effect = read_item
+
+
+def a_container_always_throttled_with_a(mocker: pytest_mock.MockerFixture):
+    a_container_charging_50_request_units_with_a(mocker, budget_seconds=0)
+    inner_container.read_item.side_effect = a_throttled_error()
+
+
+def reading_an_item():
+    global result, gave_up
+    try:
+        result = container.read_item("wibble", partition_key=owner_email)
+    except ServiceBusyException:
+        gave_up = True
+
+
+def reading_three_items_from_one_partition_and_one_from_another():
+    for _ in range(3):
+        container.read_item("wibble", partition_key=owner_email)
+    container.read_item("wibble", partition_key=another_owner_email)
+
+
+def the_read_is_retried_after_the_requested_delay():
+    assert result == {"id": "wibble"}
+    assert len(sleeps) == 1
+    assert sleeps[0] >= 0.3
+    assert metrics.to_dict()["throttled"] == 1
+
+
+def the_partition_rate_is_halved_then_recovers():
+    assert limiter.budget(owner_email).ru_per_second == 60
+
+
+def the_read_gives_up_as_busy():
+    assert gave_up
+    assert metrics.to_dict()["exhausted"] == 1
+
+
+def only_the_busy_partition_waits():
+    assert sleeps == [0.5]
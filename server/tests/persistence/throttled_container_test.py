@@ -0,0 +1,21 @@
+from tests.specification import *
+from tests.persistence.throttled_container_steps import *
+
+
+def test_retries_throttled_requests_after_the_requested_delay(mocker):
+    Given(a_container_throttled_once_with_a(mocker))
+    When(reading_an_item)
+    Then(the_read_is_retried_after_the_requested_delay)
+    And(the_partition_rate_is_halved_then_recovers)
+
+
+def test_gives_up_when_the_time_budget_is_spent(mocker):
+    Given(a_container_always_throttled_with_a(mocker))
+    When(reading_an_item)
+    Then(the_read_gives_up_as_busy)
+
+
+def test_limits_request_units_per_partition(mocker):
+    Given(a_container_charging_50_request_units_with_a(mocker))
+    When(reading_three_items_from_one_partition_and_one_from_another)
+    Then(only_the_busy_partition_waits)
@@ -0,0 +1,17 @@
+import asyncio
+import inspect
+import logging
+
+import azure.functions as func
+
+import api
+
+
+# Runs on each new instance before it is given traffic (Premium and Dedicated plans)
+async def main(warmupContext: func.Context) -> None:
+    if inspect.iscoroutinefunction(api.keep_alive):
+        report = await api.keep_alive()
+    else:
+        # the Flask test client is synchronous and would block the event loop
+        report = await asyncio.to_thread(api.keep_alive)
+    logging.info("Warmed up: %s", report)